@@ -1 +1,4 @@
 from .random_es import RandomES
+from .one_plus_one_es import OnePlusOneES
+from .csa_es import CSAES
+from .cma_es import CMAES, SepCMAES
@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import numpy as np
+
+from .csa_es import CSAES
+
+class CMAES(CSAES):
+
+    """
+    CMA-ES : (mu/mu_w, lambda)-ES avec adaptation de la matrice de covariance
+    (mise a jour de rang un par le chemin p_c et de rang mu par les pas des 
+    mu meilleurs) et du pas par CSA (cf. CSAES).
+
+    Les descendants sont m + sigma * B D z avec C = B D^2 B^T, la 
+    décomposition de C n'est recalculée que toutes les quelques itérations 
+    (O(dim^3)), l'échantillonnage d'une itération est un produit matriciel
+    lambda x dim x dim.
+
+    Options : celles de CSAES
+    """
+
+    def __init__ (self, prob, options) :
+
+        CSAES.__init__(self, prob, options)
+
+        n = self._m.size
+        mueff = self._mueff
+        self._cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+        self._c1 = 2 / ((n + 1.3) ** 2 + mueff)
+        self._cmu = min(1 - self._c1,
+                        2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+        self._pc = np.zeros(n)
+        self._init_covariance(n)
+
+    def _init_covariance(self, n):
+        """ C = I """
+        self._C = np.eye(n)
+        self._B = np.eye(n)
+        self._D = np.ones(n)
+        # la décomposition est mise à jour toutes les _eigen_every itérations
+        self._eigen_every = max(1, int(1 / (10 * n * (self._c1 + self._cmu))))
+
+    def _directions(self, Z):
+        return (Z * self._D) @ self._B.T
+
+    def _whiten(self, z):
+        return self._B @ z
+
+    def update_sigma(self, sample):
+        """ Mise à jour de la covariance puis du pas (cf. CSAES) """
+        CSAES.update_sigma(self, sample)
+
+        hsig = self._hsig()
+        yw = self._weights @ self._y
+        self._pc *= 1 - self._cc
+        if hsig :
+            self._pc += math.sqrt(self._cc * (2 - self._cc) * self._mueff) * yw
+
+        self._update_covariance(hsig)
+        if self._generation % self._eigen_every == 0 :
+            self._decompose()
+
+    def _update_covariance(self, hsig):
+        """ Mises à jour de rang un (p_c) et de rang mu (pas y_k) """
+        c1, cmu = self._c1, self._cmu
+        # perte de variance quand la cumulation de p_c est arrêtée
+        loss = 0 if hsig else c1 * self._cc * (2 - self._cc)
+
+        self._C *= 1 - c1 - cmu + loss
+        self._C += c1 * np.outer(self._pc, self._pc)
+        self._C += cmu * (self._y.T * self._weights) @ self._y
+
+    def _decompose(self):
+        """ C = B D^2 B^T """
+        C = (self._C + self._C.T) / 2
+        eigenvalues, self._B = np.linalg.eigh(C)
+        self._D = np.sqrt(np.maximum(eigenvalues, 1e-20))
+        self._C = C
+
+
+class SepCMAES(CMAES):
+
+    """
+    CMA-ES séparable : la covariance est diagonale (un vecteur), chaque 
+    itération est en O(lambda x dim) au lieu de O(lambda x dim^2) et il n'y 
+    a pas de décomposition. Les taux d'apprentissage sont multipliés par 
+    (dim+2)/3 car il y a dim paramètres a apprendre au lieu de dim^2/2.
+
+    Pour les grandes dimensions et les fonctions (presque) séparables.
+    """
+
+    def _init_covariance(self, n):
+        """ C = I, rangée par sa diagonale """
+        self._c1 = min(1, self._c1 * (n + 2) / 3)
+        self._cmu = min(1 - self._c1, self._cmu * (n + 2) / 3)
+        self._C = np.ones(n)
+        self._eigen_every = 1
+
+    def _directions(self, Z):
+        return Z * np.sqrt(self._C)
+
+    def _whiten(self, z):
+        return z
+
+    def _update_covariance(self, hsig):
+        c1, cmu = self._c1, self._cmu
+        loss = 0 if hsig else c1 * self._cc * (2 - self._cc)
+
+        self._C *= 1 - c1 - cmu + loss
+        self._C += c1 * self._pc ** 2
+        self._C += cmu * (self._weights @ self._y ** 2)
+
+    def _decompose(self):
+        """ pas de décomposition pour une covariance diagonale """
+        pass
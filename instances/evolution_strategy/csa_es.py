@@ -0,0 +1,123 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+import numpy as np
+
+from search import EvolutionStrategy, RealSolution, Population, \
+                   eval_solutions, sort_pop
+
+class CSAES(EvolutionStrategy):
+
+    """
+    (mu/mu_w, lambda)-ES avec adaptation cumulative du pas (CSA).
+
+    A chaque itération les lambda descendants m + sigma * y_k sont tirés en 
+    un seul appel (une matrice lambda x dim) et évalués en lot. La nouvelle
+    moyenne m est la recombinaison pondérée des mu meilleurs, sigma suit la 
+    longueur du chemin d'évolution p_s (cumul des pas successifs) comparée 
+    a celle d'une marche aléatoire.
+
+    La moyenne n'est pas évaluée (une évaluation de moins par itération) :
+    la solution courante est le meilleur descendant de l'itération.
+
+    Options :
+
+    * 'lambda' : 4 + 3 ln(dim) par défaut
+    * 'mu' : lambda / 2 par défaut
+    * 'sigma' : le pas initial (1.0 par défaut)
+
+    Les sous-classes (cf. CMAES) changent la loi des pas y_k avec 
+    _directions et _whiten.
+    """
+
+    def __init__ (self, prob, options) :
+
+        EvolutionStrategy.__init__(self, prob, options)
+
+        n = self._solution.dim
+        self._lambda = options.get('lambda', 4 + int(3 * math.log(n)))
+        self._mu = options.get('mu', self._lambda // 2)
+        if not 1 <= self._mu <= self._lambda :
+            raise ValueError("mu must be between 1 and lambda")
+
+        # poids de recombinaison (logarithmiques, positifs, de somme 1)
+        w = math.log((self._lambda + 1) / 2) - np.log(np.arange(1, self._mu + 1))
+        if self._mu == self._lambda :
+            w = np.ones(self._mu)
+        self._weights = w / w.sum()
+        self._mueff = 1 / np.sum(self._weights ** 2)
+
+        # paramètres de l'adaptation du pas
+        self._cs = (self._mueff + 2) / (n + self._mueff + 5)
+        self._ds = 1 + 2 * max(0, math.sqrt((self._mueff - 1) / (n + 1)) - 1) \
+                   + self._cs
+        # espérance de la norme d'un vecteur normal N(0, I)
+        self._chi_n = math.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n * n))
+
+        self._m = self._solution.solution.copy()
+        self._ps = np.zeros(n)
+        self._generation = 0
+
+        # les pas des mu meilleurs descendants de la dernière itération
+        # (z_k normaux et y_k = _directions(z_k)), triés
+        self._z = None
+        self._y = None
+
+    def _directions(self, Z):
+        """ Les pas y_k des descendants depuis les vecteurs normaux z_k (lignes) """
+        return Z
+
+    def _whiten(self, z):
+        """ C^(-1/2) y pour le pas y de vecteur normal z (cf. update_sigma) """
+        return z
+
+    def sample_solutions(self):
+        """ 
+        Échantillonage de lambda descendants autour de la moyenne, tirés et 
+        évalués en lot.
+        
+        Retourne une Population de Lambda solutions évaluée et triée
+        """
+        Z = self._rng.standard_normal((self._lambda, self._m.size))
+        Y = self._directions(Z)
+
+        sample = Population(self._m + self._sigma * Y, RealSolution)
+        eval_solutions(sample, self._problem)
+        idx = sort_pop(sample, self._problem)
+
+        self._z = Z[idx[:self._mu]]
+        self._y = Y[idx[:self._mu]]
+        return sample
+
+    def update_sigma(self, sample):
+        """ 
+        Mise à jour du chemin d'évolution p_s puis de sigma : il augmente si
+        les pas successifs sont corrélés (p_s plus long qu'une marche 
+        aléatoire), il diminue s'ils se compensent
+        """
+        self._generation += 1
+        zw = self._weights @ self._z
+        self._ps *= 1 - self._cs
+        self._ps += math.sqrt(self._cs * (2 - self._cs) * self._mueff) \
+                    * self._whiten(zw)
+        self._sigma *= math.exp((self._cs / self._ds)
+                                * (np.linalg.norm(self._ps) / self._chi_n - 1))
+
+    def update_m(self, sample):
+        """ 
+        La moyenne est la recombinaison pondérée des mu meilleurs 
+        descendants, la solution courante est le meilleur descendant
+        """
+        self._m = self._weights @ sample.genomes[:self._mu]
+        # sample[0] est une vue sur l'échantillon, on la copie
+        self._solution = sample[0].clone()
+
+    def _hsig(self):
+        """ 
+        Vrai si p_s n'est pas anormalement long (arrêt de la cumulation de 
+        p_c quand sigma augmente vite, cf. CMAES)
+        """
+        norm = np.linalg.norm(self._ps) \
+               / math.sqrt(1 - (1 - self._cs) ** (2 * self._generation))
+        return norm / self._chi_n < 1.4 + 2 / (self._m.size + 1)
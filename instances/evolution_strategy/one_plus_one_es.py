@@ -0,0 +1,54 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+
+from search import EvolutionStrategy, RealSolution, Population, \
+                   eval_solutions
+
+class OnePlusOneES(EvolutionStrategy):
+
+    """
+    (1+1)-ES avec la règle du 1/5e de succès.
+
+    A chaque itération un seul descendant est tiré autour de la solution 
+    courante, il la remplace s'il est au moins aussi bon. Le pas sigma est 
+    multiplié par exp((succès - 1/5) / d) : il augmente après un succès et 
+    diminue après un échec, il est stable pour un taux de succès de 1/5.
+
+    Options (en plus de 'sigma') :
+
+    * 'd' : l'amortissement, 1 + dim/2 par défaut
+
+    Note : les options 'mu' et 'lambda' sont ignorées
+    """
+
+    def __init__ (self, prob, options) :
+
+        EvolutionStrategy.__init__(self, prob, options)
+
+        self._mu = self._lambda = 1
+        self._d = options.get('d', 1 + self._solution.dim / 2)
+        self._success = False
+
+    def sample_solutions(self):
+        """ 
+        Tire et évalue un descendant de la solution courante.
+        Retourne une Population d'une solution
+        """
+        z = self._rng.standard_normal((1, self._solution.dim))
+        sample = Population(z * self._sigma + self._solution.solution,
+                            RealSolution)
+        eval_solutions(sample, self._problem)
+        return sample
+
+    def update_sigma(self, sample):
+        """ La règle du 1/5e de succès """
+        self._success = self.better(sample[0], self._solution)
+        self._sigma *= math.exp((self._success - 0.2) / self._d)
+
+    def update_m(self, sample):
+        """ Le descendant remplace la solution courante s'il est meilleur """
+        if self._success :
+            # sample[0] est une vue sur l'échantillon, on la copie
+            self._solution = sample[0].clone()
@@ -2,10 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import math
-import random
 import numpy as np
 
-from search import EvolutionStrategy, RealSolution, eval_solutions, sort_pop
+from search import EvolutionStrategy, RealSolution, Population, \
+                   eval_solutions, sort_pop
 
 class RandomES(EvolutionStrategy):
 
@@ -40,20 +40,18 @@ class RandomES(EvolutionStrategy):
         Échantillonage depuis une distribution normale autour de la solution 
         courante (moyennne) et self._sigma comme variance. 
         
-        Retourne une liste de Lambda solutions évaluée et triée
+        Retourne une Population de Lambda solutions évaluée et triée
 
         """
-        sample = [] 
-        for i in range(self._lambda) :
-            
-            # un vecteur normal de dimension n, de moyenne 0 et variance 1
-            
-            z = np.random.normal(size=self._solution.dim)
+        # lambda vecteurs normaux de dimension n, de moyenne 0 et variance 1,
+        # tirés en un seul appel (une ligne par solution)
+        
+        Z = self._rng.standard_normal((self._lambda, self._solution.dim))
 
-            # on le met à l'échelle et le translate 
-            
-            x = RealSolution(x=(z * self._sigma + self._solution.solution))
-            sample.append(x)
+        # on les met à l'échelle et les translate 
+        
+        sample = Population(Z * self._sigma + self._solution.solution,
+                            RealSolution)
 
         # évaluer les solutions de l'échantillon
         eval_solutions(sample, self._problem)
@@ -73,9 +71,10 @@ class RandomES(EvolutionStrategy):
         Ici : Choisir une solution aléatoire et la garder si elle améliore.
        
         """
-        new_solution = random.choice(sample)
+        new_solution = sample[self._rng.integers(len(sample))]
         if self.better(new_solution, self._solution) :
-            self._solution = new_solution
+            # new_solution est une vue sur l'échantillon, on la copie
+            self._solution = new_solution.clone()
         
     def update_sigma(self, sample):
         """ 
@@ -2,4 +2,5 @@ from .random_ga import *
 from .mu_coma_lambda_ga import *
 from .operateur_selection import *
 from .operateur_croisement import *
-from .operateur_mutation import *
\ No newline at end of file
+from .operateur_mutation import *
+from .generational_ga import *
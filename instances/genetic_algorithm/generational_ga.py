@@ -0,0 +1,188 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+import numpy as np
+
+from search import Population, BinarySolution
+from .random_ga import RandomGA
+from .operateur_croisement import CroisementOnePoint, CroisementUniforme
+from .operateur_mutation import MutationBitflip, MutationUniform
+
+# options 'xover' et 'mutation' -> opérateur
+CROISEMENTS = { 'onepoint' : CroisementOnePoint,
+                'uniform' : CroisementUniforme }
+
+MUTATIONS = { 'bitflip' : MutationBitflip,
+              'uniform' : MutationUniform }
+
+# option 'replacement'
+REMPLACEMENTS = [ 'comma', 'plus', 'elitist', 'steady_state' ]
+
+class GenerationalGA(RandomGA):
+
+    """
+    Algorithme génétique générationnel sur la matrice de la population.
+
+    Chaque génération produit exactement lambda enfants, toutes les étapes
+    travaillent sur des tableaux (aucune solution n'est créée) :
+
+    1. sélection des parents : les indices de toutes les paires sont tirés
+       en une fois (tournoi de taille k ou tirage aléatoire)
+    2. croisement de toutes les paires (cf. xover_batch), une paire n'est
+       croisée qu'avec la probabilité pc, sinon les enfants sont des copies
+       des parents
+    3. mutation (cf. mutate_batch) de chaque enfant avec la probabilité pm
+    4. évaluation en lot (cf. evaluate_batch)
+    5. remplacement (option 'replacement') :
+
+       * 'comma' : (mu, lambda), les mu meilleurs enfants (lambda >= mu)
+       * 'plus' : (mu + lambda), les mu meilleurs des parents et des enfants,
+         a valeur égale les enfants passent d'abord
+       * 'elitist' : (mu, lambda) en gardant les 'elite' meilleurs parents
+         (1 par défaut)
+       * 'steady_state' : les lambda enfants remplacent les lambda plus
+         mauvais parents (lambda < mu)
+
+    Options : 'mu', 'lambda', 'pc' (0.9), 'pm' (1.0), 'xover' ('onepoint'
+    ou 'uniform'), 'mutation' ('bitflip' ou 'uniform'), 'selection'
+    ('tournoi' ou 'aleatoire'), 'k' (2), 'replacement' ('plus'), 'elite' (1)
+    """
+
+    def __init__ (self, prob, options) :
+        """
+        Entrées :
+
+        * Un problème donnée instance de la classe Problem.
+        Seules les problèmes dont les solution sont des tableaus booléens sont
+        acceptée.
+
+        * Un dictionnaire des paramètres des algorithmes (cf. plus haut)
+
+        """
+        super().__init__(prob, options)
+        if not issubclass(self._pop.solution_class, BinarySolution) :
+            raise TypeError("Algorithm only works on binary solution problems")
+
+        self._pc = options.get('pc', 0.9)
+        self._pm = options.get('pm', 1.0)
+        self._k = options.get('k', 2)
+        self._elite = options.get('elite', 1)
+
+        type_xover = options.get('xover', 'onepoint')
+        if type_xover not in CROISEMENTS :
+            raise ValueError("Unknown type of crossover")
+        self._xover_class = CROISEMENTS[type_xover](self._rng)
+
+        type_mutation = options.get('mutation', 'bitflip')
+        if type_mutation not in MUTATIONS :
+            raise ValueError("Unknown type of mutation")
+        self._mutation_class = MUTATIONS[type_mutation](self._rng)
+
+        self._selection = options.get('selection', 'tournoi')
+        if self._selection not in ['tournoi', 'aleatoire'] :
+            raise ValueError("Unknown type of selection method for parents")
+
+        self._replacement = options.get('replacement', 'plus')
+        if self._replacement not in REMPLACEMENTS :
+            raise ValueError("Unknown replacement strategy")
+        if self._replacement == 'comma' and self._lambda < self._mu :
+            raise ValueError("(mu, lambda) replacement requires lambda >= mu")
+        if self._replacement == 'elitist' and \
+           not 0 <= self._elite <= self._mu <= self._lambda + self._elite :
+            raise ValueError("elitist replacement requires elite <= mu <= lambda + elite")
+        if self._replacement == 'steady_state' and self._lambda >= self._mu :
+            raise ValueError("steady state replacement requires lambda < mu")
+
+    @property
+    def name(self):
+        return "GA µ{}_λ{}_{}_pc{}_pm{}".format(self._mu, self._lambda,
+                                                self._replacement, self._pc,
+                                                self._pm).replace('.',',')
+
+    def _order(self, values):
+        """ les indices des valeurs de la meilleure a la plus mauvaise """
+        if self._problem.maximize :
+            return np.argsort(-values, kind='stable')
+        return np.argsort(values, kind='stable')
+
+    def select_parents(self, n):
+        """
+        Les indices (dans self._pop) de n parents, tirés en une fois
+        """
+        mu = len(self._pop)
+        if self._selection == 'aleatoire' :
+            return self._rng.integers(0, mu, size=n)
+
+        # tournoi : n x k participants, le meilleur de chaque ligne gagne
+        participants = self._rng.integers(0, mu, size=(n, self._k))
+        values = self._pop.values[participants]
+        if self._problem.maximize :
+            best = np.argmax(values, axis=1)
+        else :
+            best = np.argmin(values, axis=1)
+        return participants[np.arange(n), best]
+
+    def evolve_pop(self):
+        """
+        Sélection, croisement et mutation de toute la génération (cf. plus
+        haut).
+
+        Sortie : une Population d'enfants de taille self._lambda
+        """
+        nb_enfants = self._xover_class.nb_enfants
+        nb_pairs = self._nb_pairs()
+        genomes = self._pop.genomes
+        parents1 = genomes[self.select_parents(nb_pairs)]
+        parents2 = genomes[self.select_parents(nb_pairs)]
+
+        enfants = self._xover_class.xover_batch(parents1, parents2)
+
+        # les paires non croisées donnent des copies des parents, les
+        # enfants de la paire k sont aux lignes k, nb_pairs + k, ...
+        copies = np.concatenate((parents1, parents2)[:nb_enfants])
+        croises = np.tile(self._rng.random(nb_pairs) < self._pc, nb_enfants)
+        enfants[~croises] = copies[~croises]
+        enfants = enfants[:self._lambda]
+
+        mutes = self._rng.random(len(enfants)) < self._pm
+        enfants[mutes] = self._mutation_class.mutate_batch(enfants[mutes])
+
+        return Population(enfants, self._pop.solution_class)
+
+    def update_pop(self, offspring):
+        """
+        La nouvelle population selon la stratégie de remplacement (cf. plus
+        haut), par des sélections d'indices sur les tableaux.
+
+        Entrée : une Population d'enfants évalués
+        Sortie : une Population de taille self._mu
+        """
+        mu = self._mu
+        if self._replacement == 'comma' :
+            return offspring.take(self._order(offspring.values)[:mu])
+
+        if self._replacement == 'plus' :
+            pool = offspring + self._pop
+            return pool.take(self._order(pool.values)[:mu])
+
+        parents = self._order(self._pop.values)
+        if self._replacement == 'elitist' :
+            elite = self._pop.take(parents[:self._elite])
+            best = offspring.take(self._order(offspring.values)[:mu - self._elite])
+            return elite + best
+
+        # steady_state
+        survivants = self._pop.take(parents[:mu - len(offspring)])
+        return survivants + offspring
+
+    def step_stats(self):
+        """ Retourne les statistiques numériques de l'itération
+        """
+        stats = super().step_stats()
+        stats.update({ 'pc' : self._pc, 'pm' : self._pm })
+        return stats
+
+    def print_step(self):
+        """ Retourne des infos sur l'itération
+        """
+        return "{} pc:{} pm:{} {}".format(super().print_step(), self._pc,
+                                          self._pm, self._replacement)
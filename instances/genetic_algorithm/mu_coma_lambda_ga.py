@@ -2,8 +2,8 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-import random
 from .random_ga import RandomGA
+from search import Population
 from .operateur_croisement import  *
 from .operateur_mutation import *
 from .operateur_selection import *
@@ -26,6 +26,17 @@ class MuComaLambdaGA(RandomGA):
         self._pm = options.get('pm', 0.5)
         self.setup_operateurs(options)
 
+    def step_stats(self):
+        """ Retourne les statistiques numériques de l'itération
+        """
+        stats = super().step_stats()
+        stats.update({'pc': self._pc, 'pm': self._pm,
+                      'type_mutation': self._mutation_class._type_mutation,
+                      'type_xover': self._xover_class._type_xover,
+                      'type_selection_population': self._population_selection_class._type_selection,
+                      'type_cdf': self._population_selection_class._type_cdf})
+        return stats
+
     def print_step(self):
         """ Retourne des infos sur l'itération
         """
@@ -40,9 +51,9 @@ class MuComaLambdaGA(RandomGA):
         """
         type_xover = options.get('xover', 'onepoint')
         if type_xover == 'onepoint':
-            self._xover_class = CroisementOnePoint()
+            self._xover_class = CroisementOnePoint(self._rng)
         elif type_xover == 'uniform':
-            self._xover_class = CroisementUniforme()
+            self._xover_class = CroisementUniforme(self._rng)
         else:
             raise ValueError("Unknown type of crossover")
     
@@ -55,9 +66,9 @@ class MuComaLambdaGA(RandomGA):
         """
         type_mutation = options.get('mutation', 'bitflip')
         if type_mutation == 'bitflip':
-            self._mutation_class = MutationBitflip()
+            self._mutation_class = MutationBitflip(self._rng)
         elif type_mutation == 'uniform':
-            self._mutation_class = MutationUniform()
+            self._mutation_class = MutationUniform(self._rng)
         else:
             raise ValueError("Unknown type of mutation")
     def _get_cdf_class(self, options):
@@ -86,16 +97,16 @@ class MuComaLambdaGA(RandomGA):
         """
         type_selection = options.get('selection_population', 'aleatoire')
         if type_selection == 'aleatoire':
-            self._population_selection_class = SelectionAleatoire(self._problem)
+            self._population_selection_class = SelectionAleatoire(self._problem, self._rng)
         elif type_selection == 'deterministe':
             n = options.get('n', self._mu)
-            self._population_selection_class = SelectionDeterministe(self._problem, n)
+            self._population_selection_class = SelectionDeterministe(self._problem, n, self._rng)
         elif type_selection == 'roulette':
             cdf = self._get_cdf_class(options)
-            self._population_selection_class = SelectionRoulette(self._problem, cdf)
+            self._population_selection_class = SelectionRoulette(self._problem, cdf, self._rng)
         elif type_selection == 'tournoi':
             k = options.get('k', self._mu)
-            self._population_selection_class = SelectionTournoi(self._problem, k)
+            self._population_selection_class = SelectionTournoi(self._problem, k, self._rng)
         else:
             raise ValueError("Unknown type of selection method for parents")     
     
@@ -116,34 +127,38 @@ class MuComaLambdaGA(RandomGA):
         Créer des nouvelles solution par evolution des parents. Les opérateurs 
         génétique son appliqué ici. 
 
+        Une paire de parents est croisée avec la probabilité pc, sinon ses 
+        enfants sont des copies des parents (comme GenerationalGA). Les 
+        enfants d'une paire sont mutés ensemble avec la probabilité pm.
+        Croisement et mutation sont appliqués à toute la matrice des parents
+        (cf. xover_batch et mutate_batch).
+
         Entrée : une liste de parents (cf. make_parent_pop)
-        Sortie : une liste de solutions enfants de taille self._lambda
+        Sortie : une Population d'enfants de taille self._lambda
 
         """
-        offspring = []
-        done = False
-        while not done : 
+        nb_enfants = self._xover_class.nb_enfants
+        nb_pairs = self._nb_pairs()
+        genomes = self._pop.genomes
+        parents1 = genomes[self._rng.integers(0, len(genomes), size=nb_pairs)]
+        parents2 = genomes[self._rng.integers(0, len(genomes), size=nb_pairs)]
 
-            # on prend une solution 
-            p1 = self._select_one_random ( self._pop )
-            p2 = self._select_one_random ( self._pop )
-            enfants = []
-            # croisement avec probabilité pc
-            if random.random() < self._pc :
-                enfants = self._xover_class.xover(p1, p2)
-            
-            # mutation avec probabilité pm
-            if random.random() < self._pm :
-                for e in enfants:
-                    self._mutation_class.mutate(e)
-         
-            # on rajoute a la liste les enfants
-            offspring.extend(enfants)
-
-            # si la population des enfants est remplie, on la retourne
-            done = len(offspring) == self._lambda
+        enfants = self._xover_class.xover_batch(parents1, parents2)
+
+        # les paires non croisées donnent des copies des parents, les
+        # enfants de la paire k sont aux lignes k, nb_pairs + k, ...
+        copies = np.concatenate((parents1, parents2)[:nb_enfants])
+        croises = np.tile(self._rng.random(nb_pairs) < self._pc, nb_enfants)
+        enfants[~croises] = copies[~croises]
+        enfants = enfants[:self._lambda]
+
+        # mutation avec probabilité pm, les enfants de la paire k sont aux
+        # lignes k, nb_pairs + k, ... 
+        mutes = self._rng.random(nb_pairs) < self._pm
+        mutes = np.tile(mutes, nb_enfants)[:len(enfants)]
+        enfants[mutes] = self._mutation_class.mutate_batch(enfants[mutes])
             
-        return offspring
+        return Population(enfants, self._pop.solution_class)
     
     def print_final(self):
         return super().print_final() + " pc:{} pm:{}".format(self._pc, self._pm)
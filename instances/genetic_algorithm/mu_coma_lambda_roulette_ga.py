@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-import random
 from .mu_coma_lambda_ga import MuComaLambdaGA
 from search import PopulationSearchAlgorithm, BinarySolution, sort_pop, eval_solutions
 
@@ -111,7 +110,7 @@ class MuComaLambdaRouletteGA(MuComaLambdaGA):
         cdf = self._cdf_function(pool)
         s = 0
         while s < self._mu:
-            r = random.random()
+            r = self._rng.random()
             i = 0
             while cdf[i] < r:
                 i += 1
@@ -2,9 +2,10 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-import random
 from .mu_coma_lambda_ga import MuComaLambdaGA
-from search import PopulationSearchAlgorithm, BinarySolution, sort_pop
+from .operateur_croisement import CroisementUniforme
+from .operateur_mutation import MutationUniform
+from search import PopulationSearchAlgorithm, BinarySolution, Population, sort_pop
 
 class MuComaLambdaUniformGA(MuComaLambdaGA):
 
@@ -20,6 +21,9 @@ class MuComaLambdaUniformGA(MuComaLambdaGA):
 
         """
         MuComaLambdaGA.__init__(self, prob, options)
+
+        self._xover_uniform_class = CroisementUniforme(self._rng)
+        self._mutation_uniform_class = MutationUniform(self._rng)
     @property
     def name(self):
         return "µ,λ (uniform) µ{}_λ{}_pc{}_pm{}".format(self._mu, self._lambda, self._pc, self._pm).replace('.',',')
@@ -32,10 +36,11 @@ class MuComaLambdaUniformGA(MuComaLambdaGA):
         if not isinstance(x, BinarySolution) :
             raise TypeError("Algorithm only works on binary solution problems")
         
-        proba = 1.0/len(x.solution)
-        for i in range(len(x.solution)):
-            if random.random() < proba :
-                x.solution[i] = not x.solution[i]
+        proba = 1.0/x.dim
+        y = x.writable()
+        for i in range(x.dim):
+            if self._rng.random() < proba :
+                y[i] = not y[i]
 
         return x
 
@@ -48,9 +53,11 @@ class MuComaLambdaUniformGA(MuComaLambdaGA):
                 isinstance(x2, BinarySolution) ) :
             raise TypeError("Algorithm only works on binary solution problems!")
         
-        for i in range(len(x1.solution)):
-            if random.random() < 0.5 :
-                x1.solution[i] = x2.solution[i]
+        y1 = x1.writable()
+        y2 = x2.solution
+        for i in range(x1.dim):
+            if self._rng.random() < 0.5 :
+                y1[i] = y2[i]
         
         return x1
 
@@ -60,31 +67,27 @@ class MuComaLambdaUniformGA(MuComaLambdaGA):
         Créer des nouvelles solution par evolution des parents. Les opérateurs 
         génétique son appliqué ici. 
 
+        Chaque enfant est une copie d'un premier parent, croisé avec un second
+        avec la probabilité pc, puis muté avec la probabilité pm. Les lambda
+        enfants sont traités en une fois (cf. xover_batch et mutate_batch).
+
         Entrée : une liste de parents (cf. make_parent_pop)
-        Sortie : une liste de solutions enfants de taille self._lambda
+        Sortie : une Population d'enfants de taille self._lambda
 
         """
-        offspring = []
-        done = False
-        while not done : 
-
-            # on prend une solution 
-            p1 = self._select_one_random ( self._pop )
-            p2 = self._select_one_random ( self._pop )
+        genomes = self._pop.genomes
+        n = self._lambda
+        enfants = genomes[self._rng.integers(0, len(genomes), size=n)]
+        parents2 = genomes[self._rng.integers(0, len(genomes), size=n)]
             
-            # croisement
-            if random.random() < self._pc :
-                p1 = self._xover_uniform(p1, p2)
+        # croisement
+        croises = self._rng.random(n) < self._pc
+        enfants[croises] = self._xover_uniform_class.xover_batch(
+            enfants[croises], parents2[croises])
             
+        # mutation
+        mutes = self._rng.random(n) < self._pm
+        enfants[mutes] = self._mutation_uniform_class.mutate_batch(
+            enfants[mutes])
             
-            # mutation
-            if random.random() < self._pm :
-                p1 = self._mutation_uniform( p1 )
-         
-            # on rajoute a la liste
-            offspring.append(p1)
-
-            # si la population des enfants est remplie, on la retourne
-            done = len(offspring) == self._lambda
-            
-        return offspring
+        return Population(enfants, self._pop.solution_class)
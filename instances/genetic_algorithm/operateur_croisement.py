@@ -1,11 +1,19 @@
 from search.solutions import BinarySolution
-import random
+import numpy as np
+
+from search.misc import get_rng
 
 class OperateurCroisement:
     """ 
     Classe abstraite pour les opérateurs de croisement 
     """
-    def __init__(self):
+
+    # nombre d'enfants produits par un croisement
+    nb_enfants = 1
+
+    def __init__(self, rng=None):
+        # générateur aléatoire (numpy.random.Generator, cf. get_rng)
+        self._rng = get_rng(rng)
         self._type_xover = 0
 
     def xover(self, parent1: BinarySolution, parent2: BinarySolution) -> list[BinarySolution]:
@@ -16,6 +24,25 @@ class OperateurCroisement:
         Sortie : une liste de solutions issue du croisement
         """
         raise NotImplementedError
+
+    def xover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """
+        Croisement de m paires de parents en une seule fois : la paire k est
+        (parents1[k], parents2[k]).
+
+        Entrée : deux tableaux (m x dimension) de génomes, non modifiés.
+        Sortie : un tableau (nb_enfants*m x dimension) des enfants, les
+        premiers enfants des m paires d'abord, puis les seconds, etc.
+
+        Par défaut on applique xover paire par paire, les classes concrètes
+        la remplacent par une version vectorisée.
+        """
+        enfants = [ [] for i in range(self.nb_enfants) ]
+        for x1, x2 in zip(parents1, parents2) :
+            sols = self.xover(BinarySolution(x=x1), BinarySolution(x=x2))
+            for e, s in zip(enfants, sols) :
+                e.append(s.solution)
+        return np.concatenate([ np.array(e) for e in enfants ])
     
     def __str__(self):
         return f"type_xover:{self._type_xover}"
@@ -24,32 +51,58 @@ class CroisementOnePoint(OperateurCroisement):
     """
     Opérateur de croisement en un point.
     """
-    def __init__(self):
-        super().__init__()
+
+    nb_enfants = 2
+
+    def __init__(self, rng=None):
+        super().__init__(rng)
         self._type_xover = 1
 
     def xover(self, parent1: BinarySolution, parent2: BinarySolution) -> list[BinarySolution]:
-        point = random.randint(0, len(parent1.solution)-1)
+        point = self._rng.integers(parent1.dim)
 
-        for i in range(point, len(parent1.solution)):
-            tmp = parent1.solution[i]
-            parent1.solution[i] = parent2.solution[i]
-            parent2.solution[i] = tmp
+        x1 = parent1.writable()
+        x2 = parent2.writable()
+        for i in range(point, parent1.dim):
+            tmp = x1[i]
+            x1[i] = x2[i]
+            x2[i] = tmp
         return [parent1, parent2]
+
+    def xover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """
+        Un point de croisement par paire, les fins sont échangées à l'aide
+        d'un masque (m x dimension) : masque[k, i] = i >= point[k]
+        """
+        m, dim = parents1.shape
+        points = self._rng.integers(0, dim, size=m)
+        masque = np.arange(dim) >= points[:, None]
+        return np.concatenate((np.where(masque, parents2, parents1),
+                               np.where(masque, parents1, parents2)))
     
     
 class CroisementUniforme(OperateurCroisement):
     """
     Opérateur de croisement uniforme.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
         self._type_xover = 2
 
     def xover(self, parent1: BinarySolution, parent2: BinarySolution) -> list[BinarySolution]:
-        n = len(parent1.solution)
+        n = parent1.dim
+        x1 = parent1.writable()
+        x2 = parent2.solution
         for i in range(n):
-            if random.random() < 0.5:
-                parent1.solution[i] = parent2.solution[i]
+            if self._rng.random() < 0.5:
+                x1[i] = x2[i]
+
+        return [parent1]
 
-        return [parent1]
\ No newline at end of file
+    def xover_batch(self, parents1: np.ndarray, parents2: np.ndarray) -> np.ndarray:
+        """
+        Chaque gène vient de parents2 avec une probabilité 0.5, le masque de
+        toute la matrice est tiré en un seul appel
+        """
+        masque = self._rng.random(parents1.shape) < 0.5
+        return np.where(masque, parents2, parents1)
@@ -1,11 +1,15 @@
 from search.solutions import BinarySolution
-import random
+import numpy as np
+
+from search.misc import get_rng
 
 class OperateurMutation:
     """ 
     Classe abstraite pour les opérateurs de mutation 
     """
-    def __init__(self):
+    def __init__(self, rng=None):
+        # générateur aléatoire (numpy.random.Generator, cf. get_rng)
+        self._rng = get_rng(rng)
         self._type_mutation = 0
 
     def mutate(self, individu: BinarySolution) -> BinarySolution:
@@ -16,6 +20,20 @@ class OperateurMutation:
         Sortie : la solution modifiée
         """
         raise NotImplementedError
+
+    def mutate_batch(self, individus: np.ndarray) -> np.ndarray:
+        """
+        Mutation de m individus en une seule fois.
+
+        Entrée : un tableau (m x dimension) de génomes, modifié en place.
+        Sortie : le tableau modifié
+
+        Par défaut on applique mutate ligne par ligne, les classes concrètes
+        la remplacent par une version vectorisée.
+        """
+        for x in individus :
+            self.mutate(BinarySolution(x=x, copy=False))
+        return individus
     
     def __str__(self):
         return f"type_mutation:{self._type_mutation}"
@@ -25,30 +43,48 @@ class MutationBitflip(OperateurMutation):
     """
     Opérateur de mutation bitflip.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
         self._type_mutation = 1
 
     def mutate(self, individu: BinarySolution) -> BinarySolution:
-        i = random.randint(0, len(individu.solution)-1 )
-        individu.solution[i] = not individu.solution[i]
+        i = self._rng.integers(len(individu.solution))
+        individu.flip(i)
             
         return individu
+
+    def mutate_batch(self, individus: np.ndarray) -> np.ndarray:
+        """ Un bit aléatoire par ligne, inversés en une seule opération """
+        m, dim = individus.shape
+        lignes = np.arange(m)
+        bits = self._rng.integers(0, dim, size=m)
+        individus[lignes, bits] = ~individus[lignes, bits]
+        return individus
     
 class MutationUniform(OperateurMutation):
     """
     Opérateur de mutation uniforme.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, rng=None):
+        super().__init__(rng)
         self._type_mutation = 2
 
     def mutate(self, individu: BinarySolution) -> BinarySolution:
-        n = len(individu.solution)
+        n = individu.dim
         probabilite_mutation = 1/n
+        x = individu.writable()
         for i in range(n):
-            if random.random() < probabilite_mutation:
-                individu.solution[i] = not individu.solution[i]
+            if self._rng.random() < probabilite_mutation:
+                x[i] = not x[i]
 
             
-        return individu
\ No newline at end of file
+        return individu
+
+    def mutate_batch(self, individus: np.ndarray) -> np.ndarray:
+        """
+        Chaque bit est inversé avec une probabilité 1/dimension, le masque de
+        Bernoulli de toute la matrice est tiré en un seul appel
+        """
+        masque = self._rng.random(individus.shape) < 1/individus.shape[1]
+        individus ^= masque
+        return individus
@@ -1,5 +1,6 @@
-from search import BinarySolution, sort_pop, eval_solutions, is_finite, Problem
-import random, math
+from search import BinarySolution, sort_pop, eval_solutions, is_finite, Problem, get_rng
+import math
+import numpy as np
 
 class CDF:
     """
@@ -72,8 +73,10 @@ class OperateurSelection:
     """ 
     Classe abstraite pour les opérateurs de selection de parents
     """
-    def __init__(self, problem: Problem):
+    def __init__(self, problem: Problem, rng=None):
         self._problem = problem
+        # générateur aléatoire (numpy.random.Generator, cf. get_rng)
+        self._rng = get_rng(rng)
         self._type_selection = 0
         self._type_cdf = 0
 
@@ -93,23 +96,23 @@ class SelectionAleatoire(OperateurSelection):
     """
     Opérateur de selection aléatoire.
     """
-    def __init__(self, problem: Problem):
-        super().__init__(problem)
+    def __init__(self, problem: Problem, rng=None):
+        super().__init__(problem, rng)
         self._type_selection = 1
 
     def select(self, population: list[BinarySolution], n: int) -> list[BinarySolution]:
         """
         Selectionne n individus de la population de manière aléatoire. Avec remise.
         """
-        return random.choices(population, k=n)
+        return [population[i] for i in self._rng.integers(len(population), size=n)]
     
 class SelectionDeterministe(OperateurSelection):
     """
     Opérateur de selection déterministe.
     Selectionne les n meilleurs individus de la population.
     """
-    def __init__(self, problem: Problem, n: int):
-        super().__init__(problem)
+    def __init__(self, problem: Problem, n: int, rng=None):
+        super().__init__(problem, rng)
         self._type_selection = 2
         self._n = n
 
@@ -121,8 +124,8 @@ class SelectionRoulette(OperateurSelection):
     """
     Opérateur de selection par méthode de la roulette.
     """
-    def __init__(self, problem: Problem, CDF: CDF):
-        super().__init__(problem)
+    def __init__(self, problem: Problem, CDF: CDF, rng=None):
+        super().__init__(problem, rng)
         self._type_selection = 3
         self._CDF = CDF
         self._type_cdf = CDF.type_cdf()
@@ -130,15 +133,18 @@ class SelectionRoulette(OperateurSelection):
 
     def select(self, population: list[BinarySolution], n: int) -> list[BinarySolution]:
         cdf = self._CDF.create_cdf(population)
-        return random.choices(population, cum_weights=cdf, k=n)
+        # même tirage que random.choices avec cum_weights : recherche dichotomique
+        tirages = self._rng.random(n) * cdf[-1]
+        idx = np.minimum(np.searchsorted(cdf, tirages, side='right'), len(population)-1)
+        return [population[i] for i in idx]
 
 class SelectionTournoi(OperateurSelection):
     """
     Opérateur de selection par méthode du tournoi.
     #TODO
     """
-    def __init__(self, problem: Problem, k: int):
-        super().__init__(problem)
+    def __init__(self, problem: Problem, k: int, rng=None):
+        super().__init__(problem, rng)
         self._k = k
         self._type_selection = 4
 
@@ -146,7 +152,7 @@ class SelectionTournoi(OperateurSelection):
         return [self._tournoi(population) for _ in range(n)]
 
     def _tournoi(self, population: list[BinarySolution]) -> BinarySolution:
-        participants = random.sample(population, self._k)
+        participants = [population[i] for i in self._rng.choice(len(population), size=self._k, replace=False)]
         for participant in participants:
             # On évalue les participants si ce n'est pas déjà fait
             if not participant.value:
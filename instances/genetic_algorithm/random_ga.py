@@ -2,9 +2,10 @@
 # -*- coding: utf-8 -*-
 import numpy as np
 
-import random 
 
-from search import PopulationSearchAlgorithm, BinarySolution, sort_pop
+from search import PopulationSearchAlgorithm, BinarySolution, Population, sort_pop
+from .operateur_croisement import CroisementOnePoint
+from .operateur_mutation import MutationBitflip
 
 class RandomGA(PopulationSearchAlgorithm):
 
@@ -21,6 +22,10 @@ class RandomGA(PopulationSearchAlgorithm):
         """
         super().__init__(prob, options)
 
+        # opérateurs génétiques, appliqués sur des matrices de génomes
+        self._xover_class = CroisementOnePoint(self._rng)
+        self._mutation_class = MutationBitflip(self._rng)
+
     @property
     def name(self):
         return "RandomGA µ{}_λ{}".format(self._mu, self._lambda).replace('.',',')
@@ -33,18 +38,21 @@ class RandomGA(PopulationSearchAlgorithm):
         Sortie : un element aléatoire (une copie de l'élément)
         
         """
-        return random.choice( pool ).clone()
+        return pool[self._rng.integers(len(pool))].clone()
 
     def _select_n_best(self, pool, n):
         """
         Retourne les n meilleures solution dans la liste donnée, 
         on trie pool et retourne les n premiers.
         
-        Entrée : une liste de solutions (précédemment évaluées)
-        Sortie : une liste des n meilleures 
+        Entrée : une Population ou une liste de solutions (précédemment 
+                 évaluées)
+        Sortie : une Population ou une liste des n meilleures 
         """
         
         sort_pop(pool, self._problem)
+        if isinstance(pool, Population) :
+            return pool[:n].copy()
         return [x.clone() for x in pool[:n]]
 
     def _xover_one_point(self, x1, x2):
@@ -61,12 +69,14 @@ class RandomGA(PopulationSearchAlgorithm):
         
      
         # le point de croisement
-        point = random.randint(0, len(x1.solution)-1)
-
-        for i in range(point, len(x1.solution)):
-            tmp = x1.solution[i]
-            x1.solution[i] = x2.solution[i]
-            x2.solution[i] = tmp
+        point = self._rng.integers(x1.dim)
+
+        y1 = x1.writable()
+        y2 = x2.writable()
+        for i in range(point, x1.dim):
+            tmp = y1[i]
+            y1[i] = y2[i]
+            y2[i] = tmp
         
         return x1, x2
     
@@ -80,8 +90,8 @@ class RandomGA(PopulationSearchAlgorithm):
         if not isinstance(x, BinarySolution) :
             raise TypeError("Algorithm only works on binary solution problems")
       
-        i = random.randint(0, len(x.solution)-1 )
-        x.solution[i] = not x.solution[i]
+        i = self._rng.integers(len(x.solution))
+        x.flip(i)
             
         return x
              
@@ -90,41 +100,45 @@ class RandomGA(PopulationSearchAlgorithm):
         Créer des nouvelles solution par evolution des parents. Les opérateurs 
         génétique son appliqué ici. 
 
+        Les parents sont tirés en une fois, croisement et mutation sont 
+        appliqués à toute la matrice des parents (cf. xover_batch et
+        mutate_batch).
+
         Entrée : une liste de parents (cf. make_parent_pop)
-        Sortie : une liste de solutions enfants de taille self._lambda
+        Sortie : une Population d'enfants de taille self._lambda
 
         """
-        offspring = []
-        done = False
-        while not done : 
+        if not issubclass(self._pop.solution_class, BinarySolution) :
+            raise TypeError("Algorithm only works on binary solution problems")
 
-            # on prend une solution 
-            p1 = self._select_one_random ( self._pop )
-            p2 = self._select_one_random ( self._pop )
-            
-            # croisement
-            p1, p2 = self._xover_one_point(p1, p2)
-            
-            # mutation 
-            p1 = self._mutation_bitflip( p1 )
-            p2 = self._mutation_bitflip( p2 )
-         
-            # on rajoute a la liste
-            offspring.append(p1)
-            offspring.append(p2)
-
-            # si la population des enfants est remplie, on la retourne
-            done = len(offspring) == self._lambda
-            
-        return offspring
+        enfants = self._xover_pairs(self._nb_pairs())
+        self._mutation_class.mutate_batch(enfants)
+
+        return Population(enfants, self._pop.solution_class)
+
+    def _nb_pairs(self):
+        """ nombre de paires de parents pour produire lambda enfants """
+        return -(-self._lambda // self._xover_class.nb_enfants)
+
+    def _xover_pairs(self, nb_pairs):
+        """
+        Tire nb_pairs paires de parents aléatoires dans self._pop et les croise
+
+        Sortie : la matrice des self._lambda premiers enfants
+        """
+        genomes = self._pop.genomes
+        parents1 = genomes[self._rng.integers(0, len(genomes), size=nb_pairs)]
+        parents2 = genomes[self._rng.integers(0, len(genomes), size=nb_pairs)]
+        
+        return self._xover_class.xover_batch(parents1, parents2)[:self._lambda]
 
     def update_pop(self, offspring):
         """
         Constituer la nouvelle population selon une stratégie de selection 
         donnée depuis les enfants et self._pop.  
 
-        Entrée : une liste de solutions enfants 
-        Sortie : une liste de solutions de taille self._mu
+        Entrée : une Population d'enfants 
+        Sortie : une Population de taille self._mu
 
         """
         new_pop = self._select_n_best(offspring, self._mu)
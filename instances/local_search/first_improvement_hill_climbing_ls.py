@@ -1,9 +1,6 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
-import random
 
-from search import LocalSearchAlgorithm
-from functools import cmp_to_key
 from .hill_climbing_ls import HillClimbingLS
 
 class FirstImprovementHillClimbingLS(HillClimbingLS):
@@ -22,24 +19,22 @@ class FirstImprovementHillClimbingLS(HillClimbingLS):
 
     def select_next_solution(self, candidates):
         """ Si il y des solutions (après filtrage), retourne la première solution améliorante
+
+        Le parcours s'arrête au premier voisin améliorant, les mouvements 
+        suivants ne sont ni générés ni évalués.
         """
-        if len(candidates) >0 :
-            for candidate in candidates:
-                if self.better(self._problem.evaluate(candidate), self._solution.value):
-                    return candidate
+        for move in candidates:
+            value = self.evaluate_move(move)
+            if self.better(value, self._solution.value):
+                return self.make_neighbor(move, value)
         return None
 
     def accept(self, new_solution) :
         """ FirstImprovementHillClimbingLS accepte les solutions améliorantes, retourner True
-        """
 
-        # Dans un autre algorithme il  faut faire un choix, les
-        # valeurs des solutions son obtenues comme suit :
-        #
-        cur_solution_val = self._solution.value
-        new_solution_val = self._problem.evaluate(new_solution)
-                
-        return self.better(new_solution_val, cur_solution_val)
+        (la valeur du voisin est déjà connue, pas de nouvelle évaluation)
+        """
+        return self.better(new_solution, self._solution)
     
   
 
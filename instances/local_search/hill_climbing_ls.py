@@ -1,7 +1,6 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
 from .random_ls import RandomLS
-from functools import cmp_to_key
 
 class HillClimbingLS(RandomLS):
 
@@ -17,15 +16,16 @@ class HillClimbingLS(RandomLS):
     def select_next_solution(self, candidates):
         """ Si il y des solutions (après filtrage), retourner la meilleure
         """
-        if candidates:  # Vérifie si la liste n'est pas vide
-            for c in candidates:
-                # Si le candidat n'est pas évalué, on l'évalue
-                if not c.value:
-                    self._problem.evaluate(c)
-                    
-            # Trie les candidats en utilisant le comparateur et retourne le meilleur
-            candidates.sort(key=cmp_to_key(self.compare), reverse=True)
-            return candidates[0]
+        best_move = None
+        best_value = None
+        for move in candidates:
+            value = self.evaluate_move(move)
+            if best_move is None or self.better(value, best_value):
+                best_move = move
+                best_value = value
+
+        if best_move is not None :
+            return self.make_neighbor(best_move, best_value)
         return None
 
     def accept(self, new_solution) :
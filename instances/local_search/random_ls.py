@@ -1,6 +1,5 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
-import random
 
 from search import LocalSearchAlgorithm
 
@@ -12,20 +11,24 @@ class RandomLS(LocalSearchAlgorithm):
         super().__init__(prob, options)
    
     def get_neighbors(self):
-        """ retourner les voisins de la solution courante 
+        """ parcourir les voisins de la solution courante (ordre aléatoire)
         """ 
-        return self._solution.neighbors()
+        return self.moves()
 
     def filter_neighbors(self, neighbors):
         """ filtrer toutes les solutions violant les contraintes 
         """
-        return [ n for n in neighbors if self._problem.feasable(n) ]
+        return ( m for m in neighbors if self.feasable_move(m) )
     
     def select_next_solution(self, candidates):
         """ Si il y des solutions (après filtrage), retourner une au hasard
+
+        Le voisinage est parcouru dans un ordre aléatoire, le premier 
+        candidat est donc un voisin faisable tiré au hasard.
         """
-        if len(candidates) >0 :
-            return random.choice(candidates)
+        move = next(candidates, None)
+        if move is not None :
+            return self.make_neighbor(move, self.evaluate_move(move))
         return None
 
     def accept(self, new_solution) :
@@ -36,7 +39,7 @@ class RandomLS(LocalSearchAlgorithm):
         # valeurs des solutions son obtenues comme suit :
         #
         cur_solution_val = self._solution.value
-        new_solution_val = self._problem.evaluate(new_solution)
+        new_solution_val = new_solution.value
                 
         return True
     
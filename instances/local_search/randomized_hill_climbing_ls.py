@@ -1,8 +1,6 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
-import random
 
-from functools import cmp_to_key
 from .hill_climbing_ls import HillClimbingLS
 
 class RandomizedHillClimbingLS(HillClimbingLS):
@@ -24,32 +22,30 @@ class RandomizedHillClimbingLS(HillClimbingLS):
     def select_next_solution(self, candidates):
         """ Si il y des solutions (après filtrage), retourne une solution aléatoire avec une probabilité _alpha ou la meilleure solution sinon (1 - _alpha)
         """
-        if len(candidates) >0 :
-            if self._alpha < random.uniform(0, 1):
-                # on choisit un voisin aléatoire
-                candidate = random.choice(candidates)
-                # si le candidat est déjà évalué on ne le réévalue pas
-                if not candidate.value:
-                    self._problem.evaluate(candidate)
-                return candidate
-            else:
-                # on choisit le meilleur voisin
-                for candidate in candidates:
-                    if not candidate.value:
-                        self._problem.evaluate(candidate)
-                candidates.sort(key=cmp_to_key(self.compare), reverse=True)
-                return candidates[0]
-        return None
+        if self._alpha < self._rng.uniform(0, 1):
+            # on choisit un voisin aléatoire (le voisinage est parcouru
+            # dans un ordre aléatoire, le premier candidat suffit)
+            move = next(candidates, None)
+            if move is not None :
+                return self.make_neighbor(move, self.evaluate_move(move))
+            return None
+
+        # on choisit le meilleur voisin
+        return super().select_next_solution(candidates)
 
     def accept(self, new_solution) :
         """ Accepte la solution courante
         (Le choix de la solution est fait dans select_next_solution)
         """
-        if not new_solution.value:
-            self._problem.evaluate(new_solution)
-                
         return True
     
+    def step_stats(self):
+        """ Retourne les statistiques numériques de l'itération
+        """
+        stats = super().step_stats()
+        stats['alpha'] = self._alpha
+        return stats
+
     def print_step(self):
         """ Retourne des infos sur l'itération
         """
@@ -1,6 +1,5 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
-import random
 import math
 
 from search import LocalSearchAlgorithm
@@ -25,13 +24,6 @@ class SimulatedAnnealingLS(RandomLS):
     def name(self):
         return "RecuitSimulé"
     
-    def select_next_solution(self, candidates):
-        """ Si il y des solutions (après filtrage), retourne la première solution améliorante
-        """
-        if len(candidates) >0 :
-            return random.choice(candidates)
-        return None
-
     def probability_accept(self, solution) :
         """ La probabilité d'accepter une solution
         """
@@ -45,12 +37,19 @@ class SimulatedAnnealingLS(RandomLS):
         if new_solution.value is None:
             self._problem.evaluate(new_solution)
         # Si la solution est meilleure ou si la probabilité est acceptée
-        accepter = self.better(new_solution, self._solution) or self.probability_accept(new_solution) > random.uniform(0, 1)
+        accepter = self.better(new_solution, self._solution) or self.probability_accept(new_solution) > self._rng.uniform(0, 1)
         # Mis à jour de T
         self._T = self._T * self._gamma
 
         return accepter
     
+    def step_stats(self):
+        """ Retourne les statistiques numériques de l'itération
+        """
+        stats = super().step_stats()
+        stats.update({'gamma': self._gamma, 'T': self._T, 'T0': self._T0})
+        return stats
+
     def print_step(self):
         """ Retourne des infos sur l'itération
         """
@@ -7,56 +7,131 @@ from .random_ls import RandomLS
 class TabuLS(RandomLS):
     """
     Algorithme de Recherche Tabou
+
+    Deux mémoires tabou (option 'tabu_mode') :
+
+    * 'attributes' (par défaut) : les attributs que le mouvement retenu fait
+      disparaître (bit et ancienne valeur, éléments et anciennes positions,
+      arêtes supprimées, cf. Move.removed_attributes) sont tabous pendant t
+      itérations. Un mouvement est tabou s'il refait apparaître un de ces
+      attributs, le test est en O(1) (dictionnaire attribut -> fin du tabou).
+    * 'solutions' : les t dernières solutions, rangées dans un ensemble par
+      leurs empreintes (cf. Solution.fingerprint), le test est en O(n) au lieu
+      de O(t*n).
+
+    Critère d'aspiration (option 'aspiration', vrai par défaut) : un
+    mouvement tabou est quand même retenu s'il améliore la meilleure
+    solution trouvée.
     """
 
     def __init__(self, prob, options):
-        """ Constructeur de la super classe 
+        """ Constructeur de la super classe
         """
         super().__init__(prob, options)
-        # Taille de la liste tabou
+        # Taille de la liste tabou (durée du tabou en itérations en mode
+        # 'attributes')
         self.t = options.get('t', 10)
-        # liste tabou (utilisation d'une deque pour une gestion automatique de la taille et pour plus d'efficacité)
-        self._tabu_list = deque(maxlen=self.t)
+        self._tabu_mode = options.get('tabu_mode', 'attributes')
+        if self._tabu_mode not in ['attributes', 'solutions'] :
+            raise ValueError("Unknown tabu_mode")
+        self._aspiration = options.get('aspiration', True)
+
+        self._iteration = 0
+        # attribut -> itération de fin du tabou
+        self._tabu = {}
+        # file des entrées dans l'ordre d'arrivée, pour oublier les
+        # attributs expirés ou les solutions les plus anciennes
+        self._tabu_list = deque()
 
     @property
     def name(self):
         return "Tabu"
-    
+
     def select_next_solution(self, candidates):
-        """ Si il y des solutions (après filtrage), retourne la meilleure solution non dans la liste tabou
+        """ Si il y des solutions (après filtrage), retourne la meilleure solution non taboue
+        (ou taboue mais meilleure que la meilleure solution trouvée)
         """
-        if len(candidates) > 0:
-            meilleur = None # pour stocker la meilleure solution
+        meilleur = None # pour stocker le meilleur mouvement
+        meilleure_valeur = None
+
+        for move in candidates:
+            tabu = self.is_tabu(move)
+            if tabu and not self._aspiration:
+                continue
 
-            for candidate in candidates:
-                # Si la solution n'est pas dans la liste tabou on la compare avec la meilleure solution et on la remplace si elle est meilleure
-                if candidate not in self._tabu_list:
+            valeur = self.evaluate_move(move)
+            # aspiration : un mouvement tabou doit améliorer strictement la
+            # meilleure solution
+            if tabu and self.better(self._best_solution.value, valeur):
+                continue
 
-                    if not candidate.value: # Si la solution n'a pas été évaluée, on l'évalue
-                        self._problem.evaluate(candidate)
+            if meilleur is None or self.better(valeur, meilleure_valeur):
+                meilleur = move
+                meilleure_valeur = valeur
 
-                    if not meilleur: # Si c'est la première solution on la stocke
-                        meilleur = candidate
-                    elif self.better(candidate, meilleur): # Si la solution est meilleure que la meilleure solution on la stocke
-                        meilleur = candidate
-            return meilleur
+        if meilleur is not None:
+            return self.make_neighbor(meilleur, meilleure_valeur)
         return None
 
+    def _solution_key(self, sol):
+        """ la clef d'une solution dans la mémoire 'solutions' """
+        return sol.fingerprint
+
+    def is_tabu(self, move):
+        """ Vrai si le mouvement move depuis la solution courante est tabou
+        """
+        if self._tabu_mode == 'attributes':
+            return any(self._tabu.get(a, -1) > self._iteration
+                       for a in move.added_attributes(self._solution))
+
+        sol = self._scratch_solution()
+        move.apply(sol)
+        tabu = self._solution_key(sol) in self._tabu
+        move.undo(sol)
+        return tabu
+
+    def _forget(self):
+        """ retire de la mémoire les tabous expirés """
+        if self._tabu_mode == 'attributes':
+            while self._tabu_list and self._tabu_list[0][0] <= self._iteration:
+                fin, a = self._tabu_list.popleft()
+                if self._tabu.get(a) == fin:
+                    del self._tabu[a]
+            return
+
+        while len(self._tabu_list) > self.t:
+            key = self._tabu_list.popleft()
+            self._tabu[key] -= 1
+            if self._tabu[key] == 0:
+                del self._tabu[key]
+
     def accept(self, new_solution) :
         """
-        Met à jour la liste taboue (toutes les solution sont acceptées)
+        Met à jour la mémoire taboue (toutes les solution sont acceptées)
         """
-        # Si la taille de la file est atteinte, retire le dernier élément
-        if len(self._tabu_list) == self._tabu_list.maxlen:
-            self._tabu_list.popleft()
+        move = new_solution.move
+        if self._tabu_mode == 'attributes' and move is not None:
+            fin = self._iteration + self.t + 1
+            for a in move.removed_attributes(self._solution):
+                self._tabu[a] = fin
+                self._tabu_list.append((fin, a))
+        elif self._tabu_mode == 'solutions':
+            key = self._solution_key(new_solution)
+            self._tabu[key] = self._tabu.get(key, 0) + 1
+            self._tabu_list.append(key)
 
-        # append la nouvelle solution à la liste taboue
-        self._tabu_list.append(new_solution)
-        
+        self._iteration += 1
+        self._forget()
         return True
-    
+
+    def step_stats(self):
+        """ Retourne les statistiques numériques de l'itération
+        """
+        stats = super().step_stats()
+        stats['t'] = self.t
+        return stats
+
     def print_step(self):
         """ Retourne des infos sur l'itération
         """
         return f"{super().print_step()} t:{self.t}"
-
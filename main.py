@@ -104,8 +104,8 @@ if __name__ == '__main__':
     
     extra_stats = [  # Liste des chose à afficher à l'écran
         'sig',       # a remplir en fonction de l'affichage de l'algorithme  
-    ]                # (il faut surcharger la print_step dans l'agorithme)    
-                     # cf. split_stat_line dans seach/misc/misc.py
+    ]                # (il faut surcharger la step_stats dans l'agorithme)    
+                     # cf. StatsRecorder dans seach/misc/stats.py
                          
 
                      
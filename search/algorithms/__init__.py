@@ -1,3 +1,4 @@
 from .local_search_algorithm import LocalSearchAlgorithm
 from .population_search_algorithm import PopulationSearchAlgorithm
 from .evolution_strategy import EvolutionStrategy
+from .restart_algorithm import RestartAlgorithm
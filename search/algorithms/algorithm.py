@@ -2,13 +2,29 @@
 # -*- coding: utf-8 -*-
 
 import math
+import numbers
 
 import numpy as np
 
 from search.problems import Problem
-from search.solutions import Solution
+from search.solutions import Solution, Population
+from search.solutions.population import exact_values
 
-from search.misc import is_finite, eval_solutions, sort_pop
+from search.misc import is_finite, eval_solutions, sort_pop, get_rng, as_float
+
+
+def average(vals):
+    """
+    La moyenne du vecteur de valeurs vals, en flottant (+/-inf si elle 
+    dépasse, cf. les entiers exacts de BinVal)
+    """
+    if vals.dtype == object :
+        total = vals.sum()
+        try :
+            return total / len(vals)
+        except OverflowError :
+            return as_float(total)
+    return float(np.average(vals))
 
 
 class Algorithm(object):
@@ -22,6 +38,11 @@ class Algorithm(object):
 
         self._problem = prob
 
+        # le générateur aléatoire de l'exécution, toute l'aléa de l'algorithme
+        # doit en être tirée (option 'rng' : un numpy.random.Generator ou une
+        # graine, cf. get_rng)
+        self._rng = get_rng(options.get('rng'))
+
         # un critère d'arrête dépendant de l'algorithme et du problème 
         self._stop = False
 
@@ -33,6 +54,16 @@ class Algorithm(object):
         """ retourne la meilleure solution """
         return self._best_solution
     
+    @property
+    def problem(self):
+        """ retourne le problème """
+        return self._problem
+
+    @property
+    def rng(self):
+        """ retourne le générateur aléatoire (numpy.random.Generator) """
+        return self._rng
+    
     @property
     def name(self):
         """ Retourne le nom de l'algorithme """
@@ -50,7 +81,8 @@ class Algorithm(object):
         En fonction du context minimisation ou maximisation 
         retourn si la valeur de v1 est meilleur que la valeur v2
 
-        Prend : deux valeurs de solution ou deux solution  
+        Prend : deux valeurs de solution (des réels, ex. float ou les 
+                entiers exacts de BinVal) ou deux solution  
         Retourne :  un booléen
         """
 
@@ -61,7 +93,7 @@ class Algorithm(object):
                 return True
             return False
         
-        elif isinstance(v1, float) and isinstance(v2, float) :
+        elif isinstance(v1, numbers.Real) and isinstance(v2, numbers.Real) :
             if self._problem.maximize and v1 >= v2:
                 return True
             if self._problem.minimize and v1 <= v2:
@@ -69,7 +101,7 @@ class Algorithm(object):
             return False
 
         else :
-            raise TypeError("v1 et v2 doivent être des Solutions ou float.")
+            raise TypeError("v1 et v2 doivent être des Solutions ou des réels.")
 
 
     def compare (self, v1, v2) :
@@ -92,6 +124,13 @@ class Algorithm(object):
             raise TypeError("v1 et v2 doivent être des Solutions.")
 
 
+    def step_stats(self):
+        """ 
+        retourne les statistiques numériques de l'itération, un dictionnaire
+        nom -> valeur (cf. StatsRecorder et run_algorithm)
+        """
+        return { 'eval' : self._problem.nb_evaluations }
+
     def print_final(self):
         """ retourne des infos finale  """
         sol_str = self._problem.print_solution(self._best_solution)
@@ -108,7 +147,8 @@ class OneSolutionAlgorithm(Algorithm) :
 
         # génération de la solution initiale 
         self._solution = self._problem.generate_initial_solution(\
-                                                        sol_type='random')
+                                                        sol_type='random',
+                                                        rng=self._rng)
         self._problem.evaluate(self._solution)
 
         # on enregistre la meilleure solution trouvée
@@ -139,6 +179,12 @@ class OneSolutionAlgorithm(Algorithm) :
         if self._problem.minimize and new_val <= old_val:
             self._best_solution = self._solution.clone()
     
+    def step_stats(self):
+        """ retourne les statistiques numériques de l'itération """
+        stats = Algorithm.step_stats(self)
+        stats['val'] = self._solution.value
+        return stats
+
     def print_step(self):
         """ retourne des infos sur l'itération  """
         sol_str = self._problem.print_solution(self._solution)
@@ -157,9 +203,9 @@ class ManySolutionAlgorithm(Algorithm) :
         self._mu = options.get('mu', 5 )
         self._lambda = options.get('lambda', 10 )
 
-        # Création et évaluation de la population initiale
-        self._pop = [ self._problem.generate_initial_solution(sol_type='random')
-                      for i in range(self._mu) ]
+        # Création et évaluation de la population initiale (stockée dans un
+        # seul tableau, cf. Population)
+        self._pop = Population.random(self._problem, self._mu, self._rng)
               
         eval_solutions(self._pop, self._problem)
 
@@ -179,11 +225,16 @@ class ManySolutionAlgorithm(Algorithm) :
 
         Note : cette population a déjà été évaluée 
         """
-        vals = [ x.value for x in pop ]
+        if isinstance(pop, Population) :
+            vals = pop.values
+        else :
+            vals = exact_values([ x.value for x in pop ])
         
-        self.min_value = min(vals)
-        self.max_value = max(vals)
-        self.ave_value = np.average(vals)
+        # les statistiques sont en flottants, le choix de la meilleure 
+        # solution reste exact (cf. Population)
+        self.min_value = as_float(np.min(vals))
+        self.max_value = as_float(np.max(vals))
+        self.ave_value = average(vals)
 
         if self.max_value > self._max_ever:
             self._max_ever = self.max_value
@@ -197,6 +248,14 @@ class ManySolutionAlgorithm(Algorithm) :
         else:
             self._best_solution = pop[np.argmin(vals)].clone()
 
+    def step_stats(self):
+        """ retourne les statistiques numériques de l'itération """
+        stats = Algorithm.step_stats(self)
+        stats.update({ 'mu' : self._mu, 'lambda' : self._lambda,
+                       'val' : self.ave_value, 'max' : self.max_value,
+                       'min' : self.min_value })
+        return stats
+
     def print_step(self):
         """ retourne des infos sur l'itération  """
         return f"eval:{self._problem.nb_evaluations}  mu:{self._mu} lambda:{self._lambda} val:{self.ave_value} max:{self.max_value} min:{self.min_value} [{self._print_dist()}]"
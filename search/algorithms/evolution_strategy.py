@@ -68,6 +68,12 @@ class EvolutionStrategy(OneSolutionAlgorithm):
         """
         raise NotImplementedError
 
+    def step_stats(self):
+        """ retourne les statistiques numériques de l'itération """
+        stats = OneSolutionAlgorithm.step_stats(self)
+        stats['sig'] = self._sigma
+        return stats
+
     def print_step(self):
         """ retourne des infos sur l'itération  """        
         step_data = OneSolutionAlgorithm.print_step(self)
@@ -15,6 +15,13 @@ accept
 
 """
 
+# voisinages proposés par l'option 'neighborhood' : le nom de la méthode de la
+# solution qui les parcourt (None : le voisinage par défaut, Solution.moves)
+NEIGHBORHOODS = { None : 'moves',
+                  'swap' : 'moves',
+                  '2opt' : 'two_opt_moves',
+                  'oropt' : 'or_opt_moves' }
+
 class LocalSearchAlgorithm(OneSolutionAlgorithm):
 
     def __init__(self, prob, options):
@@ -32,23 +39,56 @@ class LocalSearchAlgorithm(OneSolutionAlgorithm):
         OneSolutionAlgorithm.__init__(self, prob, options)
 
         # lecture des paramètres éventuels 
-        # RAS ici
+
+        # 'neighborhood' : le voisinage parcouru, cf. NEIGHBORHOODS
+        self._neighborhood = options.get('neighborhood', None)
+        if self._neighborhood not in NEIGHBORHOODS :
+            raise ValueError("Unknown neighborhood")
+
+        # 'candidates' : k, voisinage (2opt par défaut) restreint aux listes 
+        # de candidats du problème (k plus proches voisins, cf. 
+        # TSP.candidate_moves)
+        self._nb_candidates = options.get('candidates', None)
+
+        # copie de travail pour évaluer les mouvements (cf. evaluate_move)
+        self._scratch = None
+        self._scratch_origin = None
         
     def get_neighbors(self):
         """
-        Retourne la liste des solutions voisines de la solution courante
-        retourne une liste de d'instances de Solution
+        Parcourt le voisinage de la solution courante
+        retourne un itérateur (paresseux) d'instances de Move
         """
         raise NotImplementedError
 
         
+    def moves(self):
+        """
+        Le voisinage de la solution courante (ordre aléatoire) choisi par 
+        l'option 'neighborhood', restreint aux listes de candidats du problème
+        si l'option 'candidates' est donnée
+        retourne un itérateur (paresseux) d'instances de Move
+        """
+        if self._nb_candidates is not None :
+            if not hasattr(self._problem, 'candidate_moves') :
+                raise ValueError("the problem has no candidate lists")
+            return self._problem.candidate_moves(self._solution,
+                                                 self._nb_candidates,
+                                                 self._rng,
+                                                 self._neighborhood or '2opt')
+
+        moves = getattr(self._solution, NEIGHBORHOODS[self._neighborhood], None)
+        if moves is None :
+            raise ValueError("neighborhood not available for this solution")
+        return moves(self._rng)
+
     def filter_neighbors(self, neighbors):
         """
-        Elemine les solutions voisines non valides.
+        Elemine les mouvements menant a des voisins non valides.
         Dépend du probleme et de l'algo 
         
-        prend une liste d'instances de Solution 
-        retourne une liste de d'instances de Solution
+        prend un itérateur d'instances de Move 
+        retourne un itérateur d'instances de Move
         """
         raise NotImplementedError
      
@@ -56,8 +96,11 @@ class LocalSearchAlgorithm(OneSolutionAlgorithm):
         """
         Retourne une solution, peut-être pas.
         Dépend du probleme et de l'algo 
+
+        Seul le mouvement retenu est matérialisé en solution 
+        (cf. make_neighbor).
         
-        prend une liste d'instances de Solution 
+        prend un itérateur d'instances de Move 
         retourne une instance de Solution ou None si pas de solution
         """
         raise NotImplementedError
@@ -71,7 +114,82 @@ class LocalSearchAlgorithm(OneSolutionAlgorithm):
         retourne un booléen, acepter / refusé 
         """
         raise NotImplementedError
+
+    def _scratch_solution(self):
+        """
+        Copie de travail de la solution courante sur laquelle on applique 
+        puis annule les mouvements. Elle est recréée quand la solution
+        courante change, soit au plus une copie par itération.
+        """
+        if self._scratch_origin is not self._solution :
+            self._scratch = self._solution.clone()
+            self._scratch_origin = self._solution
+        return self._scratch
+
+    def evaluate_move(self, move):
+        """
+        Évalue le voisin de la solution courante obtenu par move, sans le
+        construire.
+
+        Si le problème sait calculer la variation de valeur du mouvement
+        (cf. Move.delta_method, par ex. evaluate_swap_delta), on l'utilise au
+        lieu d'une évaluation complète.
+
+        prend une instance de Move
+        retourne la valeur du voisin 
+        """
+        delta_function = self._problem_method(move.delta_method)
+
+        if delta_function is not None :
+            return self._solution.value + delta_function(self._solution,
+                                                         *move.args)
+
+        sol = self._scratch_solution()
+        move.apply(sol)
+        val = self._problem.evaluate(sol)
+        move.undo(sol)
+        return val
+
+    def _problem_method(self, name):
+        """ la méthode name du problème, None si absente (cf. Move) """
+        if name is None :
+            return None
+        return getattr(self._problem, name, None)
+
+    def feasable_move(self, move):
+        """
+        prend une instance de Move
+        retourne vrai si le voisin obtenu par move est feasable
+
+        Si le problème sait tester la faisabilité du mouvement (cf. 
+        Move.feasable_method, par ex. feasable_flip) on l'utilise.
+        """
+        feasable_function = self._problem_method(move.feasable_method)
+        if feasable_function is not None :
+            return feasable_function(self._solution, *move.args)
         
+        sol = self._scratch_solution()
+        move.apply(sol)
+        feasable = self._problem.feasable(sol)
+        move.undo(sol)
+        return feasable
+
+    def make_neighbor(self, move, value=None):
+        """
+        Matérialise le voisin de la solution courante obtenu par move
+
+        prend une instance de Move et la valeur du voisin si elle est connue
+        retourne une instance de Solution
+        """
+        neighbor = self._solution.neighbor(move)
+        neighbor._value = value
+
+        # l'état incrémental du voisin est déduit de celui de la solution
+        state_function = self._problem_method(move.state_method)
+        if state_function is not None and self._solution._state is not None :
+            neighbor._state = state_function(self._solution, *move.args)
+        return neighbor
+
     def step(self) :
         """ 
         Réalise une iteration 
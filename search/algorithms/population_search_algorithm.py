@@ -2,13 +2,15 @@
 # -*- coding: utf-8 -*-
 
 from .algorithm import Algorithm, ManySolutionAlgorithm
+from search.solutions import Population
 from search.misc import eval_solutions
 
 """
 Classe Abstraite représentant un algorithme de recherche a population
 
 A chaque itération la population interne (self._pop) de taille self._mu  
-est modifée et remplacée. 
+est modifée et remplacée. C'est une instance de Population : les solutions 
+sont les lignes d'un seul tableau numpy.
 
 La meilleure solution trouvée est mise à jour et accessible avec l'attribut 
 best_solution.
@@ -41,7 +43,8 @@ class PopulationSearchAlgorithm(ManySolutionAlgorithm):
         """
         Créer des nouvelles solution par evolution des parents (self._pop). 
    
-        Sortie : une liste de solution enfants de taille self._lambda
+        Sortie : une Population (ou une liste de solution) enfants de taille 
+        self._lambda
 
         """
         raise NotImplementedError
@@ -51,8 +54,8 @@ class PopulationSearchAlgorithm(ManySolutionAlgorithm):
         Constituer la nouvelle population selon une stratégie de selection 
         donnée depuis les enfants et self._pop.  
 
-        Entrée : une liste de solutions enfants 
-        Sortie : une lisre de solutions de taille self._mu
+        Entrée : une Population (ou une liste de solutions) enfants 
+        Sortie : une Population (ou une liste de solutions) de taille self._mu
 
         """
         raise NotImplementedError
@@ -66,7 +69,10 @@ class PopulationSearchAlgorithm(ManySolutionAlgorithm):
         eval_solutions( O, self._problem)
                
         # remplacement des parents 
-        self._pop = self.update_pop ( O )
+        new_pop = self.update_pop ( O )
+        if not isinstance(new_pop, Population) :
+            new_pop = Population.from_solutions(new_pop)
+        self._pop = new_pop
 
         # mise a jour des statistiques
         self.update_stats( self._pop )
@@ -0,0 +1,193 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from .algorithm import Algorithm
+
+"""
+Relance d'un algorithme quelconque quand il stagne.
+
+L'algorithme interne (option 'algorithm', une classe d'Algorithm) est
+exécuté itération par itération. Il est relancé (une nouvelle instance, donc
+une nouvelle solution ou population initiale) quand :
+
+* il s'arrête de lui même avant la fin du budget (ex. optimum local d'une
+  recherche locale),
+* sa meilleure solution ne s'améliore plus depuis 'patience' itérations,
+* son pas sigma s'effondre (stratégies d'évolution, cf. 'sigma_tol'),
+* sa population a convergé : toutes les solutions sont identiques a
+  'pop_tol' près (algorithmes a population).
+
+Le problème n'est pas réinitialisé : les relances se partagent le budget
+max_eval restant. La meilleure solution est celle de toutes les relances.
+
+Stratégies de relance (option 'restart') :
+
+* 'simple' : mêmes paramètres a chaque relance
+* 'ipop' : mu et lambda sont multipliés par 'inc_pop' (2 par défaut) a chaque
+  relance
+* 'bipop' : alterne les relances a grande population (comme ipop) et a
+  petite population (lambda tiré entre le lambda initial et la moitié du
+  dernier grand, sigma initial réduit jusqu'à 100 fois), en choisissant le
+  régime qui a consommé le moins d'évaluations
+
+"""
+
+class RestartAlgorithm(Algorithm):
+
+    def __init__(self, prob, options):
+        """
+        Entrées :
+
+        * Un problème donnée instance de la classe Problem.
+        * Un dictionnaire des paramètres : ceux de la relance (cf. plus haut)
+          et ceux de l'algorithme interne
+        """
+        Algorithm.__init__(self, prob, options)
+
+        self._algorithm = options.get('algorithm')
+        if self._algorithm is None :
+            raise ValueError("The restarted algorithm must be specified")
+        self._restart = options.get('restart', 'ipop')
+        if self._restart not in ['simple', 'ipop', 'bipop'] :
+            raise ValueError("Unknown restart strategy")
+
+        self._patience = options.get('patience', 50)
+        self._sigma_tol = options.get('sigma_tol', 1e-12)
+        self._pop_tol = options.get('pop_tol', 1e-12)
+        self._inc_pop = options.get('inc_pop', 2)
+
+        # les options de l'algorithme interne, il tire son aléa du même
+        # générateur
+        self._options = dict(options, rng=self._rng)
+        for key in ['algorithm', 'restart', 'patience', 'sigma_tol', 'pop_tol',
+                    'inc_pop'] :
+            self._options.pop(key, None)
+
+        self._nb_restarts = 0
+        # bipop : nombre de relances a grande population et évaluations
+        # consommées par régime
+        self._nb_large = 0
+        self._regime = 'large'
+        self._budget = { 'large' : 0, 'small' : 0 }
+
+        self._start(self._options)
+
+        # les paramètres par défaut de l'algorithme interne (lus sur la
+        # première instance, ex. le lambda de CMAES dépend de la dimension)
+        self._default_mu = getattr(self._inner, '_mu', None)
+        self._default_lambda = getattr(self._inner, '_lambda', None)
+        self._default_sigma = getattr(self._inner, '_sigma', None)
+
+        self._best_solution = self._inner.best_solution.clone()
+
+    @property
+    def name(self):
+        return "{}-{}".format(self._restart.upper(), self._inner.name)
+
+    @property
+    def inner(self):
+        """ l'instance courante de l'algorithme relancé """
+        return self._inner
+
+    @property
+    def nb_restarts(self):
+        return self._nb_restarts
+
+    def _start(self, options):
+        """ une nouvelle instance de l'algorithme interne """
+        self._start_evals = self._problem.nb_evaluations
+        self._inner = self._algorithm(self._problem, options)
+        self._inner_best = self._inner.best_solution.value
+        self._last_improvement = 0
+        self._iteration = 0
+
+    def _improves(self, v1, v2):
+        """ vrai si la valeur v1 est strictement meilleure que v2 """
+        return v1 != v2 and self.better(v1, v2)
+
+    def stagnation(self):
+        """ vrai si l'algorithme interne stagne (cf. plus haut) """
+        inner = self._inner
+        if self._iteration - self._last_improvement >= self._patience :
+            return True
+
+        sigma = getattr(inner, '_sigma', None)
+        if sigma is not None and sigma < self._sigma_tol :
+            return True
+
+        pop = getattr(inner, '_pop', None)
+        if pop is not None and len(pop) > 1 :
+            G = pop.genomes
+            if np.allclose(G, G[0], rtol=0, atol=self._pop_tol) :
+                return True
+        return False
+
+    def _next_options(self):
+        """ les options de la prochaine relance, selon la stratégie """
+        options = dict(self._options)
+        if self._restart == 'simple' or self._default_lambda is None :
+            return options
+
+        if self._restart == 'bipop' :
+            self._budget[self._regime] += \
+                self._problem.nb_evaluations - self._start_evals
+            self._regime = 'small' if self._nb_large > 0 and \
+                self._budget['small'] < self._budget['large'] else 'large'
+
+        if self._regime == 'large' :
+            self._nb_large += 1
+            factor = self._inc_pop ** self._nb_large
+        else :
+            # lambda entre le lambda initial et la moitié du dernier grand,
+            # plus souvent petit
+            u = self._rng.random()
+            factor = (0.5 * self._inc_pop ** self._nb_large) ** (u * u)
+            if self._default_sigma is not None :
+                options['sigma'] = self._default_sigma \
+                                   * 10 ** (-2 * self._rng.random())
+
+        options['lambda'] = max(1, int(self._default_lambda * factor))
+        if self._default_mu is not None :
+            options['mu'] = max(1, min(options['lambda'],
+                                       int(self._default_mu * factor)))
+        return options
+
+    def step(self):
+        """
+        Une itération de l'algorithme interne, puis une relance s'il stagne
+        et qu'il reste du budget
+        """
+        self._iteration += 1
+        finished = self._inner.step()
+
+        value = self._inner.best_solution.value
+        if self._improves(value, self._inner_best) :
+            self._inner_best = value
+            self._last_improvement = self._iteration
+        if self._improves(value, self._best_solution.value) :
+            self._best_solution = self._inner.best_solution.clone()
+
+        if self._problem.no_more_evals() :
+            return True
+
+        if finished or self.stagnation() :
+            self._nb_restarts += 1
+            self._start(self._next_options())
+            if self._improves(self._inner.best_solution.value,
+                              self._best_solution.value) :
+                self._best_solution = self._inner.best_solution.clone()
+
+        return self.stop()
+
+    def step_stats(self):
+        """ les statistiques de l'algorithme interne et le nombre de relances """
+        stats = self._inner.step_stats()
+        stats['restarts'] = self._nb_restarts
+        return stats
+
+    def print_step(self):
+        """ retourne des infos sur l'itération  """
+        return "{} restarts:{}".format(self._inner.print_step(),
+                                       self._nb_restarts)
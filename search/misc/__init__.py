@@ -1,2 +1,6 @@
 from .misc import *
+from .runner import *
+from .rng import *
+from .stats import *
+from .store import *
 from .plots import *
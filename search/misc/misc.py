@@ -8,6 +8,8 @@ import numpy as np
 import random
 
 from .plots import *
+from .stats import StatsRecorder
+from search.solutions.population import exact_values
 
 
 def eval_solutions(pop, problem):
@@ -20,7 +22,36 @@ def eval_solutions(pop, problem):
     Note : les valeurs de fitness sont aussi stockés dans les solutions.
 
     Note : les solutions infeasable ont une fitness infini 
+
+    Note : si le problème propose evaluate_batch, toute la population est 
+           évaluée en un seul appel vectorisé (evaluate_packed_batch sur les
+           mots si les solutions sont empaquetées)
+
+    Note : une Population (cf. search.solutions.population) s'évalue 
+           elle-même et met à jour son vecteur de valeurs
     """
+
+    if hasattr(pop, 'genomes') :
+        return pop.evaluate(problem)
+
+    if len(pop) > 0 and hasattr(pop[0], 'words') and \
+       getattr(problem, 'packed', False) and \
+       hasattr(problem, 'evaluate_packed_batch') :
+        W = np.array([ x.words for x in pop ])
+        vals, feasable = problem.evaluate_packed_batch(W)
+    elif len(pop) > 0 and hasattr(problem, 'evaluate_batch') :
+        X = np.array([ x.solution for x in pop ])
+        vals, feasable = problem.evaluate_batch(X)
+    else :
+        vals = None
+
+    if vals is not None :
+        vals = exact_values(vals)
+        vals[~feasable] = float("-inf") if problem.maximize else float("inf")
+        vals = vals.tolist()
+        for i in range(len(pop)) :
+            pop[i]._value = vals[i]
+        return vals
         
     vals = [ problem.evaluate(x) for x in pop]
     feasable = [ problem.feasable(x) for x in pop ]
@@ -47,6 +78,10 @@ def sort_pop(pop, problem) :
         rapport a la population intiale (avant le tri)
 
         """
+
+        # une Population se trie sur son vecteur de valeurs
+        if hasattr(pop, 'genomes') :
+            return pop.sort(problem)
         
         if problem.maximize :
             idx = [i[0] for i in sorted(enumerate(pop),\
@@ -126,7 +161,8 @@ def split_stat_line(line, extra_values=list()):
 
 
 
-def run_algorithm(algo, max_iter, extra_stats=list(), screen_output=True) :
+def run_algorithm(algo, max_iter, extra_stats=list(), screen_output=True,
+                  every=1, on_improvement=False) :
     """
     Lance une instance d'un algorithme de recherche et retourne 
     ses resultas.
@@ -134,16 +170,23 @@ def run_algorithm(algo, max_iter, extra_stats=list(), screen_output=True) :
     prend :
        algo : une instance de la classe Algorithme 
        max_iter : entier le nombre d'itération maximum
+       extra_stats : les statistiques a enregistrer en plus de 'iter', 'eval'
+                     et 'val' (cf. Algorithm.step_stats)
        screen : booléen pour afficher ou non une ligne de stat par itération 
+       every : n'enregistrer qu'une itération sur every
+       on_improvement : n'enregistrer que les itérations qui améliorent la 
+                        meilleure solution
 
     retourne :
        un entier : le nombre d'itérations consomé
-       un tableau : chaque case contient un tuple 
-          (itération, évaluation, valeur) cf. split_stat_line plus haut. Il y 
-          a autant de case que d'itération 
+       un tableau structuré : une ligne par itération enregistrée, avec les 
+          colonnes 'iter', 'eval', 'val' et extra_stats (cf. StatsRecorder).
+          La dernière itération est toujours enregistrée.
     """
    
-    stats = list()
+    recorder = StatsRecorder(['iter', 'eval', 'val'] + list(extra_stats),
+                             every=every, on_improvement=on_improvement,
+                             maximize=algo.problem.maximize)
     done = False
     it = 0
 
@@ -158,14 +201,15 @@ def run_algorithm(algo, max_iter, extra_stats=list(), screen_output=True) :
         # exécuter une itération de l'algorithme 
         finished = algo.step()
 
+        # a-t-on fini ? Finished est modifiée par l'algorythme 
+        done = it > max_iter or finished
+
         # récupérer les statistiques sur la solution courante
-        stat_line = "iter:{} {}".format(it, algo.print_step())
-        stats.append( split_stat_line(stat_line, extra_values=extra_stats) )
+        recorder.record(it, algo.step_stats(), best=algo.best_solution.value,
+                        force=done)
         if screen_output :
+            stat_line = "iter:{} {}".format(it, algo.print_step())
             print ("\r\t"+stat_line+"\r", end="")
-          
-        # a-t-on fini ? Finished est modifiée par l'algorythme 
-        done = it > max_iter or finished
 
     # sauter une ligne 
     if screen_output :
@@ -173,89 +217,4 @@ def run_algorithm(algo, max_iter, extra_stats=list(), screen_output=True) :
         print() 
         
     # retournons le nombre d'iteration consomés et les stats complètes
-    stats_l = [ tuple(l.values()) for l in stats]
-    dtype = dict(names=list(stats[0].keys()), formats=['f8'] * len(stats[0].keys()))
-
-    return it, np.array(stats_l, dtype=dtype)
-
-
-def multiple_runs(problem, algo_class_name,  max_iter, nb_runs, alg_options,
-                  extra_stats=[], screen_output=True):
-    """
-    Exécute plusieurs fois un algorithme de recherche local sur un problème 
-    donné. 
-
-    Note : Un fichier de courbe avec les valeur des solutions courante est 
-           créer a la fin de l'éxécution . Il a le nom de la classe de 
-           l'algorithme et l'extension .png
-
-    prend :
-       problem : une instance de la classe problem 
-       algo_class_name : le NOM DE LA CLASSE d'un algorithme 
-       max_iter : entier le nombre d'itération maximum
-       nb_runs : entier le nombre nombre d'exécutions
-       extra_stats : une liste de noms de statistiques a sauvegarder pour 
-                     les courbes par défaut c'est : 'val' 'iter', 'eval'
-                     (c'est les noms affiché par Algorithm.print_step())
-
-    retourne : 
-       Un tuple 
-            un tableau : avec toute les valeur des solution finale, autant que 
-                         nb_runs
-            le nom de l'algorithme : string, pour affichage
-    """
-  
-    # Pour stocker les stat de sortie  
-    iter_data = []   # les stats par iteration     
-    final_data = []  # les stats finales, la meilleurs solution 
-      
-    for r in range(nb_runs) :
-
-        # initialiser le problème 
-        problem.reset()
-        
-        # instancier un algorithme avec le problem
-        algorithm = algo_class_name( problem, alg_options )
-        if r == 0:
-            print ("Running {} on {} for {} runs [max eval {} or max iter {}]".\
-                   format(algorithm.name, problem.name, nb_runs,
-                          problem.max_eval, max_iter))
-            
-        # exécuter l'algorithme jusqua la fin et récupérer ses stats
-        it, iter_stats = run_algorithm(algorithm, max_iter, \
-                                       extra_stats=extra_stats,
-                                       screen_output=screen_output)
-           
-
-        iter_data.append( iter_stats )
-
-        # recuperons et affichons les stats de fin 
-        final_stat = algorithm.print_final()
-        final_data.append (split_stat_line(final_stat)['val']) # juste la valeur
-        print ("Run {}, iter:{} {}".format(r, it, final_stat))
-
-        # Si le probleme s'y prete, on dessine la solution 
-        try : 
-            s = algorithm.best_solution
-            problem.draw_solution(s, "{}-{}-{}.png".format(problem.name,
-                                                           algorithm.name,r))
-        except NotImplementedError :
-            pass # la solution ne se dessine pas, alors on ne fait pas 
-            
-
-    # Afficher une ligne pour séparer les affichages
-    print ("-"*80)
-
-    # Réaliser les courbes pour chaque exécution
-    # plot_by_evaluation(iter_data, 'eval', 'val',\
-    #                    "{}-{}-{}.png".format(problem.name,algorithm.name, 'val'))
-    # for s_name in extra_stats :
-    #     try : 
-    #         plot_by_evaluation(iter_data, 'eval', s_name,\
-    #                            "{}-{}-{}.png".format(problem.name,algorithm.name, s_name))
-    #     except ValueError :
-    #         pass
-    
-    # retourner les valeur des solution final et le nom de l'algorithme 
-    return np.array(final_data), algorithm.name
-
+    return it, recorder.to_array()
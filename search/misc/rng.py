@@ -0,0 +1,32 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+"""
+Générateurs aléatoires injectables.
+
+Toute l'aléa des algorithmes, des solutions et des opérateurs passe par un
+numpy.random.Generator, donné par l'option 'rng' des algorithmes (cf.
+Algorithm) ou le paramètre rng des méthodes. Une exécution peut ainsi être
+rejouée exactement depuis sa graine, et plusieurs exécutions peuvent tourner
+dans le même processus avec chacune son propre flux.
+
+"""
+
+def get_rng(rng=None):
+    """
+    Retourne un numpy.random.Generator
+
+    prend :
+       rng : un Generator, retourné tel quel (le flux est partagé)
+             ou une graine (entier, SeedSequence), un nouveau Generator est créé
+             ou None, la graine est alors tirée du générateur global de numpy :
+             un np.random.seed(...) fait en amont garde les exécutions
+             reproductibles
+    """
+    if isinstance(rng, np.random.Generator) :
+        return rng
+    if rng is None :
+        rng = np.random.randint(0, 2**32, size=4, dtype=np.uint64)
+    return np.random.default_rng(rng)
@@ -0,0 +1,191 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import copy
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .misc import run_algorithm
+
+"""
+Ordonnanceur d'exécutions indépendantes d'algorithmes.
+
+Chaque exécution a sa propre copie du problème (son compteur d'évaluations
+n'est pas partagé) et son propre générateur aléatoire (option 'rng' des 
+algorithmes), issu d'une numpy.random.SeedSequence :
+les résultats ne dépendent ni du nombre de processus ni de l'ordre dans
+lequel les exécutions se terminent. Ils sont retournés dans l'ordre des
+demandes.
+
+"""
+
+class RunResult(object):
+
+    """ Résultat d'une exécution (cf. schedule_runs) """
+
+    def __init__(self, name, nb_iterations, iter_stats, final_stat,
+                 best_solution):
+        self.name = name                    # nom de l'algorithme
+        self.nb_iterations = nb_iterations
+        self.iter_stats = iter_stats        # cf. run_algorithm
+        self.final_stat = final_stat        # cf. Algorithm.print_final
+        self.best_solution = best_solution
+
+
+def spawn_seeds(nb_runs, seed=None):
+    """
+    Retourne nb_runs graines indépendantes (SeedSequence) issues de seed
+    (un entier ou une SeedSequence).
+
+    Si seed est None, on la tire du générateur global de numpy : un
+    np.random.seed(...) fait en amont rend donc les exécutions reproductibles
+    """
+    if isinstance(seed, np.random.SeedSequence) :
+        return seed.spawn(nb_runs)
+    if seed is None :
+        seed = np.random.randint(0, 2**32, size=4, dtype=np.uint64)
+    return np.random.SeedSequence(seed).spawn(nb_runs)
+
+
+def seed_generators(seed_seq):
+    """ Initialise les générateurs globaux (random et numpy) depuis seed_seq """
+    random.seed(int(seed_seq.generate_state(1, np.uint64)[0]))
+    np.random.seed(seed_seq.generate_state(4))
+
+
+def execute_run(problem, algo_class, alg_options, max_iter, extra_stats,
+                seed_seq, screen_output=False):
+    """
+    Exécute un algorithme sur le problème donné (qui est réinitialisé) avec
+    un générateur aléatoire issu de seed_seq (il remplace l'option 'rng'). 
+    Les générateurs globaux sont aussi initialisés depuis seed_seq.
+
+    Retourne une instance de RunResult
+    """
+    seed_generators(seed_seq)
+    problem.reset()
+
+    alg_options = dict(alg_options, rng=np.random.default_rng(seed_seq))
+    algorithm = algo_class(problem, alg_options)
+    it, iter_stats = run_algorithm(algorithm, max_iter, extra_stats=extra_stats,
+                                   screen_output=screen_output)
+
+    return RunResult(algorithm.name, it, iter_stats, algorithm.print_final(),
+                     algorithm.best_solution)
+
+
+def _execute_run_copy(args, screen_output=False):
+    """ execute_run sur une copie du problème (exécution dans ce processus) """
+    problem = copy.deepcopy(args[0])
+    return execute_run(problem, *args[1:], screen_output=screen_output)
+
+
+def _execute_run_pickled(args):
+    """ execute_run dans un processus fils, le problème est déjà une copie """
+    return execute_run(*args)
+
+
+def schedule_runs(runs, nb_workers=1, seed=None, screen_output=False):
+    """
+    Lance des exécutions indépendantes, dans des processus séparés si
+    nb_workers est différent de 1.
+
+    prend :
+       runs : une liste de tuples
+              (problem, algo_class, alg_options, max_iter, extra_stats)
+       nb_workers : le nombre de processus, None pour le nombre de coeurs,
+                    1 pour tout exécuter dans ce processus
+       seed : la graine de la SeedSequence dont sont issues les graines des
+              exécutions (cf. spawn_seeds)
+       screen_output : affichage des itérations, seulement si nb_workers
+                       vaut 1
+
+    retourne :
+       la liste des RunResult, dans l'ordre de runs.
+
+    Note : à graine égale, les résultats sont identiques quel que soit
+           nb_workers
+    """
+    seeds = spawn_seeds(len(runs), seed)
+    jobs = [ tuple(run) + (s,) for run, s in zip(runs, seeds) ]
+
+    if nb_workers == 1 :
+        # on ne perturbe pas les générateurs globaux de l'appelant
+        py_state, np_state = random.getstate(), np.random.get_state()
+        try :
+            return [ _execute_run_copy(job, screen_output) for job in jobs ]
+        finally :
+            random.setstate(py_state)
+            np.random.set_state(np_state)
+
+    with ProcessPoolExecutor(max_workers=nb_workers) as executor :
+        # map conserve l'ordre des demandes
+        return list(executor.map(_execute_run_pickled, jobs))
+
+
+def multiple_runs(problem, algo_class_name,  max_iter, nb_runs, alg_options,
+                  extra_stats=[], screen_output=True, nb_workers=1, seed=None):
+    """
+    Exécute plusieurs fois un algorithme de recherche local sur un problème 
+    donné. 
+
+    Note : Un fichier de courbe avec les valeur des solutions courante est 
+           créer a la fin de l'éxécution . Il a le nom de la classe de 
+           l'algorithme et l'extension .png
+
+    prend :
+       problem : une instance de la classe problem 
+       algo_class_name : le NOM DE LA CLASSE d'un algorithme 
+       max_iter : entier le nombre d'itération maximum
+       nb_runs : entier le nombre nombre d'exécutions
+       extra_stats : une liste de noms de statistiques a sauvegarder pour 
+                     les courbes par défaut c'est : 'val' 'iter', 'eval'
+                     (cf. Algorithm.step_stats)
+       nb_workers : nombre de processus pour les exécutions (cf. 
+                    schedule_runs), 1 par défaut
+       seed : graine des exécutions (cf. schedule_runs)
+
+    retourne : 
+       Un tuple 
+            un tableau : avec toute les valeur des solution finale, autant que 
+                         nb_runs
+            le nom de l'algorithme : string, pour affichage
+    """
+
+    print ("Running {} on {} for {} runs [max eval {} or max iter {}]".\
+           format(algo_class_name.__name__, problem.name, nb_runs,
+                  problem.max_eval, max_iter))
+
+    # exécuter les algorithmes jusqua la fin, chacun sur une copie du 
+    # problème
+    runs = [ (problem, algo_class_name, alg_options, max_iter, extra_stats) 
+             for r in range(nb_runs) ]
+    results = schedule_runs(runs, nb_workers, seed,
+                            screen_output=screen_output)
+
+    # Pour stocker les stat de sortie  
+    final_data = []  # les stats finales, la meilleurs solution 
+      
+    for r, result in enumerate(results) :
+
+        # recuperons et affichons les stats de fin 
+        final_stat = result.final_stat
+        final_data.append (result.best_solution.value) # juste la valeur
+        print ("Run {}, iter:{} {}".format(r, result.nb_iterations, final_stat))
+
+        # Si le probleme s'y prete, on dessine la solution 
+        try : 
+            problem.draw_solution(result.best_solution,
+                                  "{}-{}-{}.png".format(problem.name,
+                                                        result.name, r))
+        except NotImplementedError :
+            pass # la solution ne se dessine pas, alors on ne fait pas 
+            
+
+    # Afficher une ligne pour séparer les affichages
+    print ("-"*80)
+    
+    # retourner les valeur des solution final et le nom de l'algorithme 
+    return np.array(final_data), results[-1].name
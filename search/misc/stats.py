@@ -0,0 +1,114 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+
+"""
+Enregistrement des statistiques par itération d'une exécution.
+
+Les algorithmes donnent leurs statistiques numériques sous forme de
+dictionnaire (cf. Algorithm.step_stats), elles sont rangées par colonnes dans
+des tableaux numpy préalloués qui grandissent au besoin. Pas de passage par
+des chaines de caractères.
+
+"""
+
+def as_float(value):
+    """ la valeur en flottant, +/-inf si elle dépasse (grands entiers exacts) """
+    try :
+        return float(value)
+    except OverflowError :
+        return math.inf if value > 0 else -math.inf
+
+class StatsRecorder(object):
+
+    def __init__(self, names, capacity=1024, every=1, on_improvement=False,
+                 maximize=True):
+        """
+        Entrées :
+
+        * les noms des colonnes, ex. ['iter', 'eval', 'val', 'sig']
+        * la capacité initiale (doublée quand elle est atteinte)
+        * every : n'enregistrer qu'une itération sur every
+        * on_improvement : n'enregistrer que les itérations où la meilleure
+          valeur s'améliore (cf. record)
+        * maximize : le sens de l'amélioration
+
+        Note : avec every ou on_improvement, la dernière itération est
+               toujours enregistrée (cf. record et force)
+        """
+        self._names = list(names)
+        self._columns = { n : np.empty(capacity) for n in self._names }
+        self._size = 0
+        self._every = every
+        self._on_improvement = on_improvement
+        self._maximize = maximize
+        self._best = None
+
+    @property
+    def names(self):
+        return self._names
+
+    def __len__(self):
+        return self._size
+
+    def _improves(self, best):
+        if best is None :
+            return True
+        if self._best is None :
+            return True
+        if self._maximize :
+            return best > self._best
+        return best < self._best
+
+    def record(self, it, stats, best=None, force=False):
+        """
+        Enregistre les statistiques de l'itération it si elle passe les
+        filtres every et on_improvement, ou si force est vrai.
+
+        prend :
+           it : le numéro de l'itération (colonne 'iter')
+           stats : un dictionnaire nom -> valeur numérique, les noms absents
+                   des colonnes sont ignorés, les colonnes absentes du
+                   dictionnaire valent NaN
+           best : la meilleure valeur rencontrée (pour on_improvement)
+
+        retourne vrai si la ligne a été enregistrée
+        """
+        keep = force or it % self._every == 0
+        if self._on_improvement and not force :
+            keep = keep and self._improves(best)
+        if not keep :
+            return False
+
+        if best is not None :
+            self._best = best
+
+        if self._size == len(self._columns[self._names[0]]) :
+            for n in self._names :
+                self._columns[n] = np.resize(self._columns[n],
+                                              max(1, 2*self._size))
+
+        i = self._size
+        for n in self._names :
+            col = self._columns[n]
+            if n == 'iter' :
+                col[i] = it
+            else :
+                col[i] = as_float(stats.get(n, np.nan))
+        self._size += 1
+        return True
+
+    def column(self, name):
+        """ la colonne name (une vue sur les lignes enregistrées) """
+        return self._columns[name][:self._size]
+
+    def to_array(self):
+        """ Retourne les lignes enregistrées dans un tableau structuré numpy """
+        dtype = dict(names=self._names, formats=['f8'] * len(self._names))
+        data = np.empty(self._size, dtype=dtype)
+        for n in self._names :
+            data[n] = self.column(n)
+        return data
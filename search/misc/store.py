@@ -0,0 +1,172 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import os
+import uuid
+from urllib.parse import quote
+
+"""
+Stockage des statistiques d'exécution en Parquet, en ajout seulement.
+
+Les données sont partitionnées par algorithme, problème et taille de problème
+(répertoires à la Hive : algo=.../problem=.../size=...). Chaque sauvegarde
+ajoute un nouveau fichier, les fichiers existants ne sont jamais relus ni
+réécrits.
+
+A la lecture, seuls les fichiers des partitions demandées sont ouverts
+(projection sur les colonnes, filtre sur les runs grâce aux statistiques des
+fichiers Parquet) et ils sont lus en mémoire mappée.
+
+Note : nécessite pyarrow (importé seulement à l'utilisation)
+
+"""
+
+PARTITIONS = ['algo', 'problem', 'size']
+
+
+class ResultStore(object):
+
+    def __init__(self, root='data/store'):
+        """
+        Entrées :
+
+        * le répertoire racine du stockage (créé a la première écriture)
+        """
+        self._root = root
+
+    @property
+    def root(self):
+        return self._root
+
+    def _partition_dir(self, algo, problem, size):
+        parts = [ "{}={}".format(k, quote(str(v), safe=''))
+                  for k, v in zip(PARTITIONS, [algo, problem, size]) ]
+        return os.path.join(self._root, *parts)
+
+    def _partitioning(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        return ds.partitioning(pa.schema([ (k, pa.string())
+                                           for k in PARTITIONS ]),
+                               flavor='hive')
+
+    def _dataset(self, filter=None):
+        """
+        Le jeu de données des fichiers correspondant a filter, avec le schéma
+        unifié de ces fichiers (les algorithmes n'ont pas tous les mêmes
+        colonnes). Retourne None si le stockage est vide.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        from pyarrow import fs
+
+        if not os.path.isdir(self._root) :
+            return None
+
+        filesystem = fs.LocalFileSystem(use_mmap=True)
+        dataset = ds.dataset(self._root, format='parquet',
+                             partitioning=self._partitioning(),
+                             filesystem=filesystem)
+        fragments = list(dataset.get_fragments(filter=filter))
+        if len(fragments) == 0 :
+            return None
+
+        schema = pa.unify_schemas([ f.physical_schema for f in fragments ] +
+                                  [ dataset.partitioning.schema ])
+        return ds.dataset([ f.path for f in fragments ], schema=schema,
+                          format='parquet', filesystem=filesystem,
+                          partitioning=self._partitioning(),
+                          partition_base_dir=self._root)
+
+    def _filter(self, algo=None, problem=None, size=None, runs=None):
+        """ L'expression de filtre pyarrow, les valeurs peuvent être des listes """
+        import pyarrow.dataset as ds
+
+        expr = None
+        for name, value in zip(PARTITIONS + ['run'],
+                               [algo, problem, size, runs]) :
+            if value is None :
+                continue
+            if not isinstance(value, (list, tuple, set)) :
+                value = [value]
+            e = ds.field(name).isin(list(value))
+            expr = e if expr is None else expr & e
+        return expr
+
+    def next_run(self, algo, problem, size):
+        """
+        Le premier numéro de run libre de la partition. Seuls les pieds des
+        fichiers Parquet (statistiques min/max de la colonne run) sont lus.
+        """
+        dataset = self._dataset(self._filter(algo, problem, size))
+        if dataset is None :
+            return 0
+
+        last = -1
+        for fragment in dataset.get_fragments() :
+            metadata = fragment.metadata
+            col = metadata.schema.to_arrow_schema().get_field_index('run')
+            for rg in range(metadata.num_row_groups) :
+                stats = metadata.row_group(rg).column(col).statistics
+                if stats is None or not stats.has_min_max :
+                    # pas de statistiques : on lit la colonne
+                    runs = fragment.to_table(columns=['run']).column('run')
+                    last = max([last] + runs.to_pylist())
+                    break
+                last = max(last, stats.max)
+        return int(last) + 1
+
+    def append(self, stats, algo, problem, size):
+        """
+        Ajoute les statistiques d'une ou plusieurs exécutions dans un nouveau
+        fichier de la partition (algo, problem, size)
+
+        prend :
+           stats : un pandas.DataFrame avec une colonne 'run', les colonnes
+                   des partitions (algo, problem, problem_size) sont ignorées
+        retourne le chemin du fichier écrit
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        stats = stats.drop(columns=[ c for c in PARTITIONS + ['problem_size']
+                                     if c in stats.columns ])
+        table = pa.Table.from_pandas(stats, preserve_index=False)
+
+        directory = self._partition_dir(algo, problem, size)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory,
+                            "part-{}.parquet".format(uuid.uuid4().hex))
+        pq.write_table(table, path)
+        return path
+
+    def load(self, algo=None, problem=None, size=None, runs=None,
+             columns=None):
+        """
+        Charge les statistiques dans un pandas.DataFrame. Chaque critère est
+        une valeur, une liste de valeurs ou None (pas de filtre).
+
+        prend :
+           algo, problem, size : les partitions a lire
+           runs : les numéros de run a garder
+           columns : les colonnes a lire (toutes par défaut), celles qui
+                     n'existent pas sont ignorées
+
+        retourne un DataFrame avec les colonnes demandées, plus algo, problem
+        et problem_size
+        """
+        import pandas as pd
+
+        dataset = self._dataset(self._filter(algo, problem, size))
+        if dataset is None :
+            return pd.DataFrame()
+
+        if columns is not None :
+            columns = [ c for c in columns if c in dataset.schema.names
+                        and c not in PARTITIONS ] + PARTITIONS
+
+        table = dataset.to_table(columns=columns,
+                                 filter=self._filter(algo, problem, size, runs))
+        data = table.to_pandas()
+        return data.rename(columns={'size' : 'problem_size'})
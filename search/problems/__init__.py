@@ -3,3 +3,4 @@ from .knapsac import *
 from .set_covering import *
 from .tsp import *
 from .test_functions import *
+from .cached_problem import CachedProblem
@@ -0,0 +1,223 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections import OrderedDict
+
+import numpy as np
+
+from .problem import Problem
+from search.solutions.solution import fingerprint
+
+"""
+Cache des évaluations d'un problème.
+
+CachedProblem encapsule n'importe quel Problem et mémorise les valeurs des
+solutions déjà évaluées, la clef étant l'empreinte 64 bits du tableau de la
+solution (cf. fingerprint), recalculée a chaque demande depuis le tableau
+courant : une solution modifiée en place n'est jamais confondue avec son 
+ancienne version. Les octets du tableau sont gardés dans l'entrée pour 
+détecter les (rares) collisions d'empreintes. Le cache est borné, la 
+solution la moins récemment utilisée est oubliée en premier (LRU).
+
+Exemple :
+
+    problem = CachedProblem(generate_knapsac_instance('medium', 5000))
+
+"""
+
+class CachedProblem(Problem):
+
+    def __init__(self, problem, max_size=100000, count_hits=True):
+        """
+        Entrées :
+
+        * le problème a encapsuler, instance de Problem
+        * le nombre maximum de solutions gardées en cache
+        * count_hits : si vrai (par défaut) une solution trouvée dans le cache
+          compte quand même pour une évaluation (le budget max_eval des
+          algorithmes est inchangé, seul le temps de calcul est économisé),
+          sinon seules les vraies évaluations sont comptées
+
+        Note : le compteur d'évaluations, max_eval et le sens de l'optimisation
+               sont ceux du problème encapsulé (Problem.__init__ n'est pas
+               appelé)
+        """
+        if not isinstance(problem, Problem):
+            raise TypeError("problem must be a instance of Problem")
+
+        self._problem = problem
+        self._max_size = max_size
+        self._count_hits = count_hits
+
+        # clef -> [valeur, feasable, octets], None tant que ce n'est pas
+        # calculé
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        """
+        Les méthodes propres au problème encapsulé (par ex. les évaluations
+        incrémentales evaluate_swap_delta, qui ne passent pas par le cache)
+
+        Sauf evaluate_packed_batch : les lots passent par evaluate_batch, 
+        qui utilise le cache
+        """
+        if name in ['_problem', 'evaluate_packed_batch'] :
+            raise AttributeError(name)
+        return getattr(self._problem, name)
+
+    @property
+    def problem(self):
+        """ le problème encapsulé """
+        return self._problem
+
+    @property
+    def minimize(self) :
+        return self._problem.minimize
+
+    @property
+    def maximize(self) :
+        return self._problem.maximize
+
+    @property
+    def name(self):
+        return self._problem.name
+
+    @property
+    def max_eval(self):
+        return self._problem.max_eval
+
+    @property
+    def nb_evaluations(self):
+        """ les évaluations du problème, plus les succès du cache s'ils comptent """
+        if self._count_hits :
+            return self._problem.nb_evaluations + self.hits
+        return self._problem.nb_evaluations
+
+    @nb_evaluations.setter
+    def nb_evaluations(self, value):
+        if self._count_hits :
+            value -= self.hits
+        self._problem.nb_evaluations = value
+
+    @property
+    def hit_rate(self):
+        """ la proportion des demandes trouvées dans le cache """
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def reset(self):
+        """ remets les compteurs a zero et vide le cache """
+        self._problem.reset()
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def no_more_evals(self):
+        return self.nb_evaluations > self._problem.max_eval
+
+    def _key(self, x):
+        """ la clef et les octets du tableau x (cf. fingerprint) """
+        x = np.ascontiguousarray(x)
+        return fingerprint(x), (x.dtype.str, x.shape, x.tobytes())
+
+    def _lookup(self, key, raw, field):
+        """ 
+        l'entrée du cache si le champ demandé est connu pour ce tableau 
+        (mêmes octets), None sinon 
+        """
+        entry = self._cache.get(key)
+        if entry is None or entry[2] != raw or entry[field] is None :
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _store(self, key, raw, field, value):
+        entry = self._cache.get(key)
+        if entry is None or entry[2] != raw :
+            # nouvelle entrée, ou collision : l'ancienne est remplacée
+            entry = self._cache[key] = [None, None, raw]
+            self._cache.move_to_end(key)
+            if len(self._cache) > self._max_size :
+                self._cache.popitem(last=False)
+        else :
+            self._cache.move_to_end(key)
+        entry[field] = value
+
+    def evaluate(self, sol):
+        key, raw = self._key(sol.solution)
+        entry = self._lookup(key, raw, 0)
+        if entry is not None :
+            self.hits += 1
+            sol._value = entry[0]
+            return entry[0]
+
+        self.misses += 1
+        val = self._problem.evaluate(sol)
+        self._store(key, raw, 0, val)
+        return val
+
+    @property
+    def evaluate_batch(self):
+        """ disponible seulement si le problème encapsulé la propose """
+        if not hasattr(self._problem, 'evaluate_batch') :
+            raise AttributeError("evaluate_batch")
+        return self._evaluate_batch
+
+    def _evaluate_batch(self, X):
+        """
+        Seules les lignes absentes du cache (et sans doublon) sont évaluées
+        par le problème encapsulé, en un seul appel
+        """
+        keys = [ self._key(x) for x in X ]
+        vals = np.empty(len(X), dtype=np.double)
+        feasable = np.empty(len(X), dtype=np.bool_)
+
+        todo = OrderedDict() # (clef, octets) -> indices des lignes
+        for i, (key, raw) in enumerate(keys) :
+            entry = self._lookup(key, raw, 1)
+            if entry is not None and entry[0] is not None :
+                vals[i], feasable[i] = entry[0], entry[1]
+            else :
+                todo.setdefault((key, raw), []).append(i)
+
+        self.misses += len(todo)
+        self.hits += len(X) - len(todo)
+
+        if len(todo) > 0 :
+            rows = [ idx[0] for idx in todo.values() ]
+            new_vals, new_feasable = self._problem.evaluate_batch(X[rows])
+            for (key, raw), idx, v, f in zip(todo, todo.values(),
+                                             new_vals, new_feasable) :
+                vals[idx] = v
+                feasable[idx] = f
+                self._store(key, raw, 0, float(v))
+                self._store(key, raw, 1, bool(f))
+
+        return vals, feasable
+
+    def feasable(self, sol):
+        key, raw = self._key(sol.solution)
+        entry = self._lookup(key, raw, 1)
+        if entry is not None :
+            return entry[1]
+
+        feasable = self._problem.feasable(sol)
+        self._store(key, raw, 1, feasable)
+        return feasable
+
+    def print_solution(self, sol):
+        return self._problem.print_solution(sol)
+
+    def draw_solution(self, sol, fname):
+        return self._problem.draw_solution(sol, fname)
+
+    def generate_initial_solution(self, sol_type='empty', rng=None):
+        return self._problem.generate_initial_solution(sol_type, rng=rng)
+
+    def print_cache(self):
+        """ retourne des infos sur le cache """
+        return "cache:{}/{} hits:{} misses:{} hit_rate:{:.3f}".format(
+            len(self._cache), self._max_size, self.hits, self.misses,
+            self.hit_rate)
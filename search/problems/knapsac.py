@@ -4,31 +4,47 @@
 import numpy as np
 
 
-from search.solutions import BinarySolution
+from search.solutions import BinarySolution, PackedBinarySolution
+from search.solutions import pack_bits, unpack_bits, popcount
 from search.problems import Problem
 
 
 """
 Un object du sac
 
+Une vue sur l'objet i des tableaux de volumes et valeurs d'un Knapsac (cf. 
+Knapsac.items), ou un objet isolé quand il est créé par Item(vol, val).
+
 """
 class Item(object):
+
+    __slots__ = ('_volumes', '_values', '_i')
+
     def __init__(self, vol, val):
-        self._vol = vol * 1.0
-        self._val = val * 1.0
-        self._density = val / vol
+        self._volumes = np.array([vol], dtype=np.double)
+        self._values = np.array([val], dtype=np.double)
+        self._i = 0
+
+    @classmethod
+    def view(cls, volumes, values, i):
+        """ l'objet i des tableaux volumes et values (sans copie) """
+        item = cls.__new__(cls)
+        item._volumes = volumes
+        item._values = values
+        item._i = i
+        return item
         
     @property
     def density(self) :
-        return self._density
+        return self.val / self.vol
 
     @property
     def vol(self) :
-        return self._vol
+        return float(self._volumes[self._i])
 
     @property
     def val(self) :
-        return self._val
+        return float(self._values[self._i])
         
 """
 La sous-classe de Problem pour le sac a dos
@@ -36,24 +52,135 @@ La sous-classe de Problem pour le sac a dos
 Une solution est un vecteur de booléens, ou chaque element reflète si l'élément 
 au même indice est present ou pas dans le sac.
 
+Les volumes et valeurs des objets sont rangés dans deux tableaux contigus
+(float64), les évaluations sont des produits scalaires (matrice-vecteur pour
+evaluate_batch).
+
+Avec packed=True les solutions sont empaquetées (cf. PackedBinarySolution) :
+pour des volumes et valeurs entiers, un produit scalaire avec un lot de 
+solutions empaquetées est une somme de popcounts, sum_b 2^b popcount(W & P_b)
+où P_b est le masque empaqueté des objets dont le bit b du poids est a 1 
+(cf. evaluate_packed_batch).
+
 """
     
 class Knapsac(Problem) : 
 
-    def __init__(self, capacity, items,  max_eval=1000):
+    def __init__(self, capacity, items,  max_eval=1000, packed=False):
+        """
+        Entrées :
+
+        * la capacité du sac
+        * la liste des objets, instances de Item (cf. from_arrays pour donner
+          directement les tableaux)
+        * le nombre d'évaluations maximum
+        * packed : solutions empaquetées (cf. PackedBinarySolution)
+        """
         Problem.__init__(self, max_eval)
         self._capacity = capacity
-        self._available_items = items
         self._minimize = False
-        
+        self._solution_class = PackedBinarySolution if packed else BinarySolution
+        # poids -> masques empaquetés des bits des poids (cf. _bit_planes)
+        self._planes = {}
+
+        self._volumes = np.array([ i.vol for i in items ], dtype=np.double)
+        self._values = np.array([ i.val for i in items ], dtype=np.double)
+
+    @property
+    def packed(self):
+        """ vrai si les solutions sont empaquetées (cf. PackedBinarySolution) """
+        return self._solution_class is PackedBinarySolution
+
+    @classmethod
+    def from_arrays(cls, capacity, volumes, values, max_eval=1000, packed=False):
+        """ Construit le problème depuis les tableaux des volumes et valeurs """
+        volumes = np.ascontiguousarray(volumes, dtype=np.double)
+        values = np.ascontiguousarray(values, dtype=np.double)
+        if volumes.shape != values.shape or volumes.ndim != 1 :
+            raise ValueError("volumes and values must be 1d arrays of the same size")
+
+        problem = cls(capacity, [], max_eval=max_eval, packed=packed)
+        problem._volumes = volumes
+        problem._values = values
+        return problem
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def volumes(self):
+        return self._volumes
+
+    @property
+    def values(self):
+        return self._values
+
+    @property
+    def items(self):
+        """ les objets, des vues sur les tableaux (cf. Item) """
+        return [ Item.view(self._volumes, self._values, i)
+                 for i in range(len(self._volumes)) ]
+
+    def _bit_planes(self, name):
+        """
+        Les masques empaquetés P_b des bits des poids self._<name> (volumes ou
+        values), un tableau (nb_bits x nb_mots), ou None si les poids ne sont
+        pas des entiers positifs (exacts en flottants)
+        """
+        if name not in self._planes :
+            w = getattr(self, '_' + name)
+            planes = None
+            if len(w) > 0 and (w >= 0).all() and (w < 2.0**53).all() \
+               and (w == np.floor(w)).all() :
+                w = w.astype(np.int64)
+                nb_bits = max(int(w.max()).bit_length(), 1)
+                bits = (w[None, :] >> np.arange(nb_bits)[:, None]) & 1
+                planes = pack_bits(bits)
+            self._planes[name] = planes
+        return self._planes[name]
+
+    def _packed_dot(self, W, name):
+        """ Les produits scalaires des poids self._<name> avec les lignes de W """
+        planes = self._bit_planes(name)
+        if planes is None :
+            X = unpack_bits(W, len(self._volumes))
+            return X @ getattr(self, '_' + name)
+        # (N x 1 x mots) & (nb_bits x mots) -> popcounts (N x nb_bits)
+        counts = popcount(W[..., None, :] & planes)
+        return counts @ (2.0 ** np.arange(len(planes)))
+
+    def _get_state(self, sol):
+        """
+        L'état incrémental de sol (cf. Solution._state) : le couple 
+        (volume, valeur) du contenu du sac, calculé s'il est inconnu.
+        Seules les évaluations incrémentales (evaluate_flip_delta, 
+        feasable_flip, flip_state) l'utilisent
+        """
+        if sol._state is None :
+            return self._compute_state(sol)
+        return sol._state
+
+    def _compute_state(self, sol):
+        """ 
+        L'état de sol recalculé depuis son tableau en O(n), il remplace 
+        l'état en cache (evaluate et feasable ne dépendent donc pas d'un 
+        invalidate oublié)
+        """
+        if isinstance(sol, PackedBinarySolution) :
+            W = sol.words
+            sol._state = (float(self._packed_dot(W, 'volumes')),
+                          float(self._packed_dot(W, 'values')))
+        else :
+            x = sol.solution
+            sol._state = (float(self._volumes @ x), float(self._values @ x))
+        return sol._state
+
     def feasable(self, sol) :
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of BinarySolution")
         
-        vol = 0
-        x = sol.solution
-        for i in np.where(x)[0] :
-            vol += self._available_items[i].vol
+        vol, _ = self._compute_state(sol)
         return vol <= self._capacity
 
     def evaluate(self, sol):
@@ -61,38 +188,84 @@ class Knapsac(Problem) :
             raise TypeError("x must be a instance of BinarySolution")
         
         self.nb_evaluations += 1
-        x = sol.solution
-        val = 0
-        for i in np.where(x)[0] :
-            val += self._available_items[i].val
+        _, val = self._compute_state(sol)
 
-        sol._value = val*1.0
+        sol._value = val
         
-        return val*1.0
+        return val
+
+    def evaluate_flip_delta(self, sol, i):
+        """
+        Évaluation incrémentale de l'inversion du bit i en O(1) : la valeur
+        de l'objet i est ajoutée ou retirée.
+
+        retourne : la variation de la valeur du sac (nouvelle - ancienne)
+
+        Note : compte pour une évaluation (même budget que evaluate)
+        """
+        self.nb_evaluations += 1
+        if sol.bit(i) :
+            return -float(self._values[i])
+        return float(self._values[i])
+
+    def feasable_flip(self, sol, i):
+        """ vrai si la solution obtenue en inversant le bit i tient dans le sac """
+        vol, _ = self._get_state(sol)
+        if sol.bit(i) :
+            return vol - self._volumes[i] <= self._capacity
+        return vol + self._volumes[i] <= self._capacity
+
+    def flip_state(self, sol, i):
+        """ l'état de la solution obtenue en inversant le bit i """
+        vol, val = self._get_state(sol)
+        if sol.bit(i) :
+            return (vol - self._volumes[i], val - self._values[i])
+        return (vol + self._volumes[i], val + self._values[i])
+            
+    def evaluate_batch(self, X):
+        """ 
+        Évaluation vectorisée, une solution par ligne de X 
+        retourne les valeurs et le masque des solutions qui tiennent dans le sac
+        """
+        X = self.check_batch(X, 'b', 'BinarySolution')
+        self.nb_evaluations += len(X)
+        X = np.asarray(X, dtype=np.double)
+        vals = X @ self._values
+        feasable = X @ self._volumes <= self._capacity
+        return vals, feasable
+
+    def evaluate_packed_batch(self, W):
+        """ 
+        Idem pour un lot de solutions empaquetées (cf. pack_bits), par 
+        popcounts si les poids sont entiers
+        """
+        W = self.check_batch(W, 'u', 'PackedBinarySolution')
+        self.nb_evaluations += len(W)
+        W = np.asarray(W, dtype='<u8')
+        vals = self._packed_dot(W, 'values')
+        feasable = self._packed_dot(W, 'volumes') <= self._capacity
+        return vals, feasable
             
     def print_solution(self, sol):
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of BinarySolution")
         
         val = sol._value
-        vol = 0
-        x = sol.solution
-        for i in np.where(x)[0] :
-            vol += self._available_items[i].vol
+        vol, _ = self._compute_state(sol)
 
         return "val:{} vol:{} sol:{}".format(val, vol, str(sol))
 
 
-    def generate_initial_solution(self, sol_type='empty'):
+    def generate_initial_solution(self, sol_type='empty', rng=None):
         
         if sol_type not in [ 'empty', 'random' ] :
             raise ValueError("Unknown inital solution type")
 
-        initial_solution = BinarySolution(dim=len(self._available_items))
+        initial_solution = self._solution_class(dim=len(self._volumes))
         if sol_type == 'random':
-            initial_solution = initial_solution.random()
+            initial_solution = initial_solution.random(rng)
             while not self.feasable(initial_solution) : 
-                initial_solution = initial_solution.random()
+                initial_solution = initial_solution.random(rng)
         return initial_solution
 
 
@@ -194,10 +367,9 @@ def generate_knapsac_instance(prob_type, max_eval, size=None, vol=None):
         if size == None or vol == None :
             raise ValueError("Size and volume must be specified for random instances")
         
-        volume = vol
         w = np.random.randint(1, 30, size)
         v = np.random.randint(1, 10, size)
-        items = [ Item(w[i], v[i]) for i in range(size) ]
+        return Knapsac.from_arrays(vol, w, v, max_eval=max_eval)
 
         
     problem = Knapsac(volume, items, max_eval=max_eval)
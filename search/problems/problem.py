@@ -1,6 +1,8 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import numpy as np
+
 class Problem(object):
 
     def __init__(self, max_eval):
@@ -43,6 +45,42 @@ class Problem(object):
         """
         raise NotImplementedError
 
+    # Méthode optionnelle, a définir dans les classes concrètes quand c'est
+    # possible (cf. eval_solutions qui l'utilise automatiquement) :
+    #
+    # def evaluate_batch(self, X):
+    #     """
+    #     Évaluation vectorisée de plusieurs solutions en un seul appel
+    #
+    #     pramètres X un tableau numpy 2D, une solution par ligne
+    #     retourne un tuple (valeurs, feasable) de deux tableaux de 
+    #              longueur len(X) : les valeurs et le masque de faisabilité
+    #
+    #     Note : compte len(X) évaluations
+    #     """
+    #
+    # def evaluate_packed_batch(self, W):
+    #     """
+    #     Idem pour les problèmes dont les solutions sont empaquetées (propriété
+    #     packed vraie) : une solution par ligne de W, ses mots de 64 bits 
+    #     (cf. pack_bits). eval_solutions et Population.evaluate l'utilisent
+    #     a la place de evaluate_batch
+    #     """
+
+    def check_batch(self, X, kinds, solution_name):
+        """
+        Vérifie un lot de solutions (cf. evaluate_batch) comme evaluate 
+        vérifie la classe de la solution : X doit être un tableau 2D dont le 
+        type numpy est d'une des sortes kinds (ex. 'b' booléens, 'iu' 
+        entiers, 'f' réels).
+
+        retourne X (tableau numpy), lève TypeError sinon
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.dtype.kind not in kinds :
+            raise TypeError("x must be a instance of {}".format(solution_name))
+        return X
+
     def feasable(self, sol) :
         """
         Méthode qui retourne si la solution est feasable
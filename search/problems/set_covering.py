@@ -2,8 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
+from scipy import sparse
 
-from search.solutions import BinarySolution
+from search.solutions import BinarySolution, PackedBinarySolution
 from search.problems import Problem
 
 """
@@ -12,35 +13,165 @@ La sous-classe de Problem pour la couverture d'ensemble.
 Une solution est un vecteur de booléens, ou chaque element reflète si le 
 sous ensemble au même indice est present ou pas dans l'union .
 
+Les sous-ensembles sont rangés dans une matrice d'incidence creuse A (format
+CSR, sous-ensembles x éléments de l'univers) construite une seule fois : les
+couvertures d'une solution x sont A.T @ x, celles d'une population A.T @ X.T.
+
+Avec packed=True les solutions sont empaquetées (cf. PackedBinarySolution).
+Les lots sont évalués dépaquetés par le produit creux (cf. evaluate_batch) :
+des masques empaquetés par élément seraient denses (éléments x mots).
+
 """
 
 class SetCovering(Problem) : 
 
-    def __init__(self, universe, subsets,  max_eval=1000):
+    def __init__(self, universe, subsets,  max_eval=1000, packed=False):
+        """
+        Entrées :
+
+        * l'univers, une séquence d'éléments
+        * les sous-ensembles, des séquences d'éléments de l'univers
+        * le nombre d'évaluations maximum
+        * packed : solutions empaquetées (cf. PackedBinarySolution)
+
+        cf. from_incidence pour donner directement la matrice d'incidence
+        """
+        universe = list(universe)
+        index = { e : k for k, e in enumerate(universe) }
+
+        rows = np.repeat(np.arange(len(subsets)), [ len(s) for s in subsets ])
+        try :
+            cols = np.fromiter(( index[e] for s in subsets for e in s ),
+                               dtype=np.int64, count=len(rows))
+        except KeyError :
+            raise ValueError("the union of subsets must be the universe") 
+
+        incidence = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32),
+                                       (rows, cols)),
+                                      shape=(len(subsets), len(universe)))
+        self._init(incidence, universe, max_eval, packed)
+
+    @classmethod
+    def from_incidence(cls, incidence, max_eval=1000, universe=None,
+                       packed=False):
+        """
+        Construit le problème depuis une matrice d'incidence (dense ou creuse,
+        sous-ensembles x éléments), l'univers est range(nb colonnes) par défaut
+        """
+        incidence = sparse.csr_matrix(incidence, dtype=np.int32)
+        if universe is None :
+            universe = range(incidence.shape[1])
+
+        problem = cls.__new__(cls)
+        problem._init(incidence, list(universe), max_eval, packed)
+        return problem
+
+    def _init(self, incidence, universe, max_eval, packed=False):
         Problem.__init__(self, max_eval)
         self._universe = universe
-        self._subsets = subsets
         self._minimize = True
+        self._solution_class = PackedBinarySolution if packed else BinarySolution
 
-        # test if the union of all subset == the universe
-        U = set()
-        for s in subsets:
-            U = U.union(s)
+        # un élément en double dans un sous-ensemble ne compte qu'une fois
+        incidence.sum_duplicates()
+        incidence.data[:] = 1
+        incidence.eliminate_zeros()
+        self._incidence = incidence
 
-        if not U == set(universe) :
+        # chaque élément de l'univers doit être dans au moins un sous-ensemble
+        if np.diff(incidence.tocsc().indptr).min(initial=1) == 0 :
             raise ValueError("the union of subsets must be the universe") 
+
+    @property
+    def incidence(self):
+        """ la matrice d'incidence creuse, sous-ensembles x éléments """
+        return self._incidence
+
+    @property
+    def nb_subsets(self):
+        return self._incidence.shape[0]
+
+    @property
+    def packed(self):
+        """ vrai si les solutions sont empaquetées (cf. PackedBinarySolution) """
+        return self._solution_class is PackedBinarySolution
+
+    def members(self, i):
+        """ les indices (dans l'univers) des éléments du sous-ensemble i """
+        A = self._incidence
+        return A.indices[A.indptr[i]:A.indptr[i+1]]
+
+    def subset(self, i):
+        """ les éléments du sous-ensemble i """
+        return [ self._universe[k] for k in self.members(i) ]
+
+    def uncovered(self, sol):
+        """ les éléments de l'univers non couverts par sol """
+        counts, _ = self._compute_state(sol)
+        return [ self._universe[k] for k in np.flatnonzero(counts == 0) ]
+
+    def _get_state(self, sol):
+        """
+        L'état incrémental de sol (cf. Solution._state) : le couple 
+        (couvertures, nb_non_couverts) où couvertures[e] est le nombre de 
+        sous-ensembles choisis contenant l'élément e, calculé s'il est inconnu.
+        Seules les évaluations incrémentales (evaluate_flip_delta, 
+        feasable_flip, flip_state) l'utilisent
+        """
+        if sol._state is None :
+            return self._compute_state(sol)
+        return sol._state
+
+    def _compute_state(self, sol):
+        """ 
+        L'état de sol recalculé depuis son tableau, il remplace l'état en 
+        cache (feasable ne dépend donc pas d'un invalidate oublié)
+        """
+        counts = self._incidence.T @ sol.solution.astype(np.int32)
+        sol._state = (counts, int(np.count_nonzero(counts == 0)))
+        return sol._state
             
     def feasable(self, sol) :
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be an instance of Solution")
         
-        x = sol.solution
+        _, nb_uncovered = self._compute_state(sol)
+        return nb_uncovered == 0
 
-        U = set()
-        for i in range( len(self._subsets) ) :
-            if x[i] :
-                U = U.union(self._subsets[i] )
-        return  U == set(self._universe)
+    def evaluate_flip_delta(self, sol, i):
+        """
+        Évaluation incrémentale de l'inversion du bit i en O(1) : un 
+        sous-ensemble de plus ou de moins.
+
+        Note : compte pour une évaluation (même budget que evaluate)
+        """
+        self.nb_evaluations += 1
+        return -1.0 if sol.bit(i) else 1.0
+
+    def _flip_uncovered(self, sol, i):
+        """ la variation du nombre d'éléments non couverts en inversant le bit i """
+        counts, _ = self._get_state(sol)
+        c = counts[self.members(i)]
+        if sol.bit(i) :
+            # les éléments couverts seulement par S_i ne le sont plus
+            return int(np.count_nonzero(c == 1))
+        return -int(np.count_nonzero(c == 0))
+
+    def feasable_flip(self, sol, i):
+        """ 
+        vrai si la solution obtenue en inversant le bit i couvre l'univers, 
+        en O(|S_i|)
+        """
+        _, nb_uncovered = self._get_state(sol)
+        return nb_uncovered + self._flip_uncovered(sol, i) == 0
+
+    def flip_state(self, sol, i):
+        """ l'état de la solution obtenue en inversant le bit i """
+        counts, nb_uncovered = self._get_state(sol)
+        nb_uncovered += self._flip_uncovered(sol, i)
+        counts = counts.copy()
+        counts[self.members(i)] += -1 if sol.bit(i) else 1
+        return (counts, nb_uncovered)
 
 
     def evaluate(self, sol):
@@ -48,39 +179,46 @@ class SetCovering(Problem) :
             raise TypeError("x must be an instance of Solution")
         
         self.nb_evaluations += 1
-        x = sol.solution
-        val = len(np.where(x)[0])
+        val = sol.count()
 
         sol._value = val*1.0
         
         return val*1.0
             
 
+    def evaluate_batch(self, X):
+        """ 
+        Évaluation vectorisée, une solution par ligne de X 
+        retourne les valeurs et le masque des solutions couvrant l'univers
+        """
+        X = self.check_batch(X, 'b', 'BinarySolution')
+        self.nb_evaluations += len(X)
+        X = np.asarray(X, dtype=np.bool_)
+        vals = np.count_nonzero(X, axis=1) * 1.0
+        counts = self._incidence.T @ X.T.astype(np.int32)
+        feasable = (counts > 0).all(axis=0)
+        return vals, feasable
+
     def print_solution(self, sol):
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of Solution")
-        x = sol.solution
         val = sol._value 
-        str_subsets = ""
-        for i in np.where(x)[0] :
-             str_subsets +="{"+ ",".join(str(e) for e in self._subsets[i]) +"}"
         
         return "val:{} sol:{}".format(val, str(sol)) 
 
 
-    def generate_initial_solution(self, sol_type='empty'):
+    def generate_initial_solution(self, sol_type='empty', rng=None):
         
         if sol_type not in [ 'empty', 'random' ] :
             raise ValueError("Unknown inital solution type")
 
-        initial_solution = BinarySolution(dim=len(self._subsets))
-        initial_solution = BinarySolution(x=np.ones(len(self._subsets),
-                                                    dtype=np.bool_))
+        initial_solution = self._solution_class(x=np.ones(self.nb_subsets,
+                                                          dtype=np.bool_))
         
         if sol_type == 'random':
-            initial_solution = initial_solution.random()
+            initial_solution = initial_solution.random(rng)
             while not self.feasable(initial_solution) : 
-                initial_solution = initial_solution.random()
+                initial_solution = initial_solution.random(rng)
         return initial_solution
 
 
@@ -3,7 +3,7 @@
 
 import numpy as np
 
-from search.solutions import BinarySolution
+from search.solutions import BinarySolution, PackedBinarySolution, popcount
 from search.problems import Problem
 
 """
@@ -13,14 +13,23 @@ OneMax, BinVal, LeadingOnes
 
 Porblèmes de maximization, sans contraintes.
 
+Avec packed=True les solutions sont empaquetées (cf. PackedBinarySolution),
+evaluate_packed_batch évalue directement un lot de solutions empaquetées.
+
 """
 class BinaryFunctionProblem(Problem) : 
 
-    def __init__(self, size,  max_eval=1000):
+    def __init__(self, size,  max_eval=1000, packed=False):
         Problem.__init__(self, max_eval)
         self._size = size
         self._minimize = False
-        
+        self._solution_class = PackedBinarySolution if packed else BinarySolution
+
+    @property
+    def packed(self):
+        """ vrai si les solutions sont empaquetées (cf. PackedBinarySolution) """
+        return self._solution_class is PackedBinarySolution
+
     def feasable(self, sol) :
         """ pas de contraintes """
         return True
@@ -31,22 +40,25 @@ class BinaryFunctionProblem(Problem) :
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of Solution")
         
-        self.nb_evaluations -= 1 # on ne compte cette evaluation
-        self.evaluate(sol)
+        # on n'évalue que si la valeur n'est pas connue 
+        if sol.value is None :
+            self.nb_evaluations -= 1 # on ne compte cette evaluation
+            self.evaluate(sol)
         return "val:{} sol:{}".format(sol.value, str(sol))
 
-    def generate_initial_solution(self, sol_type='empty'):
+    def generate_initial_solution(self, sol_type='empty', rng=None):
         """ 
         Genérer une solution initial vide ou aléatoire 
-        Retourne une instance de BinarySolution
+        Retourne une instance de BinarySolution (PackedBinarySolution si le
+        problème est empaqueté)
         
         """
         if sol_type not in [ 'empty', 'random' ] :
             raise ValueError("Unknown inital solution type")
 
-        initial_solution = BinarySolution(dim=self._size)
+        initial_solution = self._solution_class(dim=self._size)
         if sol_type == 'random':
-            initial_solution = initial_solution.random()
+            initial_solution = initial_solution.random(rng)
         return initial_solution
 
 
@@ -56,24 +68,37 @@ La sous-classe de Problem pour le OneMax
 """
 class OneMax(BinaryFunctionProblem) : 
 
-    def __init__(self, size,  max_eval=1000):
-        BinaryFunctionProblem.__init__(self, size, max_eval)
+    def __init__(self, size,  max_eval=1000, packed=False):
+        BinaryFunctionProblem.__init__(self, size, max_eval, packed)
         
     def evaluate(self, sol):
         """ 
         Retourne la valeur de la solution 
         
-        Le nombre de un (vrai) dans la solution 
+        Le nombre de un (vrai) dans la solution (un popcount si elle est 
+        empaquetée)
         """
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of BinarySolution")
     
         self.nb_evaluations += 1
-        x = sol.solution
-        val = len(np.where(x)[0])
-        sol._value = val*1.0
+        sol._value = sol.count()*1.0
         return sol._value
 
+    def evaluate_batch(self, X):
+        """ Évaluation vectorisée, une solution par ligne de X """
+        X = self.check_batch(X, 'b', 'BinarySolution')
+        self.nb_evaluations += len(X)
+        vals = np.count_nonzero(X, axis=1) * 1.0
+        return vals, np.ones(len(X), dtype=np.bool_)
+
+    def evaluate_packed_batch(self, W):
+        """ Idem pour un lot de solutions empaquetées (cf. pack_bits) """
+        W = self.check_batch(W, 'u', 'PackedBinarySolution')
+        self.nb_evaluations += len(W)
+        vals = popcount(W) * 1.0
+        return vals, np.ones(len(W), dtype=np.bool_)
+
 
 """
 La sous-classe de Problem pour le LeadingOnes
@@ -81,14 +106,15 @@ La sous-classe de Problem pour le LeadingOnes
 """
 class LeadingOnes(BinaryFunctionProblem) : 
 
-    def __init__(self, size,  max_eval=1000):
-        BinaryFunctionProblem.__init__(self, size, max_eval)
+    def __init__(self, size,  max_eval=1000, packed=False):
+        BinaryFunctionProblem.__init__(self, size, max_eval, packed)
         
     def evaluate(self, sol):
         """
         Retourne la valeur de la solution 
 
-        la longeur de la suite de 1 depuis le début de la solution   
+        la longeur de la suite de 1 depuis le début de la solution, en O(n) :
+        l'indice du premier 0 (argmin), ou n s'il n'y en a pas
         """
         if not isinstance(sol, BinarySolution):
             raise TypeError("x must be a instance of BinarySolution")
@@ -96,15 +122,18 @@ class LeadingOnes(BinaryFunctionProblem) :
         self.nb_evaluations += 1
         x = sol.solution
         
-        val = 0
-        for i in range(len(x)):
-            prod = int(x[i])
-            for j in range(1, i):
-                prod *= int(x[j])
-            val += prod
+        val = len(x) if x.all() else int(np.argmin(x))
 
         sol._value  = val*1.0
         return sol._value 
+
+    def evaluate_batch(self, X):
+        """ Évaluation vectorisée, une solution par ligne de X """
+        X = self.check_batch(X, 'b', 'BinarySolution')
+        self.nb_evaluations += len(X)
+        X = np.asarray(X, dtype=np.bool_)
+        vals = np.where(X.all(axis=1), X.shape[1], np.argmin(X, axis=1))
+        return vals * 1.0, np.ones(len(X), dtype=np.bool_)
            
 """
 La sous-classe de Problem pour le BinVal
@@ -113,8 +142,31 @@ La sous-classe de Problem pour le BinVal
     
 class BinVal(BinaryFunctionProblem) : 
 
-    def __init__(self, size,  max_eval=1000):
-        BinaryFunctionProblem.__init__(self, size, max_eval)
+    def __init__(self, size,  max_eval=1000, exact=False, packed=False):
+        """
+        exact : si faux (par défaut) la valeur est un produit scalaire en
+                flottants avec les poids 2^i, exact jusqu'a 53 bits et 
+                limité a 1023 bits. Si vrai c'est un entier python exact
+                (int.from_bytes des bits empaquetés), sans limite de taille.
+
+        Note : les populations gardent les valeurs exactes (tableau d'objets,
+        cf. Population) quand elles dépassent les flottants, leurs 
+        statistiques (min, max, moyenne) sont en flottants (+/-inf au delà)
+        """
+        BinaryFunctionProblem.__init__(self, size, max_eval, packed)
+        self._exact = exact
+        self._weights = None
+        if not exact :
+            if size > 1023 :
+                raise ValueError("BinVal over 1023 bits requires exact=True")
+            self._weights = 2.0 ** np.arange(size)
+
+    def value(self, x):
+        """ La valeur en décimal du vecteur de bits x (bit de poids faible en 0) """
+        if self._exact :
+            packed = np.packbits(x, bitorder='little')
+            return int.from_bytes(packed.tobytes(), 'little')
+        return float(x @ self._weights)
         
     def evaluate(self, sol):
         """ 
@@ -126,14 +178,28 @@ class BinVal(BinaryFunctionProblem) :
             raise TypeError("x must be a instance of BinarySolution")
         
         self.nb_evaluations += 1
-        x = np.array(sol.solution, dtype=np.int32)
-        
-        val = 0
-        for i in range(len(x)):
-            val +=  x[i] << i
-        sol._value = val*1.0
+        if self._exact and isinstance(sol, PackedBinarySolution) :
+            # les mots sont déjà les bits empaquetés, petit boutiste
+            sol._value = int.from_bytes(sol.words.tobytes(), 'little')
+        else :
+            sol._value = self.value(sol.solution)
         return sol._value
 
+    def evaluate_batch(self, X):
+        """ 
+        Évaluation vectorisée, une solution par ligne de X 
+
+        Produit scalaire avec les poids 2^i en flottants (un tableau d'entiers
+        python en mode exact)
+        """
+        X = self.check_batch(X, 'b', 'BinarySolution')
+        self.nb_evaluations += len(X)
+        if self._exact :
+            vals = np.array([ self.value(x) for x in X ], dtype=object)
+        else :
+            vals = np.asarray(X, dtype=np.double) @ self._weights
+        return vals, np.ones(len(X), dtype=np.bool_)
+
 
 
 """
@@ -141,9 +207,11 @@ Factory pour generer des instances de OneMax
 
 """
         
-def generate_binary_test_function_instance(function, prob_type, max_eval):
+def generate_binary_test_function_instance(function, prob_type, max_eval,
+                                            packed=False):
     """
     prend : prob_type : type 'small', 'medium', 'large'
+            packed : solutions empaquetées (cf. PackedBinarySolution)
     retourne : une instance de la classe OneMax
 
     """
@@ -161,5 +229,5 @@ def generate_binary_test_function_instance(function, prob_type, max_eval):
     elif prob_type == 'large' :
         size = 100
 
-    return function(size=size, max_eval=max_eval)
+    return function(size=size, max_eval=max_eval, packed=packed)
   
@@ -10,10 +10,15 @@ from search.problems import Problem
 """
 La sous-classe de Problem pour les problemes de fonctions continues
 
-Sphere, Tablet, Sharp Ridge, Rosenbrock
+Sphere, Tablet, Sharp Ridge, Rosenbrock, Rastrigin, Ackley, Griewank, 
+Ellipsoid, Schwefel
 
 Porblèmes de minimisation, sans contraintes.
 
+Chaque fonction est un noyau numpy (cf. compute) qui calcule le long du 
+dernier axe : il accepte un vecteur (dim,) ou un lot (N x dim). evaluate et
+evaluate_batch s'appuient sur lui.
+
 """
 class ContinuousFunctionProblem(Problem) : 
 
@@ -26,6 +31,29 @@ class ContinuousFunctionProblem(Problem) :
     def feasable(self, sol) :
         """ pas de contraintes """
         return True
+
+    def compute(self, X):
+        """ 
+        La valeur de la fonction pour un vecteur (retourne un réel) ou pour
+        chaque ligne d'un lot N x dim (retourne un tableau de N réels)
+        """
+        raise NotImplementedError
+
+    def evaluate(self, sol):
+
+        if not isinstance(sol, RealSolution):
+            raise TypeError("x must be a instance of RealSolution")
+    
+        self.nb_evaluations += 1
+        sol._value = float(self.compute(sol.solution))
+        return sol._value
+
+    def evaluate_batch(self, X):
+        """ Évaluation vectorisée, une solution par ligne de X """
+        X = self.check_batch(X, 'f', 'RealSolution')
+        self.nb_evaluations += len(X)
+        vals = self.compute(np.asarray(X, dtype=np.double))
+        return vals, np.ones(len(X), dtype=np.bool_)
     
     def print_solution(self, sol):
         """ Retourne la solution sous forme de string """
@@ -33,11 +61,13 @@ class ContinuousFunctionProblem(Problem) :
         if not isinstance(sol, RealSolution):
             raise TypeError("x must be a instance of Solution")
         
-        self.nb_evaluations -= 1 # on ne compte cette evaluation
-        self.evaluate(sol)
+        # on n'évalue que si la valeur n'est pas connue 
+        if sol.value is None :
+            self.nb_evaluations -= 1 # on ne compte cette evaluation
+            self.evaluate(sol)
         return "val:{} sol:{}".format(sol.value, str(sol))
 
-    def generate_initial_solution(self, sol_type='empty'):
+    def generate_initial_solution(self, sol_type='empty', rng=None):
         """ 
         Genérer une solution initial vide ou aléatoire 
         Retourne une instance de BinarySolution
@@ -48,11 +78,16 @@ class ContinuousFunctionProblem(Problem) :
 
         initial_solution = RealSolution(dim=self._size)
         if sol_type == 'random':
-            initial_solution = initial_solution.random()
+            initial_solution = initial_solution.random(rng)
         return initial_solution
 
+
+def _sum_squares(X):
+    """ la somme des carrés le long du dernier axe, sans tableau temporaire """
+    return np.einsum('...i,...i->...', X, X)
+
 """
-La sous-classe de Problem pour le OneMax
+La sous-classe de Problem pour Rosenbrock
 
 """
     
@@ -62,20 +97,13 @@ class Rosenbrock(ContinuousFunctionProblem) :
         ContinuousFunctionProblem.__init__(self, size, max_eval)
         self._name = "Rosenbrock"
 
-    def evaluate(self, sol):
-
-        if not isinstance(sol, RealSolution):
-            raise TypeError("x must be a instance of RealSolution")
-    
-        self.nb_evaluations += 1
-        x = sol.solution
-        val=[100.*(x[i]**2-x[i+1])**2 +(1.-x[i])**2 for i in range(len(x)-1)]
-        sol._value = sum(val)
-        return sol._value
+    def compute(self, X):
+        head, tail = X[..., :-1], X[..., 1:]
+        return (100.*(head**2 - tail)**2 + (1.-head)**2).sum(axis=-1)
 
 
 """
-La sous-classe de Problem pour le OneMax
+La sous-classe de Problem pour Sphere
 
 """
     
@@ -85,16 +113,8 @@ class Sphere(ContinuousFunctionProblem) :
         ContinuousFunctionProblem.__init__(self, size, max_eval)
         self._name = "Sphere"
 
-    def evaluate(self, sol):
-
-        if not isinstance(sol, RealSolution):
-            raise TypeError("x must be a instance of RealSolution")
-    
-        self.nb_evaluations += 1
-        x = sol.solution
-        val = sum((x + 0)**2)
-        sol._value = val
-        return sol._value
+    def compute(self, X):
+        return _sum_squares(X)
 
 """
 La sous-classe de Problem pour SharpRidge
@@ -107,17 +127,8 @@ class SharpRidge(ContinuousFunctionProblem) :
         ContinuousFunctionProblem.__init__(self, size, max_eval)
         self._name = "SharpRidge"
 
-    def evaluate(self, sol):
-
-        if not isinstance(sol, RealSolution):
-            raise TypeError("x must be a instance of RealSolution")
-    
-        self.nb_evaluations += 1
-        x = sol.solution
-        val = -x[0]
-        val += 100. * np.sqrt(sum([ x[i]**2 for i in range(1,len(x))]))
-        sol._value = val
-        return sol._value
+    def compute(self, X):
+        return -X[..., 0] + 100. * np.sqrt(_sum_squares(X[..., 1:]))
 
 """
 La sous-classe de Problem pour Tablet
@@ -130,17 +141,94 @@ class Tablet(ContinuousFunctionProblem) :
         ContinuousFunctionProblem.__init__(self, size, max_eval)
         self._name = "Tablet"
 
-    def evaluate(self, sol):
+    def compute(self, X):
+        return 1e6*X[..., 0]**2 + _sum_squares(X[..., 1:])
 
-        if not isinstance(sol, RealSolution):
-            raise TypeError("x must be a instance of RealSolution")
+"""
+La sous-classe de Problem pour Rastrigin
+
+f(x) = 10 n + sum( x_i^2 - 10 cos(2 pi x_i) )
+
+"""
     
-        self.nb_evaluations += 1
-        x = sol.solution
-        val = 1e6*x[0]**2
-        val += sum([ x[i]**2 for i in range(1,len(x))])
-        sol._value = val
-        return sol._value
+class Rastrigin(ContinuousFunctionProblem) : 
+
+    def __init__(self, size,  max_eval=1000):
+        ContinuousFunctionProblem.__init__(self, size, max_eval)
+        self._name = "Rastrigin"
+
+    def compute(self, X):
+        return 10.*X.shape[-1] + (X**2 - 10.*np.cos(2.*np.pi*X)).sum(axis=-1)
+
+"""
+La sous-classe de Problem pour Ackley
+
+f(x) = -20 exp(-0.2 sqrt(mean(x_i^2))) - exp(mean(cos(2 pi x_i))) + 20 + e
+
+"""
+    
+class Ackley(ContinuousFunctionProblem) : 
+
+    def __init__(self, size,  max_eval=1000):
+        ContinuousFunctionProblem.__init__(self, size, max_eval)
+        self._name = "Ackley"
+
+    def compute(self, X):
+        n = X.shape[-1]
+        return (-20.*np.exp(-0.2*np.sqrt(_sum_squares(X)/n))
+                - np.exp(np.cos(2.*np.pi*X).sum(axis=-1)/n) + 20. + np.e)
+
+"""
+La sous-classe de Problem pour Griewank
+
+f(x) = 1 + sum(x_i^2)/4000 - prod( cos(x_i / sqrt(i)) ), i = 1..n
+
+"""
+    
+class Griewank(ContinuousFunctionProblem) : 
+
+    def __init__(self, size,  max_eval=1000):
+        ContinuousFunctionProblem.__init__(self, size, max_eval)
+        self._name = "Griewank"
+        self._inv_sqrt = 1./np.sqrt(np.arange(1, size+1))
+
+    def compute(self, X):
+        return (1. + _sum_squares(X)/4000. 
+                - np.cos(X*self._inv_sqrt).prod(axis=-1))
+
+"""
+La sous-classe de Problem pour Ellipsoid (conditionnement 10^6)
+
+f(x) = sum( 10^(6 (i-1)/(n-1)) x_i^2 )
+
+"""
+    
+class Ellipsoid(ContinuousFunctionProblem) : 
+
+    def __init__(self, size,  max_eval=1000):
+        ContinuousFunctionProblem.__init__(self, size, max_eval)
+        self._name = "Ellipsoid"
+        self._weights = 10.**(6.*np.arange(size)/max(size-1, 1))
+
+    def compute(self, X):
+        return (X**2) @ self._weights
+
+"""
+La sous-classe de Problem pour Schwefel (2.26)
+
+f(x) = 418.9829 n - sum( x_i sin(sqrt(|x_i|)) ), minimum 0 en x_i = 420.9687
+
+"""
+    
+class Schwefel(ContinuousFunctionProblem) : 
+
+    def __init__(self, size,  max_eval=1000):
+        ContinuousFunctionProblem.__init__(self, size, max_eval)
+        self._name = "Schwefel"
+
+    def compute(self, X):
+        return (418.9829*X.shape[-1] 
+                - (X*np.sin(np.sqrt(np.abs(X)))).sum(axis=-1))
 
 
 
@@ -158,7 +246,8 @@ def generate_continuous_test_function_instance(function, prob_type, max_eval):
     retourne : une instance de la classe OneMax
 
     """
-    if function not in [Rosenbrock, Sphere, SharpRidge, Tablet]:
+    if function not in [Rosenbrock, Sphere, SharpRidge, Tablet, Rastrigin,
+                        Ackley, Griewank, Ellipsoid, Schwefel]:
         raise ValueError("Unknown continuous function instance")
     
     if prob_type not in ['small', 'medium', 'large'] :
@@ -3,7 +3,8 @@
 
 import numpy as np
 
-from search.solutions import PermutationSolution
+from search.solutions import PermutationSolution, TwoOpt, OrOpt
+from search.solutions.moves import random_order
 from search.problems import Problem
 
 """
@@ -11,16 +12,59 @@ La sous-classe de Problem pour le TSP
 
 Une solution est un ordre des villes (ordre du parcours).  
 
+Les distances sont lues dans la matrice des distances si elle est donnée, 
+sinon (mode "coordonnées seules", pour les grandes instances) elles sont 
+calculées a la demande depuis les coordonnées des villes (cf. dist).
+
 """
     
 class TSP(Problem) : 
 
-    def __init__(self, cities,  dist_matrix, max_eval=1000):
+    def __init__(self, cities,  dist_matrix=None, max_eval=1000, dtype=None):
+        """
+        Entrées :
+
+        * les coordonnées des villes, un tableau n x 2
+        * la matrice des distances n x n, ou None pour calculer les distances
+          a la demande (la mémoire reste en O(n))
+        * le nombre d'évaluations maximum
+        * dtype : le type des coordonnées et distances (ex. np.float32 pour 
+          diviser la mémoire par deux), par défaut celui des tableaux donnés
+        """
         Problem.__init__(self, max_eval)
-        self._cities = cities
-        self._dist_matrix = dist_matrix
+        self._cities = np.asarray(cities, dtype=dtype)
+        self._dist_matrix = None
+        if dist_matrix is not None :
+            self._dist_matrix = np.asarray(dist_matrix, dtype=dtype)
         self._minimize = True
 
+        # listes des k plus proches voisins, par valeur de k (cf. candidates)
+        self._candidates = {}
+
+    @property
+    def size(self):
+        """ le nombre de villes """
+        return len(self._cities)
+
+    @property
+    def cities(self):
+        return self._cities
+
+    @property
+    def dist_matrix(self):
+        """ la matrice des distances, None en mode coordonnées seules """
+        return self._dist_matrix
+
+    def dist(self, a, b):
+        """ 
+        Les distances entre les villes a et b (des indices ou des tableaux 
+        d'indices de même forme)
+        """
+        if self._dist_matrix is not None :
+            return self._dist_matrix[a, b]
+        diff = self._cities[a] - self._cities[b]
+        return np.sqrt((diff * diff).sum(axis=-1))
+
     def feasable(self, sol) :
         if not isinstance(sol, PermutationSolution):
             raise TypeError("x must be a instance of PermutationSolution")
@@ -33,25 +77,171 @@ class TSP(Problem) :
         self.nb_evaluations += 1
         x = sol.solution
 
-        val = 0 
-        for i in range(0, len(self._cities)) :
-            c1 = x[i-1]
-            c2 = x[i]
-            val += self._dist_matrix[c1,c2]
+        # somme des arêtes (x[i-1], x[i]), l'arête de retour comprise
+        val = float(self.dist(np.roll(x, 1), x).sum(dtype=np.double))
+
+        sol._value = val
+        return val
+
+    def evaluate_batch(self, X):
+        """ Évaluation vectorisée, une permutation par ligne de X """
+        X = self.check_batch(X, 'iu', 'PermutationSolution')
+        self.nb_evaluations += len(X)
+        vals = self.dist(np.roll(X, 1, axis=1), X).sum(axis=1, dtype=np.double)
+        return vals, np.ones(len(X), dtype=np.bool_)
+
+    def evaluate_swap_delta(self, sol, i, j):
+        """
+        Évaluation incrémentale de l'échange des villes aux positions i et j.
+
+        Seules les (au plus) quatre arêtes touchant les positions i et j 
+        changent, le calcul est donc en O(1) au lieu de O(n).
+
+        pramètres : sol une instance de PermutationSolution (déjà évaluée),
+                    i, j les positions échangées
+        retourne : la variation de la longueur du tour (nouvelle - ancienne)
+
+        Note : compte pour une évaluation (même budget que evaluate)
+        """
+        self.nb_evaluations += 1
+        x = sol.solution
+        n = len(x)
+
+        # positions de départ des arêtes touchées, (p, p+1) modulo n. 
+        # Le set évite de compter deux fois une arête quand i et j sont 
+        # voisins dans le tour.
+        starts = { (i-1) % n, i, (j-1) % n, j }
+
+        def city(p):
+            """ ville en position p après l'échange """
+            p %= n
+            if p == i :
+                return x[j]
+            if p == j :
+                return x[i]
+            return x[p]
+
+        delta = 0.0
+        for p in starts :
+            delta -= self.dist(x[p], x[(p+1) % n])
+            delta += self.dist(city(p), city(p+1))
+        return float(delta)
+
+    def evaluate_two_opt_delta(self, sol, i, j):
+        """
+        Évaluation incrémentale du 2-opt (i, j) (cf. TwoOpt) en O(1) : 
+        seules deux arêtes sont remplacées.
+
+        retourne : la variation de la longueur du tour (nouvelle - ancienne)
+
+        Note : compte pour une évaluation (même budget que evaluate)
+        """
+        self.nb_evaluations += 1
+        x = sol.solution
+        a, b = x[i], x[i+1]
+        c, d = x[j], x[(j+1) % len(x)]
+        return float(self.dist(a, c) + self.dist(b, d)
+                     - self.dist(a, b) - self.dist(c, d))
+
+    def evaluate_or_opt_delta(self, sol, i, l, j):
+        """
+        Évaluation incrémentale de l'Or-opt (i, l, j) (cf. OrOpt) en O(1) : 
+        trois arêtes sont remplacées.
+
+        retourne : la variation de la longueur du tour (nouvelle - ancienne)
+
+        Note : compte pour une évaluation (même budget que evaluate)
+        """
+        self.nb_evaluations += 1
+        x = sol.solution
+        n = len(x)
+        p, first, last, nxt = x[i-1], x[i], x[i+l-1], x[(i+l) % n]
+        a, b = x[j], x[(j+1) % n]
+        return float(self.dist(p, nxt) + self.dist(a, first) 
+                     + self.dist(last, b) - self.dist(p, first) 
+                     - self.dist(last, nxt) - self.dist(a, b))
+
+    def candidates(self, k=8):
+        """
+        Les listes de candidats : la ligne c donne les k villes les plus 
+        proches de la ville c, de la plus proche a la plus lointaine.
+
+        Calculées une seule fois par valeur de k, par une sélection partielle
+        (argpartition) dans la matrice des distances ou, en mode coordonnées
+        seules, avec un KD-tree.
+        """
+        k = min(k, self.size - 1)
+        if k not in self._candidates :
+            if self._dist_matrix is not None :
+                D = self._dist_matrix.copy()
+                np.fill_diagonal(D, np.inf)
+                near = np.argpartition(D, k-1, axis=1)[:, :k]
+                order = np.argsort(np.take_along_axis(D, near, axis=1), 
+                                   axis=1, kind='stable')
+                near = np.take_along_axis(near, order, axis=1)
+            else :
+                from scipy.spatial import cKDTree
+                
+                _, near = cKDTree(self._cities).query(self._cities, k=k+1)
+                # la ville elle même est en général la plus proche, mais pas
+                # forcément en cas de villes confondues
+                self_mask = near == np.arange(self.size)[:, None]
+                self_mask[~self_mask.any(axis=1), -1] = True
+                near = near[~self_mask].reshape(self.size, k)
+            self._candidates[k] = near
+        return self._candidates[k]
+
+    def candidate_moves(self, sol, k=8, rng=None, neighborhood='2opt',
+                        max_len=3):
+        """
+        Voisinage restreint aux listes de candidats : les mouvements qui 
+        ajoutent une arête (a, c) où c est un des k plus proches voisins de a,
+        parcourus dans un ordre aléatoire des villes a.
+
+        * '2opt' : n*k mouvements au lieu de n(n-1)/2
+        * 'oropt' : le segment de 1 a max_len villes commençant par a est 
+          inséré après c, n*k*max_len mouvements au lieu de n*n*max_len
+
+        retourne un générateur d'instances de TwoOpt ou OrOpt
+        """
+        if neighborhood not in ['2opt', 'oropt'] :
+            raise ValueError("Unknown candidate neighborhood")
+        
+        x = sol.solution
+        n = len(x)
+        near = self.candidates(k)
+
+        # position de chaque ville dans le tour
+        pos = np.empty(n, dtype=np.intp)
+        pos[x] = np.arange(n)
+
+        for i in random_order(n, rng) :
+            if neighborhood == 'oropt' :
+                for j in pos[near[x[i]]] :
+                    for l in range(1, max_len+1) :
+                        if i + l > n or i - 1 <= j < i + l \
+                           or (i == 0 and j == n-1) :
+                            continue
+                        yield OrOpt(i, l, int(j))
+                continue
 
-        sol._value = val*1.0 
-        return val*1.0
+            for j in pos[near[x[i]]] :
+                lo, hi = (i, int(j)) if i < j else (int(j), i)
+                # c est déjà voisin de a dans le tour
+                if hi - lo < 2 or (lo == 0 and hi == n-1) :
+                    continue
+                yield TwoOpt(lo, hi)
 
     def print_solution(self, sol):
         return "val:{} sol:{}".format(sol._value, str(sol))
 
-    def generate_initial_solution(self,  sol_type='empty'):
+    def generate_initial_solution(self, sol_type='empty', rng=None):
         if sol_type not in [ 'empty', 'random' ] :
             raise ValueError("Unknown inital solution type")
         
-        initial_solution = PermutationSolution(dim=len(self._cities))
+        initial_solution = PermutationSolution(dim=self.size)
         if sol_type == 'random':
-            initial_solution = initial_solution.random()
+            initial_solution = initial_solution.random(rng)
         return initial_solution
 
     def draw_solution(self, sol, fname) :
@@ -76,13 +266,27 @@ class TSP(Problem) :
         
 
 
+def distance_matrix(C, dtype=np.double):
+    """ 
+    La matrice des distances euclidiennes entre les lignes de C, calculée en
+    une fois par diffusion (broadcast), coordonnée par coordonnée
+    """
+    C = np.asarray(C, dtype=dtype)
+    D = np.zeros( (len(C), len(C)), dtype=dtype)
+    for k in range(C.shape[1]) :
+        diff = C[:, k, None] - C[None, :, k]
+        D += diff * diff
+    return np.sqrt(D, out=D)
+
+
 """
 
 Factory pour generer des instances de TSP
 
 """
         
-def generate_tsp_instance(prob_type, max_eval, size=None):
+def generate_tsp_instance(prob_type, max_eval, size=None, on_demand=False,
+                          dtype=np.double):
     """
     Pour générer une instance de problème TSP
 
@@ -90,6 +294,9 @@ def generate_tsp_instance(prob_type, max_eval, size=None):
        prob_type : type 'small', 'medium', 'large', 'random' 
        max_eval : le nombre d'evaluations maximum alloué
        size : le nombre d'items (uniquement si type est random)
+       on_demand : si vrai la matrice des distances n'est pas construite, 
+                   les distances sont calculées a la demande (grandes instances)
+       dtype : le type des coordonnées et des distances (ex. np.float32)
 
     retourne : une instance de la classe TSP
 
@@ -98,32 +305,22 @@ def generate_tsp_instance(prob_type, max_eval, size=None):
     if prob_type not in ['small', 'medium', 'large', 'random'] :
         raise ValueError("Unknown prob_type instance")
     
-    size = 0
     grid_size = 0
     C = None
     if prob_type == 'small' :
-        size = 16
-        grid_size = int(np.sqrt(size))
+        grid_size = 4
 
     if prob_type == 'medium' :
-        size = 36
-        grid_size = int(np.sqrt(size))
+        grid_size = 6
 
     if prob_type == 'large' :
-        size = 49
-        grid_size = int(np.sqrt(size))
+        grid_size = 7
 
     if prob_type in ['small', 'medium', 'large']:
         x = np.linspace(0, 1, grid_size)
         y = np.linspace(0, 1, grid_size)
         xv, yv = np.meshgrid(x, y, indexing='ij')
-        C = np.zeros( (grid_size**2, 2) )
-        count = 0
-        for i in range(len(x)):
-            for j in range(len(y)):
-                C[count,0] = xv[i,j] 
-                C[count,1] = yv[i,j]
-                count += 1
+        C = np.column_stack( (xv.ravel(), yv.ravel()) )
                 
     if prob_type == 'random' :
         if size == None:
@@ -131,19 +328,10 @@ def generate_tsp_instance(prob_type, max_eval, size=None):
         
         C = np.random.sample( (size, 2) )
 
-        
-    D = np.zeros( size * size , dtype=np.double ).reshape(size , size)
-    for i in range(size) :
-        for j in range(size) :
-            x1 = C[i,0]
-            y1 = C[i,1]
-            x2 = C[j,0]
-            y2 = C[j,1]
-                
-            dist = np.sqrt( (x1-x2)**2 + (y1-y2)**2 )
-            D[i,j] = dist
-            D[j,i] = dist
-
+    C = C.astype(dtype)
+    D = None
+    if not on_demand :
+        D = distance_matrix(C, dtype)
                 
     problem = TSP(C, D, max_eval=max_eval)
-    return problem 
+    return problem
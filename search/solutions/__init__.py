@@ -1,4 +1,7 @@
 from .solution import Solution
 from .binary_solution import BinarySolution
+from .packed_binary_solution import PackedBinarySolution, pack_bits, unpack_bits, popcount
 from .permutation_solution import PermutationSolution
 from .real_solution import  RealSolution
+from .moves import Move, BitFlip, Swap, TwoOpt, OrOpt
+from .population import Population
@@ -2,9 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from random import shuffle
 
 from .solution import Solution
+from .moves import BitFlip, random_order
+from search.misc.rng import get_rng
 
 class BinarySolution(Solution):
 
@@ -13,35 +14,44 @@ class BinarySolution(Solution):
     
     """
     
-    def __init__(self, dim=None, x=None):
-        Solution.__init__(self, dim, x)
+    def __init__(self, dim=None, x=None, copy=True):
+        Solution.__init__(self, dim, x, copy)
         if x is None :
             self._sol = np.zeros(dim, dtype=np.bool_)
 
-    def random(self):
+    def random(self, rng=None):
         """ Retourne une solution aléatoire """
-        rnd = np.random.random(self.dim) < 0.5
-        return BinarySolution(x=rnd)
+        rnd = get_rng(rng).random(self.dim) < 0.5
+        return BinarySolution(x=rnd, copy=False)
     
-    def neighbors(self):
-        """ Retourne toutes les solutions voisines i.e. differentes de 1 """
-        N = []
-        for i in range(len(self._sol)):
-            n = np.copy( self._sol )
-            n[i] = not n[i]
-            N.append(BinarySolution(x=n))
-
-        # mélanger pour rendre le parcours non déterministe 
-        shuffle(N)
-        return N
+    def moves(self, rng=None):
+        """ 
+        Parcourt les voisins i.e. differentes de 1 bit, dans un ordre
+        aléatoire pour rendre le parcours non déterministe 
+        """
+        for i in random_order(self.dim, rng):
+            yield BitFlip(i)
+
+    def bit(self, i):
+        """ la valeur (booléen) du bit i """
+        return bool(self._sol[i])
+
+    def count(self):
+        """ le nombre de bits a 1 """
+        return int(np.count_nonzero(self._sol))
+
+    def flip(self, i):
+        """ Inverse le bit i (en place) """
+        self.own()
+        self._sol[i] = not self._sol[i]
+        self.invalidate()
     
     def clone(self):
-        """ Pour cloner la solution """
-        clone_sol = BinarySolution( x=self._sol )   
-        clone_sol._value = self.value
-        return clone_sol
+        """ Pour cloner la solution (sans copie du tableau, cf. own) """
+        return self._clone_from(BinarySolution(x=self._shared_array(), copy=False))
     
     def __str__(self):
         """ une méthode to string pour afficher la solution """
-        return "".join([ '1' if i else '0' for i in  self._sol ])
+        bits = np.asarray(self.solution, dtype=np.uint8)
+        return (bits + ord('0')).tobytes().decode('ascii')
     
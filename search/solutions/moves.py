@@ -0,0 +1,266 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import math
+
+import numpy as np
+
+from search.misc.rng import get_rng
+
+"""
+Mouvements élémentaires pour les voisinages des recherches locales.
+
+Un mouvement est un descripteur léger (quelques indices) qui décrit comment
+passer d'une solution à une de ses voisines. On peut ainsi parcourir un
+voisinage sans construire toutes les solutions voisines : la solution n'est
+matérialisée (cf. Solution.neighbor) que si le mouvement est retenu.
+
+Les classes concrètes doivent implanter les méthodes suivantes :
+
+apply
+undo
+
+et pour la mémoire tabou par attributs (cf. TabuLS) :
+
+removed_attributes
+added_attributes
+
+"""
+
+def edge(a, b):
+    """ l'arête non orientée (a, b) d'un tour, un attribut hashable """
+    a, b = int(a), int(b)
+    return (a, b) if a < b else (b, a)
+
+
+class Move(object):
+
+    """ Classe abstraite représentant un mouvement """
+
+    __slots__ = ()
+
+    # nom de la méthode du problème qui calcule la variation de valeur due au
+    # mouvement, appelée avec (solution, *move.args) si le problème la propose
+    delta_method = None
+
+    # idem pour la faisabilité du voisin (retourne un booléen)
+    feasable_method = None
+
+    # idem pour l'état incrémental du voisin (cf. Solution._state) calculé
+    # depuis celui de la solution
+    state_method = None
+
+    @property
+    def args(self):
+        """ les paramètres du mouvement (un tuple d'indices) """
+        raise NotImplementedError
+
+    def apply(self, sol):
+        """ applique le mouvement à la solution sol (en place) """
+        raise NotImplementedError
+
+    def undo(self, sol):
+        """ annule le mouvement sur la solution sol (en place) """
+        raise NotImplementedError
+
+    def removed_attributes(self, sol):
+        """ 
+        les attributs (hashables) de la solution sol que le mouvement fait 
+        disparaître, ex. (position, valeur) ou arêtes du tour 
+        """
+        raise NotImplementedError
+
+    def added_attributes(self, sol):
+        """ les attributs que le mouvement fait apparaître dans sol """
+        raise NotImplementedError
+
+    def __repr__(self):
+        return "{}{}".format(self.__class__.__name__, self.args)
+
+
+class BitFlip(Move):
+
+    """ Inversion du bit i d'une solution binaire """
+
+    __slots__ = ('i',)
+
+    delta_method = 'evaluate_flip_delta'
+    feasable_method = 'feasable_flip'
+    state_method = 'flip_state'
+
+    def __init__(self, i):
+        self.i = i
+
+    @property
+    def args(self):
+        return (self.i,)
+
+    def apply(self, sol):
+        sol.flip(self.i)
+
+    def undo(self, sol):
+        sol.flip(self.i)
+
+    def removed_attributes(self, sol):
+        return ((self.i, sol.bit(self.i)),)
+
+    def added_attributes(self, sol):
+        return ((self.i, not sol.bit(self.i)),)
+
+
+class Swap(Move):
+
+    """ Échange des éléments aux positions i et j d'une permutation """
+
+    __slots__ = ('i', 'j')
+
+    delta_method = 'evaluate_swap_delta'
+
+    def __init__(self, i, j):
+        self.i = i
+        self.j = j
+
+    @property
+    def args(self):
+        return (self.i, self.j)
+
+    def apply(self, sol):
+        sol.swap(self.i, self.j)
+
+    def undo(self, sol):
+        sol.swap(self.i, self.j)
+
+    def removed_attributes(self, sol):
+        x = sol.solution
+        return ((self.i, int(x[self.i])), (self.j, int(x[self.j])))
+
+    def added_attributes(self, sol):
+        x = sol.solution
+        return ((self.i, int(x[self.j])), (self.j, int(x[self.i])))
+
+
+class TwoOpt(Move):
+
+    """ 
+    2-opt sur une permutation (tour) : le segment des positions i+1 a j est
+    inversé, les arêtes (x[i], x[i+1]) et (x[j], x[j+1]) sont remplacées 
+    par (x[i], x[j]) et (x[i+1], x[j+1]). On a i+1 < j.
+    """
+
+    __slots__ = ('i', 'j')
+
+    delta_method = 'evaluate_two_opt_delta'
+
+    def __init__(self, i, j):
+        self.i = i
+        self.j = j
+
+    @property
+    def args(self):
+        return (self.i, self.j)
+
+    def apply(self, sol):
+        sol.reverse(self.i + 1, self.j)
+
+    def undo(self, sol):
+        sol.reverse(self.i + 1, self.j)
+
+    def removed_attributes(self, sol):
+        x = sol.solution
+        return (edge(x[self.i], x[self.i+1]),
+                edge(x[self.j], x[(self.j+1) % len(x)]))
+
+    def added_attributes(self, sol):
+        x = sol.solution
+        return (edge(x[self.i], x[self.j]),
+                edge(x[self.i+1], x[(self.j+1) % len(x)]))
+
+
+class OrOpt(Move):
+
+    """
+    Or-opt sur une permutation (tour) : le segment de longueur l qui 
+    commence a la position i est déplacé juste après la position j (j hors du
+    segment et différent de i-1), sans inversion.
+    """
+
+    __slots__ = ('i', 'l', 'j')
+
+    delta_method = 'evaluate_or_opt_delta'
+
+    def __init__(self, i, l, j):
+        self.i = i
+        self.l = l
+        self.j = j
+
+    @property
+    def args(self):
+        return (self.i, self.l, self.j)
+
+    def apply(self, sol):
+        sol.move_segment(self.i, self.l, self.j)
+
+    def undo(self, sol):
+        # le segment est maintenant en j-l+1 (vers l'avant) ou en j+1 (vers
+        # l'arrière), on le remet a sa place
+        if self.j > self.i :
+            sol.move_segment(self.j - self.l + 1, self.l, self.i - 1)
+        else :
+            sol.move_segment(self.j + 1, self.l, self.i + self.l - 1)
+
+    def _ends(self, sol):
+        """ les villes autour du segment et du point d'insertion """
+        x = sol.solution
+        n = len(x)
+        i, l, j = self.i, self.l, self.j
+        return x[i-1], x[i], x[i+l-1], x[(i+l) % n], x[j], x[(j+1) % n]
+
+    def removed_attributes(self, sol):
+        p, first, last, nxt, a, b = self._ends(sol)
+        return (edge(p, first), edge(last, nxt), edge(a, b))
+
+    def added_attributes(self, sol):
+        p, first, last, nxt, a, b = self._ends(sol)
+        return (edge(p, nxt), edge(a, first), edge(last, b))
+
+
+def random_order(n, rng=None):
+    """
+    Parcourt range(n) dans un ordre aléatoire uniforme (toutes les 
+    permutations sont équiprobables) sans construire la liste d'avance.
+
+    Tant que moins de la moitié des entiers est sortie, on tire au hasard en
+    rejetant ceux déjà sortis (moins de deux tirages par entier en moyenne),
+    puis le reste est mélangé (rng.permutation). La mémoire est en O(nombre
+    d'entiers parcourus) : un parcours arrêté tôt (premier voisin 
+    améliorant, voisin aléatoire) reste bon marché quelle que soit la taille 
+    du voisinage.
+
+    Prend un entier n et un numpy.random.Generator (cf. get_rng)
+    Retourne un générateur des entiers de 0 à n-1
+    """
+    if n <= 0 :
+        return
+
+    rng = get_rng(rng)
+    seen = set()
+    while 2 * len(seen) < n :
+        k = int(rng.integers(n))
+        if k not in seen :
+            seen.add(k)
+            yield k
+
+    rest = np.ones(n, dtype=np.bool_)
+    rest[list(seen)] = False
+    for k in rng.permutation(np.flatnonzero(rest)) :
+        yield int(k)
+
+
+def pair_from_index(k):
+    """
+    Retourne la k-ième paire (i, j), i < j, dans l'ordre
+    (0,1), (0,2), (1,2), (0,3), ...
+    """
+    j = (1 + math.isqrt(1 + 8*k)) // 2
+    i = k - j*(j-1)//2
+    return i, j
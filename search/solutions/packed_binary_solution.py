@@ -0,0 +1,170 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from .solution import Solution, fingerprint
+from .binary_solution import BinarySolution
+from search.misc.rng import get_rng
+
+"""
+Représentation binaire empaquetée : 64 bits par mot uint64.
+
+Le bit i est le bit (i mod 64) du mot i // 64 (ordre petit boutiste, comme
+np.packbits(..., bitorder='little')), les bits au delà de la dimension sont
+toujours nuls. La mémoire est divisée par 8 par rapport a un tableau de
+booléens, une inversion de bit est un XOR sur un mot et le nombre de 1 est un
+popcount sur les mots.
+
+"""
+
+WORD_BITS = 64
+
+def nb_words(dim):
+    """ le nombre de mots pour dim bits """
+    return (dim + WORD_BITS - 1) // WORD_BITS
+
+def pack_bits(X):
+    """
+    Empaquette les booléens de X le long du dernier axe : un vecteur (dim,)
+    ou un lot (N x dim) donne un tableau (..., nb_words(dim)) de uint64
+    """
+    X = np.asarray(X, dtype=np.bool_)
+    pad = nb_words(X.shape[-1]) * WORD_BITS - X.shape[-1]
+    if pad > 0 :
+        X = np.concatenate((X, np.zeros(X.shape[:-1] + (pad,), dtype=np.bool_)),
+                           axis=-1)
+    return np.packbits(X, axis=-1, bitorder='little').view('<u8')
+
+def unpack_bits(W, dim):
+    """ l'opération inverse de pack_bits : les dim premiers bits en booléens """
+    W = np.ascontiguousarray(W, dtype='<u8')
+    bits = np.unpackbits(W.view(np.uint8), axis=-1, count=dim,
+                         bitorder='little')
+    return bits.view(np.bool_)
+
+if hasattr(np, 'bitwise_count') :
+    def popcount(W):
+        """ le nombre de bits a 1 des mots W, le long du dernier axe """
+        return np.bitwise_count(W).sum(axis=-1, dtype=np.int64)
+else :
+    # numpy < 2.0 : table des popcounts des octets
+    _POPCOUNT8 = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None],
+                               axis=1).sum(axis=1)
+
+    def popcount(W):
+        """ le nombre de bits a 1 des mots W, le long du dernier axe """
+        W = np.ascontiguousarray(W, dtype='<u8')
+        counts = _POPCOUNT8[W.view(np.uint8)]
+        return counts.sum(axis=-1, dtype=np.int64)
+
+
+class PackedBinarySolution(BinarySolution):
+
+    """
+    Solution binaire empaquetée (cf. plus haut).
+
+    Le tableau interne est celui des mots (cf. words) : solution retourne une
+    copie dépaquetée, en lecture seule, pour les problèmes qui travaillent
+    sur les booléens.
+    """
+
+    # les populations rangent les solutions dépaquetées (cf. Population)
+    unpacked_class = BinarySolution
+
+    def __init__(self, dim=None, x=None, copy=True, words=None):
+        """
+        Entrées (une seule parmis) :
+
+        * dim : une solution nulle de dim bits
+        * x : un vecteur de booléens, empaqueté (donc toujours copié)
+        * words : les mots déjà empaquetés, dim est alors obligatoire et copy
+          a le même sens que pour Solution
+        """
+        if words is not None :
+            if dim is None :
+                raise ValueError("Il faut spécifier la dimension")
+            Solution.__init__(self, dim, words, copy)
+        elif x is not None :
+            dim = len(x)
+            Solution.__init__(self, dim, pack_bits(x), copy=False)
+        else :
+            Solution.__init__(self, dim, None)
+            self._sol = np.zeros(nb_words(dim), dtype='<u8')
+        self._dim = dim
+
+    @property
+    def dim(self):
+        return self._dim
+
+    @property
+    def words(self):
+        """ les mots de 64 bits """
+        return self._sol
+
+    @property
+    def solution(self):
+        """ les bits dépaquetés, une copie en lecture seule """
+        bits = unpack_bits(self._sol, self._dim)
+        bits.flags.writeable = False
+        return bits
+
+    @property
+    def fingerprint(self):
+        """ 
+        l'empreinte des bits dépaquetés, la même que celle de la solution 
+        non empaquetée égale (cf. __eq__)
+        """
+        if self._fingerprint is None :
+            self._fingerprint = fingerprint(self.solution)
+        return self._fingerprint
+
+    def random(self, rng=None):
+        """ 
+        Retourne une solution aléatoire, tirée comme BinarySolution.random 
+        pour qu'une même graine donne la même solution empaquetée ou non
+        """
+        rnd = get_rng(rng).random(self._dim) < 0.5
+        return PackedBinarySolution(dim=self._dim, words=pack_bits(rnd),
+                                    copy=False)
+
+    def bit(self, i):
+        return bool((self._sol[i // WORD_BITS] >> np.uint64(i % WORD_BITS))
+                    & np.uint64(1))
+
+    def count(self):
+        return int(popcount(self._sol))
+
+    def flip(self, i):
+        """ Inverse le bit i (en place) : un XOR sur son mot """
+        self.own()
+        self._sol[i // WORD_BITS] ^= np.uint64(1) << np.uint64(i % WORD_BITS)
+        self.invalidate()
+
+    def writable(self):
+        """
+        Les bits sont empaquetés, il n'y a pas de tableau de booléens a 
+        modifier en place (cf. solution) : les opérateurs qui écrivent 
+        bit par bit doivent passer par flip, ou travailler sur une 
+        BinarySolution (comme les populations, cf. unpacked_class)
+        """
+        raise TypeError("PackedBinarySolution has no writable bit array, use flip")
+
+    def clone(self):
+        """ Pour cloner la solution (sans copie du tableau, cf. own) """
+        return self._clone_from(PackedBinarySolution(dim=self._dim,
+                                                     words=self._shared_array(),
+                                                     copy=False))
+
+    def __eq__(self, other):
+        """ 
+        Avec une solution binaire non empaquetée, on compare les bits 
+        dépaquetés
+        """
+        if isinstance(other, BinarySolution) and \
+           not isinstance(other, PackedBinarySolution) :
+            return self.dim == other.dim and \
+                bool((self.solution == other.solution).all())
+        return Solution.__eq__(self, other)
+
+    __hash__ = Solution.__hash__
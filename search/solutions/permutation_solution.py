@@ -2,9 +2,10 @@
 # -*- coding: utf-8 -*-
 
 import numpy as np
-from random import shuffle
 
 from .solution import Solution
+from .moves import Swap, TwoOpt, OrOpt, random_order, pair_from_index
+from search.misc.rng import get_rng
 
 class PermutationSolution(Solution):
     """
@@ -12,42 +13,87 @@ class PermutationSolution(Solution):
 
     """
     
-    def __init__(self, dim=None, x=None):
-        Solution.__init__(self, dim, x)
+    def __init__(self, dim=None, x=None, copy=True):
+        Solution.__init__(self, dim, x, copy)
         if x is None :
             self._sol = np.zeros(dim, dtype=np.int32)
 
-    def random(self):
+    def random(self, rng=None):
         """ Retourne une solution aléatoire """
         rnd = np.arange(self.dim, dtype=np.int32)
-        np.random.shuffle(rnd)
-        return PermutationSolution(x=rnd)
+        get_rng(rng).shuffle(rnd)
+        return PermutationSolution(x=rnd, copy=False)
         
-    def neighbors(self):
+    def moves(self, rng=None):
         """ 
-        Retourne toutes les solutions voisines i.e. differentes de 1 
-        échanger 2 elements du tableau 
+        Parcourt les voisins i.e. differentes de 1 : échanger 2 elements du
+        tableau. Le parcours est aléatoire pour le rendre non déterministe, 
+        les n(n-1)/2 paires ne sont jamais construites.
         
         """
-        N = []
-        for i in range(len(self._sol)):
-            for j in range(i+1,len(self._sol)):
-                if i != j :
-                    n = np.copy( self._sol )
-                    tmp = n[i] 
-                    n[i] = n[j]
-                    n[j] = tmp
-                    N.append( PermutationSolution (x=n) )
-
-        # mélanger pour rendre le parcour non déterministe 
-        shuffle(N)
-        return N
+        n = len(self._sol)
+        for k in random_order(n*(n-1)//2, rng):
+            yield Swap(*pair_from_index(k))
+
+    def two_opt_moves(self, rng=None):
+        """
+        Parcourt le voisinage 2-opt (inversion d'un segment, cf. TwoOpt) dans
+        un ordre aléatoire, sans construire la liste des mouvements
+        """
+        n = len(self._sol)
+        for k in random_order(n*(n-1)//2, rng):
+            i, j = pair_from_index(k)
+            # inversions vides ou du tour entier
+            if j - i < 2 or (i == 0 and j == n-1) :
+                continue
+            yield TwoOpt(i, j)
+
+    def or_opt_moves(self, rng=None, max_len=3):
+        """
+        Parcourt le voisinage Or-opt (déplacement d'un segment de 1 a 
+        max_len éléments, cf. OrOpt) dans un ordre aléatoire
+        """
+        n = len(self._sol)
+        for k in random_order(max_len*n*n, rng):
+            l, k = divmod(k, n*n)
+            i, j = divmod(k, n)
+            l += 1
+            # segment hors du tableau, ou point d'insertion qui ne change
+            # pas le tour
+            if i + l > n or i - 1 <= j < i + l or (i == 0 and j == n-1) :
+                continue
+            yield OrOpt(i, l, j)
+
+    def swap(self, i, j):
+        """ Échange les éléments aux positions i et j (en place) """
+        self.own()
+        self._sol[i], self._sol[j] = self._sol[j], self._sol[i]
+        self.invalidate()
+
+    def move_segment(self, i, l, j):
+        """ 
+        Déplace le segment des positions i a i+l-1 juste après la position j
+        (en place, seul le segment est copié)
+        """
+        self.own()
+        segment = self._sol[i:i+l].copy()
+        if j > i :
+            self._sol[i:j-l+1] = self._sol[i+l:j+1]
+            self._sol[j-l+1:j+1] = segment
+        else :
+            self._sol[j+1+l:i+l] = self._sol[j+1:i]
+            self._sol[j+1:j+1+l] = segment
+        self.invalidate()
+
+    def reverse(self, i, j):
+        """ Inverse le segment des positions i a j incluses (en place) """
+        self.own()
+        self._sol[i:j+1] = self._sol[i:j+1][::-1]
+        self.invalidate()
     
     def clone(self):
-        """ Pour cloner la solution """
-        clone_sol = PermutationSolution( x=self._sol )
-        clone_sol._value = self.value
-        return clone_sol
+        """ Pour cloner la solution (sans copie du tableau, cf. own) """
+        return self._clone_from(PermutationSolution(x=self._shared_array(), copy=False))
     
     def __str__(self):
         """ une méthode to string pour afficher la solution """
@@ -0,0 +1,215 @@
+#! /usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from collections.abc import Sequence
+
+import numpy as np
+
+
+def exact_values(vals):
+    """
+    Le vecteur des valeurs en flottants, ou en tableau d'objets si certaines
+    sont des entiers trop grands pour un flottant (cf. Population)
+    """
+    if not isinstance(vals, np.ndarray) :
+        # une liste de valeurs python : pas de conversion implicite 
+        vals = np.array(vals, dtype=object)
+    if vals.dtype.kind in 'iu' :
+        # entiers au delà de 2**53 : la conversion perdrait des chiffres
+        vals = vals.astype(object)
+    if vals.dtype == object :
+        try :
+            floats = vals.astype(np.double)
+        except OverflowError :
+            return vals.copy()
+        # comparaison exacte entier / flottant (python)
+        if not ((floats == vals) | np.isnan(floats)).all() :
+            return vals.copy()
+        return floats
+    return vals.astype(np.double)
+
+
+class Population(Sequence):
+
+    """
+    Population de solutions stockée dans un seul tableau numpy contigu
+    (une solution par ligne) et un vecteur de valeurs.
+
+    pop[i] retourne une instance de Solution qui est une vue sur la ligne i
+    (pas de copie) : modifier son tableau modifie la population. Sa valeur
+    est celle du vecteur au moment de l'accès, la modifier ne met pas à jour
+    le vecteur (cf. evaluate).
+
+    Les opérateurs génétiques peuvent travailler en place sur les lignes
+    (crossover_one_point, crossover_uniform, flip, ...) sans créer d'objets.
+
+    Une valeur NaN signifie que la solution n'a pas encore été évaluée.
+
+    Les valeurs sont des flottants, sauf si le problème donne des entiers 
+    exacts trop grands pour un flottant (cf. BinVal en mode exact) : le 
+    vecteur est alors un tableau d'objets (entiers python), les tris et 
+    comparaisons restent exacts.
+    """
+
+    def __init__(self, genomes, solution_class, values=None):
+        """
+        Entrées :
+
+        * un tableau numpy 2D (taille x dimension), il n'est pas copié
+        * la classe des solutions de la population (ex. BinarySolution)
+        * le vecteur des valeurs (optionnel, non évaluées par défaut)
+
+        """
+        self._genomes = genomes
+        self._solution_class = solution_class
+        if values is None :
+            values = np.full(len(genomes), np.nan)
+        self._values = values
+
+    @classmethod
+    def from_solutions(cls, solutions):
+        """ 
+        Construit une population depuis une liste de solutions (copie) 
+
+        Les solutions empaquetées (cf. PackedBinarySolution) sont rangées 
+        dépaquetées, les opérateurs travaillent sur les booléens
+        """
+        if len(solutions) == 0 :
+            raise ValueError("Il faut au moins une solution")
+        genomes = np.array([ s.solution for s in solutions ])
+        values = exact_values([ np.nan if s.value is None else s.value
+                                for s in solutions ])
+        solution_class = type(solutions[0])
+        solution_class = getattr(solution_class, 'unpacked_class', solution_class)
+        return cls(genomes, solution_class, values)
+
+    @classmethod
+    def random(cls, problem, size, rng=None):
+        """ 
+        Une population de size solutions aléatoires du problème, tirées de
+        rng (un numpy.random.Generator)
+        """
+        return cls.from_solutions(
+            [ problem.generate_initial_solution(sol_type='random', rng=rng)
+              for i in range(size) ])
+
+    @property
+    def genomes(self):
+        """ le tableau (taille x dimension) des solutions """
+        return self._genomes
+
+    @property
+    def values(self):
+        """ le vecteur des valeurs des solutions """
+        return self._values
+
+    @property
+    def solution_class(self):
+        return self._solution_class
+
+    @property
+    def dim(self):
+        return self._genomes.shape[1]
+
+    def __len__(self):
+        return len(self._genomes)
+
+    def __getitem__(self, i):
+        """
+        Un entier : une solution vue sur la ligne i
+        Une tranche : une population vue sur les lignes correspondantes
+        """
+        if isinstance(i, slice) :
+            return Population(self._genomes[i], self._solution_class,
+                              self._values[i])
+
+        sol = self._solution_class(x=self._genomes[i], copy=False)
+        v = self._values[i]
+        if v != v : # NaN : non évaluée
+            v = None
+        elif isinstance(v, np.generic) :
+            v = v.item()
+        sol._value = v
+        return sol
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __add__(self, other):
+        """ Concaténation avec une autre population ou une liste de solutions """
+        if not isinstance(other, Population) :
+            other = Population.from_solutions(other)
+        return Population(np.concatenate((self._genomes, other._genomes)),
+                          self._solution_class,
+                          np.concatenate((self._values, other._values)))
+
+    def copy(self):
+        """ Une copie de la population (tableaux compris) """
+        return Population(self._genomes.copy(), self._solution_class,
+                          self._values.copy())
+
+    def take(self, idx):
+        """
+        Une nouvelle population avec les lignes idx (copiées en une seule
+        opération, une ligne peut apparaitre plusieurs fois)
+        """
+        return Population(self._genomes[idx], self._solution_class,
+                          self._values[idx])
+
+    def evaluate(self, problem):
+        """
+        Évalue toute la population sur le problème, avec evaluate_batch si le
+        problème le propose, ou evaluate_packed_batch sur les génomes 
+        empaquetés si ses solutions sont empaquetées (cf. Problem.packed).
+
+        Retourne la liste des valeurs (cf. eval_solutions)
+        """
+        if getattr(problem, 'packed', False) and \
+           hasattr(problem, 'evaluate_packed_batch') :
+            # import local : packed_binary_solution importe search.misc
+            from .packed_binary_solution import pack_bits
+
+            vals, feasable = problem.evaluate_packed_batch(pack_bits(self._genomes))
+        elif hasattr(problem, 'evaluate_batch') :
+            vals, feasable = problem.evaluate_batch(self._genomes)
+        else :
+            sols = list(self)
+            vals = [ problem.evaluate(s) for s in sols ]
+            feasable = [ problem.feasable(s) for s in sols ]
+
+        vals = exact_values(vals)
+        vals[~np.asarray(feasable, dtype=np.bool_)] = \
+            float("-inf") if problem.maximize else float("inf")
+        self._values = vals
+        return vals.tolist()
+
+    def sort(self, problem):
+        """
+        Trie la population en place, self[0] est la meilleure solution.
+        Retourne les indices par rapport à la population initiale (cf. sort_pop)
+        """
+        if problem.maximize :
+            idx = np.argsort(-self._values, kind='stable')
+        else :
+            idx = np.argsort(self._values, kind='stable')
+        self._genomes[:] = self._genomes[idx]
+        self._values[:] = self._values[idx]
+        return idx.tolist()
+
+    def crossover_one_point(self, i, j, point):
+        """ Échange en place les fins des lignes i et j à partir de point """
+        tmp = self._genomes[i, point:].copy()
+        self._genomes[i, point:] = self._genomes[j, point:]
+        self._genomes[j, point:] = tmp
+        self._values[i] = self._values[j] = np.nan
+
+    def crossover_uniform(self, i, j, mask):
+        """ La ligne i reçoit les gènes de la ligne j là ou mask est vrai """
+        self._genomes[i, mask] = self._genomes[j, mask]
+        self._values[i] = np.nan
+
+    def flip(self, i, k):
+        """ Inverse en place le(s) bit(s) k de la ligne i """
+        self._genomes[i, k] = ~self._genomes[i, k]
+        self._values[i] = np.nan
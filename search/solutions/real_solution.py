@@ -4,6 +4,7 @@
 import numpy as np
 
 from .solution import Solution
+from search.misc.rng import get_rng
 
 class RealSolution(Solution):
 
@@ -11,26 +12,27 @@ class RealSolution(Solution):
     Classe abstraite pour representer une solution comme un vecteur de réels
 
     """
-    def __init__(self, dim=None, x=None):
-        Solution.__init__(self, dim, x)
+    def __init__(self, dim=None, x=None, copy=True):
+        Solution.__init__(self, dim, x, copy)
         if x is None :
             self._sol = np.zeros(dim, dtype=np.double)
 
-    def random(self):
+    def random(self, rng=None):
         """ Retourne une solution aléatoire dans [-5, 5]^dim """
-        rnd = np.random.random(self.dim)
+        rnd = get_rng(rng).random(self.dim)
         rnd *= 10
         rnd -= 5
-        return RealSolution(x=rnd)
+        return RealSolution(x=rnd, copy=False)
     
-    def neighbors(self):
+    def moves(self, rng=None):
+        raise NotImplementedError("Une solution réelle n'a pas de voisinage")
+
+    def neighbors(self, rng=None):
         raise NotImplementedError("Une solution réelle n'a pas de voisinage")
     
     def clone(self):
-        """ Pour cloner la solution """
-        clone_sol =  RealSolution( x=self._sol )   
-        clone_sol._value = self.value
-        return clone_sol
+        """ Pour cloner la solution (sans copie du tableau, cf. own) """
+        return self._clone_from(RealSolution(x=self._shared_array(), copy=False))
     
     def __str__(self):
         """ une méthode to string pour afficher la solution """
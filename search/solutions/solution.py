@@ -1,8 +1,20 @@
 #! /usr/bin/env python
 # -*- coding: utf-8 -*-
 
+import hashlib
+import weakref
+
 import numpy as np
-from random import shuffle
+
+
+def fingerprint(x):
+    """ 
+    L'empreinte (entier 64 bits, blake2b des octets) du tableau x, utilisée
+    comme hash des solutions et comme clef des caches 
+    """
+    x = np.ascontiguousarray(x)
+    digest = hashlib.blake2b(x, digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
 
 
 class Solution(object):
@@ -12,42 +24,193 @@ class Solution(object):
     
     """
     
-    def __init__(self, dim=None, x=None):
-        """ constructeur presque vide  voire les classe concrèrte plus bas """
+    def __init__(self, dim=None, x=None, copy=True):
+        """ 
+        constructeur presque vide  voire les classe concrèrte plus bas 
+
+        Si copy est faux, x est adopté tel quel (vue sur une ligne d'une
+        Population, ou tableau que l'appelant ne modifiera plus) au lieu 
+        d'être copié
+
+        Le tableau peut être partagé avec des clones (cf. clone) : il est 
+        alors en lecture seule et copié a la première écriture (cf. own et
+        writable)
+        """
 
         if dim is None and x is None :
             raise ValueError("Il faut spécifier la dimension ou une solution")
               
         if x is not None :
-            self._sol = np.copy(x)
+            self._sol = np.copy(x) if copy else x
             
         self._value = None
 
+        # le mouvement ayant produit cette solution depuis sa voisine 
+        # (cf. neighbor), utile pour les évaluations incrémentales
+        self._move = None
+
+        # état incrémental propre au problème (ex. volume du sac, nombre de
+        # couvertures par élément), calculé et utilisé par le problème pour
+        # les évaluations incrémentales. Il est remis a None par les 
+        # méthodes qui modifient la solution (cf. invalidate)
+        self._state = None
+
+        # l'empreinte du tableau, calculée a la demande (cf. fingerprint)
+        self._fingerprint = None
+
+        # les solutions qui partagent le tableau (références faibles, liste
+        # commune a toutes), None si le tableau n'est pas partagé
+        self._sharers = None
+
     @property
     def dim(self):
         return len(self._sol)
         
     @property
     def solution(self):
+        """ 
+        le tableau de la solution, sans copie. Il est en lecture seule tant 
+        qu'il est partagé avec un clone : pour le modifier en place, passer
+        par writable
+        """
         return self._sol
 
     @property
     def value(self):
         return self._value
+
+    @property
+    def fingerprint(self):
+        """ l'empreinte du tableau de la solution (cf. fingerprint), en cache """
+        if self._fingerprint is None :
+            self._fingerprint = fingerprint(self._sol)
+        return self._fingerprint
+
+    def own(self):
+        """
+        Copie a l'écriture : si le tableau est partagé (lecture seule) avec
+        un clone, on en fait une copie propre a la solution, ou on le reprend
+        sans copie si plus aucune autre solution ne le partage. A appeler 
+        avant toute modification en place du tableau, les méthodes flip, 
+        swap, ... le font déjà. 
+        retourne le tableau, modifiable
+        """
+        if not self._sol.flags.writeable :
+            sharers = self._sharers
+            if sharers is not None :
+                # les solutions encore vivantes qui partagent le tableau
+                sharers[:] = [ r for r in sharers 
+                               if r() is not None and r()._sharers is sharers ]
+            if sharers is not None and \
+               all( r() is self for r in sharers ) :
+                # le tableau d'origine (celui de la solution clonée, ou la 
+                # base de la vue d'un clone) redevient modifiable
+                if self._sol.base is not None :
+                    self._sol = self._sol.base
+                self._sol.flags.writeable = True
+            else :
+                self._sol = self._sol.copy()
+            self._sharers = None
+        return self._sol
+
+    def writable(self):
+        """
+        Le tableau de la solution pour une modification en place (ex. par 
+        un opérateur génétique) : copié s'il est partagé (cf. own), l'état 
+        incrémental et l'empreinte sont oubliés (cf. invalidate)
+        retourne le tableau, modifiable
+        """
+        self.invalidate()
+        return self.own()
+
+    def _shared_array(self):
+        """
+        Le tableau a donner a un clone, sans copie : le tableau de la 
+        solution passe en lecture seule (ainsi que toute référence prise 
+        avant par solution) et est partagé jusqu'a la première écriture de 
+        l'une ou l'autre (cf. own). Un tableau emprunté (vue 
+        modifiable sur le tableau d'autrui, ex. une ligne de Population) ou
+        en lecture seule sans être partagé est copié, il peut changer sous 
+        nos pieds.
+        """
+        if self._sharers is None :
+            if not (self._sol.flags.writeable and self._sol.flags.owndata) :
+                return self._sol.copy()
+            self._sol.flags.writeable = False
+            self._sharers = [ weakref.ref(self) ]
+        return self._sol.view()
+
+    def _clone_from(self, clone_sol):
+        """ 
+        termine un clone : la valeur et l'empreinte sont les mêmes, le 
+        tableau est partagé (cf. _shared_array)
+        """
+        clone_sol._value = self._value
+        clone_sol._fingerprint = self._fingerprint
+        if self._sharers is not None and not clone_sol._sol.flags.writeable :
+            clone_sol._sharers = self._sharers
+            self._sharers.append(weakref.ref(clone_sol))
+        return clone_sol
+
+    def invalidate(self):
+        """ 
+        Oublie l'état incrémental et l'empreinte, a appeler après toute 
+        modification en place du tableau (sol.solution[i] = ...), les 
+        méthodes flip, swap, ... et writable le font déjà
+        """
+        self._state = None
+        self._fingerprint = None
+
+    def __getstate__(self):
+        """ 
+        pour pickle (ex. exécutions en parallèle) : le partage du tableau 
+        avec les clones ne suit pas la copie 
+        """
+        state = self.__dict__.copy()
+        state['_sharers'] = None
+        return state
+
+    @property
+    def move(self):
+        """ le mouvement qui a produit ce voisin ou None """
+        return self._move
     
-    def random(self):
+    def random(self, rng=None):
         """ 
         crée une solution aléatoire
+        prend un numpy.random.Generator (cf. get_rng)
         retourne un instance de Solution 
         """
         raise NotImplementedError
     
-    def neighbors(self):
+    def moves(self, rng=None):
+        """
+        Parcourt le voisinage de la solution courante dans un ordre aléatoire
+        (tiré de rng, un numpy.random.Generator) sans construire les 
+        solutions voisines.
+        retourne un générateur d'instances de Move 
+        """
+        raise NotImplementedError
+
+    def neighbor(self, move):
+        """
+        Matérialise la solution voisine obtenue en appliquant move
+        retourne une nouvelle instance de Solution 
+        """
+        n = self.clone()
+        n._value = None
+        move.apply(n)
+        n._move = move
+        return n
+
+    def neighbors(self, rng=None):
         """
         permet de construire l'ensemble des solutions voisines de la solution
 	    courante retourne ensemble solutions voisines de self
+
+        Note : préférer moves quand on ne parcourt pas tout le voisinage
         """
-        raise NotImplementedError
+        return [ self.neighbor(m) for m in self.moves(rng) ]
         
     def clone(self):
         """ clone la solution dans une nouvelle instance """
@@ -61,13 +224,28 @@ class Solution(object):
         """ 
         une méthode pour vérifier l'égalité de deux solutions 
         Il faut la même dimention et que les tableaus soient identiques
-       
+
+        Pour deux tableaux de même type, les empreintes (des octets) sont 
+        comparées d'abord, les valeurs seulement si elles sont égales. Pour
+        des types différents (ex. int32 et int64) on compare les valeurs.
         """
+        if not isinstance(other, Solution) :
+            return NotImplemented
         if  self.dim != other.dim : 
             return False
         if self._sol.shape != other._sol.shape :
             return False
-        return (self._sol == other._sol).all()
+        if self._sol.dtype == other._sol.dtype and \
+           self.fingerprint != other.fingerprint :
+            return False
+        return bool((self._sol == other._sol).all())
+
+    def __hash__(self):
+        """ 
+        hash de l'empreinte : une solution peut être rangée dans un set ou 
+        servir de clef, elle ne doit alors plus être modifiée
+        """
+        return self.fingerprint
 
 
 
@@ -4,7 +4,6 @@ import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 import multiprocessing
 import os
 
@@ -43,42 +42,70 @@ def setup_problems(probleme_size, max_evaluations):
     }
 
 def multiple_runs(problem, algo_class,  max_iter, nb_runs, alg_options,
-                  extra_stats=[], screen_output=True):
+                  extra_stats=[], screen_output=True, nb_workers=1, seed=None):
     """
     Lance plusieurs fois un algorithme de recherche pour un problème donné et retourne les statistiques
     de chaque exécution.
+    Les exécutions sont indépendantes (cf. schedule_runs), réparties sur nb_workers processus.
     
     "stats": [
         dataframe avec les statistiques de chaque exécution
     ]
     """
-    stats =  pd.DataFrame()
+    print ("Running {} on {} for {} runs [max eval {} or max iter {}]".\
+           format(algo_class.__name__, problem.name, nb_runs,
+                  problem.max_eval, max_iter))
 
-    for i in range(nb_runs):
-        # initialiser le problème 
-        problem.reset()
+    runs = [(problem, algo_class, alg_options, max_iter, extra_stats)] * nb_runs
+    results = schedule_runs(runs, nb_workers, seed, screen_output=screen_output)
 
-        # instancier un algorithme avec le problem
-        algorithm = algo_class( problem, alg_options )
-        if i == 0:
-            print ("Running {} on {} for {} runs [max eval {} or max iter {}]".\
-                   format(algorithm.name, problem.name, nb_runs,
-                          problem.max_eval, max_iter))
-
-        nb_iterations , stats_run = run_algorithm(algorithm, max_iter, extra_stats, screen_output)
-        stats_run = pd.DataFrame(stats_run)
-        stats_run['run'] = i
-        stats = pd.concat([stats, stats_run], axis=0)
+    stats = pd.concat([_run_stats(result, i) for i, result in enumerate(results)], axis=0)
+    for result in results:
         # Si le probleme s'y prete, on dessine la solution 
         try : 
-            s = algorithm.best_solution
-            
-            problem.draw_solution(s, f"data/{algorithm.name}-{problem.name}-solution.png")
+            problem.draw_solution(result.best_solution, f"data/{result.name}-{problem.name}-solution.png")
         except NotImplementedError :
             pass # la solution ne se dessine pas, alors on ne fait pas 
 
     return stats
 
+def _run_stats(result, run):
+    """
+    Les statistiques par itération d'une exécution (cf. RunResult) dans un dataframe
+    """
+    stats_run = pd.DataFrame(result.iter_stats)
+    stats_run['run'] = run
+    return stats_run
+
+def run_grid(cases, nb_workers=None, seed=None):
+    """
+    Exécute toutes les exécutions de plusieurs couples (problème, algorithme) dans un seul pool de processus.
+    cases: une liste de tuples (problem_name, problem, algo_class, max_iter, nb_runs, alg_options, extra_stats)
+    resultat: un dictionnaire {problem_name: {algo_name: dataframe}}, les exécutions sont dans l'ordre demandé
+    """
+    runs = []
+    index = []
+    for problem_name, problem, algo_class, max_iter, nb_runs, alg_options, extra_stats in cases:
+        for r in range(nb_runs):
+            runs.append((problem, algo_class, alg_options, max_iter, extra_stats))
+            index.append((problem_name, algo_class.__name__, r))
+
+    results = schedule_runs(runs, nb_workers, seed)
+
+    frames = {}
+    for (problem_name, algo_name, r), result in zip(index, results):
+        frames.setdefault(problem_name, {}).setdefault(algo_name, []).append(_run_stats(result, r))
+
+    stats = {}
+    for problem_name, algos in frames.items():
+        stats[problem_name] = {}
+        for algo_name, algo_frames in algos.items():
+            algo_stats = pd.concat(algo_frames, axis=0)
+            algo_stats['algo'] = algo_name
+            algo_stats['problem'] = problem_name
+            stats[problem_name][algo_name] = algo_stats
+    return stats
+
 def execute_multiple_algo_on_problem_sequentialy(problem_name, algo_list, max_iter_list, nb_runs_list, algo_options_list, extra_stats_list, verbose_list, all_problems):
     """
     Exécute plusieurs algorithmes sur un problème donné et génère des statistiques pour chaque algorithme de façon séquentielle.
@@ -99,64 +126,30 @@ def execute_multiple_algo_on_problem_sequentialy(problem_name, algo_list, max_it
 
     return stats
 
-def execute_multiple_algo_on_problem_concurrently(problem_name, algo_list, max_iter_list, nb_runs_list, algo_options_list, extra_stats_list, verbose_list, all_problems):
+def execute_multiple_algo_on_problem_concurrently(problem_name, algo_list, max_iter_list, nb_runs_list, algo_options_list, extra_stats_list, verbose_list, all_problems, nb_workers=None, seed=None):
     """
-    Exécute plusieurs algorithmes sur un problème donné en utilisant des threads concurrents et génère des statistiques pour chaque algorithme.
+    Exécute plusieurs algorithmes sur un problème donné en utilisant des processus concurrents (un par coeur par défaut)
+    et génère des statistiques pour chaque algorithme. Chaque exécution a sa propre copie du problème et sa propre graine.
     resultat: un dictionnaire avec les statistiques pour chaque algorithme
     """
     problem = all_problems[problem_name]  # Charger l'instance de problème
+    cases = [(problem_name, problem, algo_class, max_iter_list[i], nb_runs_list[i], algo_options_list[i], extra_stats_list[i])
+             for i, algo_class in enumerate(algo_list)]
     
-    stats = {}  # Pour stocker les statistiques pour chaque algorithme
-    print(f"{multiprocessing.current_process().name} is working on {problem_name}")
-    # Créer un pool de threads pour exécuter les algorithmes en parallèle
-    with ThreadPoolExecutor() as executor:
-        futures = {}
-        for i, algo_class in enumerate(algo_list):
-            # Lancer l'exécution de l'algorithme dans un thread séparé
-            future = executor.submit(multiple_runs, problem, algo_class, max_iter_list[i], nb_runs_list[i], algo_options_list[i], extra_stats_list[i], verbose_list[i])
-            futures[future] = algo_class.__name__  # Stocker le future avec le nom de l'algo comme clé
-        
-        for future in as_completed(futures):
-            algo_name = futures[future]  # Récupérer le nom de l'algorithme à partir du future
-            # try:
-            stats[algo_name] = future.result()
-            stats[algo_name]['algo'] = algo_name
-            stats[algo_name]['problem'] = problem_name
-            # except Exception as e:
-            #     print(f"{multiprocessing.current_process().name}: Error while executing {algo_name} on {problem_name}: {e}")
-
-    return stats
+    return run_grid(cases, nb_workers, seed).get(problem_name, {})
 
-def execute_algos_on_problems_concurrently(problem_name_list, algo_list, max_iter_list, nb_runs_list, algo_options_list, extra_stats_list, verbose_list, all_problems):
+def execute_algos_on_problems_concurrently(problem_name_list, algo_list, max_iter_list, nb_runs_list, algo_options_list, extra_stats_list, verbose_list, all_problems, nb_workers=None, seed=None):
     """
-    Exécute plusieurs algorithmes sur une liste de problèmes en utilisant des processus concurrents pour chaque problème et dans chaque processus, exécute les algorithmes en utilisant des threads concurrents.
+    Exécute plusieurs algorithmes sur une liste de problèmes. Toutes les exécutions (problème x algorithme x run) sont
+    réparties dans un seul pool de processus (un par coeur par défaut).
     Le résultat est un dictionnaire avec les statistiques pour chaque algorithme et chaque problème.
     """
-      
-    stats = {}
-    # Exécute les algorithmes sur la liste des problèmes en utilisant des processus concurrents.
-    nb_process_max = os.cpu_count()
-    with ProcessPoolExecutor(max_workers=nb_process_max) as executor:
-        futures = {}
-        for problem_name in problem_name_list:
-            # Lancer l'exécution des algorithmes dans un processus séparé
-            future = executor.submit(
-                execute_multiple_algo_on_problem_concurrently,
-                problem_name,
-                algo_list,
-                max_iter_list,
-                nb_runs_list,
-                algo_options_list,
-                extra_stats_list,
-                verbose_list,
-                all_problems
-            )
-            futures[future] = problem_name
-        
-        for future in as_completed(futures):
-            problem_name = futures[future]
-            stats[problem_name] = future.result()
-    return stats
+    cases = []
+    for problem_name in problem_name_list:
+        for i, algo_class in enumerate(algo_list):
+            cases.append((problem_name, all_problems[problem_name], algo_class, max_iter_list[i], nb_runs_list[i], algo_options_list[i], extra_stats_list[i]))
+
+    return run_grid(cases, nb_workers, seed)
 
 def go_variation(problem_name, algo_class, param_var, max_iter, nb_runs, algo_opt_base, extra_stats, verbose, probleme_size, all_problems):
     """
@@ -209,34 +202,34 @@ def execute_and_save_stats(
         extra_stats=[],
         verbose=False,
         algo_list=[RandomLS],
-        problems_name=['binval'], save=True):
+        problems_name=['binval'], save=True,
+        nb_workers=None, seed=None, store_root='data/store'):
     """
-    Exécute les algorithmes sur les problèmes et sauvegarde les statistiques dans des fichiers CSV.
+    Exécute les algorithmes sur les problèmes et sauvegarde les statistiques dans un stockage Parquet
+    partitionné en ajout seulement (cf. ResultStore et get_stats_from_store).
+    Les exécutions sont réparties sur nb_workers processus (un par coeur par défaut), seed rend les
+    résultats reproductibles.
     """
     stats = []
     dfs = {}
+    exec_seeds = spawn_seeds(nb_exec, seed)
+    store = ResultStore(store_root)
     for i in range(nb_exec):
         all_problems = setup_problems(problem_size, max_evaluations)
         algo_options = {}
         for key, value in algo_options_lambda.items():
             algo_options[key] = value()
         stats.append(
-            execute_algos_on_problems_concurrently(problems_name, algo_list, [max_iterations]*len(algo_list), [nb_runs]*len(algo_list), [algo_options]*len(algo_list), [extra_stats]*len(algo_list), [verbose]*len(algo_list), all_problems)
+            execute_algos_on_problems_concurrently(problems_name, algo_list, [max_iterations]*len(algo_list), [nb_runs]*len(algo_list), [algo_options]*len(algo_list), [extra_stats]*len(algo_list), [verbose]*len(algo_list), all_problems,
+                                                   nb_workers=nb_workers, seed=exec_seeds[i])
         )
 
-        # Sauvegarde des statistiques
+        # Sauvegarde des statistiques, chaque lot est ajouté dans un nouveau fichier
         if save:
             for problem_name, problem_stats in stats[i].items():
                 for algo_name, algo_stats in problem_stats.items():
-                    # ajoute un header si le fichier n'existe pas
-                    nom_fichier = f"data/{algo_name}-{problem_name}-{problem_size}.csv"
-                    exist = not os.path.exists(nom_fichier)
-                    if not exist:
-                        previous_stats = pd.read_csv(nom_fichier)
-                        run = previous_stats['run'].max() + 1
-                        algo_stats['run'] += run
-                        algo_stats = pd.concat([previous_stats, algo_stats],ignore_index=True, sort=False)
-                    algo_stats.to_csv(nom_fichier, mode='w', header=True, index=False)
+                    algo_stats['run'] += store.next_run(algo_name, problem_name, problem_size)
+                    store.append(algo_stats, algo_name, problem_name, problem_size)
         # Aggrégation des statistiques
         for problem_name, stat in stats[i].items():
             for algo_name, algo_stat in stat.items():
@@ -244,9 +237,12 @@ def execute_and_save_stats(
                 dfs[algo_name]['problem_size'] = problem_size
     return dfs
 
-def get_stats_from_csv(algo_name:str, problems_name:list[str], problems_size:list[str]=['small', 'medium', 'large']):
+def get_stats_from_csv(algo_name:str, problems_name:list[str], problems_size:list[str]=['small', 'medium', 'large'],
+                       store_root='data/store'):
     """
-    Charge les statistiques à partir des fichiers CSV et les stocke dans un Pandas DataFrame.
+    Charge les statistiques à partir des anciens fichiers CSV (data/{algo}-{problem}-{size}.csv) et du
+    stockage Parquet où execute_and_save_stats les sauvegarde désormais (cf. get_stats_from_store), et
+    les stocke dans un Pandas DataFrame.
     """
     data = pd.DataFrame()
     
@@ -256,5 +252,19 @@ def get_stats_from_csv(algo_name:str, problems_name:list[str], problems_size:lis
             if  os.path.exists(nom_fichier):
                 new_data = pd.read_csv(nom_fichier,)
                 new_data['problem_size'] = problem_size
+                new_data['algo'] = algo_name
+                new_data['problem'] = problem_name
                 data = pd.concat([data, new_data], ignore_index=True, sort=False)
-    return data
\ No newline at end of file
+    if os.path.isdir(store_root):
+        new_data = get_stats_from_store(algo_name, problems_name, problems_size, store_root=store_root)
+        data = pd.concat([data, new_data], ignore_index=True, sort=False)
+    return data
+
+def get_stats_from_store(algo_name:str, problems_name:list[str], problems_size:list[str]=['small', 'medium', 'large'],
+                         columns:list[str]=None, runs:list[int]=None, store_root='data/store'):
+    """
+    Charge les statistiques sauvegardées par execute_and_save_stats dans un Pandas DataFrame.
+    Seules les partitions, les colonnes (columns) et les exécutions (runs) demandées sont lues.
+    """
+    store = ResultStore(store_root)
+    return store.load(algo=algo_name, problem=problems_name, size=problems_size, runs=runs, columns=columns)